@@ -0,0 +1,86 @@
+"""
+Générateurs de données synthétiques (déterministes via une graine) pour les benchmarks.
+
+Les distributions imitent un usage réaliste :
+- statuts majoritairement DONE, priorités majoritairement NORMAL
+- tags tirés d'un vocabulaire avec une loi de type Zipf (quelques tags très fréquents)
+- échéances pour une partie des tâches, réparties autour d'une date de référence
+- assignations concentrées sur une minorité d'utilisateurs
+"""
+import random
+from datetime import datetime, timedelta
+
+STATUSES = (("TODO", 30), ("ONGOING", 15), ("DONE", 55))
+PRIORITIES = (("LOW", 20), ("NORMAL", 55), ("HIGH", 20), ("CRITICAL", 5))
+TAGS = [
+    "backend", "frontend", "bug", "urgent", "client", "infra", "doc", "test",
+    "design", "ops", "securite", "data", "mobile", "api", "refacto", "perf",
+    "support", "compta", "rh", "marketing", "ventes", "juridique", "achat",
+    "qualite", "formation", "reunion", "rapport", "budget", "audit", "migration",
+]
+WORDS = [
+    "rapport", "mensuel", "ventes", "réunion", "client", "facture", "budget",
+    "projet", "analyse", "correction", "bug", "déploiement", "serveur", "revue",
+    "code", "documentation", "préparer", "envoyer", "valider", "planning",
+    "équipe", "audit", "migration", "base", "données", "tests", "interface",
+    "mise", "à", "jour", "contrat", "fournisseur", "commande", "livraison",
+]
+REFERENCE_DATE = datetime(2025, 1, 1)
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights=weights)[0]
+
+
+def _sentence(rng, min_words, max_words):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words)))
+
+
+def generate_users(n, seed=42):
+    """Génère n utilisateurs au format de users.json."""
+    rng = random.Random(seed)
+    users = []
+    for i in range(1, n + 1):
+        name = f"{rng.choice(['Alice', 'Bob', 'Chloé', 'David', 'Emma', 'Farid', 'Gaëlle', 'Hugo'])} {i}"
+        users.append({
+            "id": i,
+            "name": name,
+            "email": f"user{i}@example.com",
+            "created_at": (REFERENCE_DATE - timedelta(days=rng.randint(0, 900))).isoformat(timespec="seconds"),
+        })
+    return users
+
+
+def generate_tasks(n, n_users=0, seed=42):
+    """Génère n tâches au format de tasks.json (ids 1..n, created_at croissant avec bruit)."""
+    rng = random.Random(seed)
+    tag_weights = [1.0 / (rank + 1) for rank in range(len(TAGS))]
+    start = REFERENCE_DATE - timedelta(days=365)
+    step = (365 * 24 * 3600) / max(n, 1)
+    tasks = []
+    for i in range(1, n + 1):
+        created = start + timedelta(seconds=int(i * step + rng.uniform(0, step)))
+        task = {
+            "id": i,
+            "title": _sentence(rng, 2, 6).capitalize()[:100],
+            "description": _sentence(rng, 0, 40)[:500],
+            "status": _weighted(rng, STATUSES),
+            "created_at": created.isoformat(timespec="seconds"),
+            "due_date": None,
+            "priority": _weighted(rng, PRIORITIES),
+        }
+        if rng.random() < 0.6:
+            due = REFERENCE_DATE + timedelta(days=rng.randint(-60, 60))
+            task["due_date"] = due.isoformat(timespec="seconds")
+        n_tags = rng.choices((0, 1, 2, 3), weights=(30, 40, 20, 10))[0]
+        if n_tags:
+            task["tags"] = list({t for t in rng.choices(TAGS, weights=tag_weights, k=n_tags)})
+        if n_users and rng.random() < 0.8:
+            # 20% des utilisateurs reçoivent l'essentiel des tâches
+            if rng.random() < 0.8:
+                task["assignee_id"] = rng.randint(1, max(1, n_users // 5))
+            else:
+                task["assignee_id"] = rng.randint(1, n_users)
+        tasks.append(task)
+    return tasks
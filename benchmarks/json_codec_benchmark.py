@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare les codecs JSON disponibles (US046) sur un fichier de tâches généré.
+
+Pour chaque codec installé (json, ujson, orjson), mesure la sérialisation (compacte et indentée),
+la désérialisation et la taille produite ; la référence est l'ancien format (json, indent=2).
+
+Exemple :
+    python benchmarks/json_codec_benchmark.py --tasks 1000000 --repeat 3
+"""
+import json
+import os
+import statistics
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import task_manager  # noqa: E402
+from generators import generate_tasks  # noqa: E402
+
+
+def _median(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations), result
+
+
+@click.command()
+@click.option("--tasks", "n_tasks", type=int, default=1000000, help="Nombre de tâches générées")
+@click.option("--repeat", type=int, default=3, help="Nombre de répétitions par mesure")
+@click.option("--seed", type=int, default=42)
+def main(n_tasks, repeat, seed):
+    """Mesure les gains de sérialisation / désérialisation des codecs JSON."""
+    click.echo(f"Génération de {n_tasks} tâches…", err=True)
+    tasks = generate_tasks(n_tasks, n_users=max(10, n_tasks // 100), seed=seed)
+
+    # Référence : format historique des fichiers (json.dump avec indent=2)
+    dump_ref, payload = _median(lambda: json.dumps(tasks, ensure_ascii=False, indent=2).encode("utf-8"), repeat)
+    load_ref, _ = _median(lambda: json.loads(payload), repeat)
+    click.echo(f"{'codec':<16} {'dumps (s)':>10} {'loads (s)':>10} {'taille (Mo)':>12} {'x dumps':>8} {'x loads':>8}")
+    click.echo(f"{'json indent=2':<16} {dump_ref:10.3f} {load_ref:10.3f} {len(payload) / 1e6:12.1f} {1:8.1f} {1:8.1f}")
+
+    previous = task_manager.json_codec()
+    try:
+        for name in ("json", "ujson", "orjson"):
+            try:
+                task_manager.set_json_codec(name)
+            except ValueError:
+                click.echo(f"{name:<16} non installé", err=True)
+                continue
+            for pretty in (False, True):
+                label = f"{name}{' pretty' if pretty else ''}"
+                dump_s, data = _median(lambda: task_manager.json_dumps(tasks, pretty=pretty), repeat)
+                load_s, _ = _median(lambda: task_manager.json_loads(data), repeat)
+                click.echo(f"{label:<16} {dump_s:10.3f} {load_s:10.3f} {len(data) / 1e6:12.1f} "
+                           f"{dump_ref / dump_s:8.1f} {load_ref / load_s:8.1f}")
+    finally:
+        task_manager.set_json_codec(previous)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge pour l'API HTTP locale (US041).
+
+Chaque client ouvre une connexion persistante et enchaîne des GET pendant une durée fixe ;
+le mode conditionnel renvoie l'ETag reçu (If-None-Match) pour mesurer le gain des réponses 304.
+
+Exemples :
+    python benchmarks/load_generator.py --tasks 10000 --clients 4 --duration 5
+    python benchmarks/load_generator.py --url http://127.0.0.1:8000 --path "/tasks?status=TODO"
+"""
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import task_manager  # noqa: E402
+from generators import generate_tasks, generate_users  # noqa: E402
+
+
+def _client(host, port, path, conditional, deadline, counts):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etag = None
+    done = {200: 0, 304: 0, "other": 0}
+    while time.perf_counter() < deadline:
+        headers = {"If-None-Match": etag} if conditional and etag else {}
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()  # nécessaire pour réutiliser la connexion
+        etag = response.getheader("ETag") or etag
+        key = response.status if response.status in done else "other"
+        done[key] += 1
+    conn.close()
+    counts.append(done)
+
+
+def run_load(host, port, path, clients, duration, conditional):
+    """Lance `clients` threads pendant `duration` secondes ; retourne (requêtes/s, compteurs par statut)."""
+    counts = []
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=_client, args=(host, port, path, conditional, deadline, counts))
+               for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    totals = {k: sum(c[k] for c in counts) for k in (200, 304, "other")}
+    return sum(totals.values()) / elapsed, totals
+
+
+@click.command()
+@click.option("--url", default=None, help="API déjà lancée (sinon un serveur local est démarré sur des données générées)")
+@click.option("--tasks", "n_tasks", type=int, default=10000, help="Nombre de tâches générées pour le serveur local")
+@click.option("--seed", type=int, default=42)
+@click.option("--path", default="/tasks?limit=50", help="Chemin interrogé")
+@click.option("--clients", type=int, default=4, help="Connexions simultanées")
+@click.option("--duration", type=float, default=5.0, help="Durée de chaque mesure en secondes")
+def main(url, n_tasks, seed, path, clients, duration):
+    """Mesure le débit (requêtes/s) de l'API, sans puis avec If-None-Match."""
+    server = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+    else:
+        from api_server import make_server
+        task_manager.USERS_FILE = os.path.join(tempfile.mkdtemp(prefix="load-"), "users.json")
+        n_users = max(10, n_tasks // 100)
+        task_manager._save_users(generate_users(n_users, seed=seed))
+        task_manager.task_list[:] = generate_tasks(n_tasks, n_users=n_users, seed=seed)
+        server = make_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[:2]
+        click.echo(f"Serveur local sur {host}:{port} ({n_tasks} tâches)", err=True)
+    try:
+        for conditional in (False, True):
+            rps, totals = run_load(host, port, path, clients, duration, conditional)
+            label = "If-None-Match" if conditional else "GET simple"
+            click.echo(f"{label:<15} {rps:10.1f} req/s  (200: {totals[200]}, 304: {totals[304]}, "
+                       f"autres: {totals['other']})")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks des chemins de requête de task_manager.
+
+Exemples :
+    python benchmarks/run_benchmarks.py --sizes 1000,100000 --output results.json
+    python benchmarks/run_benchmarks.py --sizes 1000 --compare baseline.json --threshold 0.2
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from itertools import product
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import task_manager  # noqa: E402
+from generators import generate_tasks, generate_users  # noqa: E402
+
+SORTS = ["created_at", "title", "status", "priority"]
+ORDERS = ["asc", "desc"]
+FILTERS = {
+    "none": {},
+    "status": {"status": "TODO"},
+    "priority": {"priority": "HIGH"},
+    "keyword": {"keyword": "rapport"},
+    "status+priority": {"status": "ONGOING", "priority": "CRITICAL"},
+    "status+priority+keyword": {"status": "TODO", "priority": "NORMAL", "keyword": "client"},
+}
+MUTATION_BATCH = 100
+# Garde-fous évalués à chaque exécution : (cas, cas de référence, rapport maximal des médianes).
+# Une suppression en masse ne doit pas coûter plus par tâche que des suppressions unitaires.
+GUARDS = [("delete_tasks[half]", "delete_task", 1.0)]
+GUARD_MIN_SIZE = 10000  # en dessous, les coûts fixes dominent
+
+
+def _reset(base):
+    """Recharge le jeu de données et reconstruit les index hors du temps mesuré."""
+    task_manager.task_list[:] = base
+    task_manager.rebuild_indexes()
+
+
+def _time_call(fn, repeat):
+    """Exécute fn `repeat` fois et retourne les durées en secondes."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _summary(durations, ops=1):
+    return {
+        "min_s": min(durations) / ops,
+        "median_s": statistics.median(durations) / ops,
+        "runs": len(durations),
+    }
+
+
+def _query_cases(n_users):
+    """Génère (nom, callable) pour chaque chemin de requête."""
+    cases = []
+    for sort_by, order, (fname, filters) in product(SORTS, ORDERS, FILTERS.items()):
+        name = f"get_tasks[{fname}|{sort_by}|{order}]"
+        cases.append((name, lambda s=sort_by, o=order, f=filters: task_manager.get_tasks(
+            page=1, page_size=20, return_pagination=True, sort_by=s, order=o, **f)))
+    cases += [
+        ("search_tasks[rapport]", lambda: task_manager.search_tasks("rapport")),
+        ("search_tasks[miss]", lambda: task_manager.search_tasks("introuvable")),
+        ("search_ranked[rapport]", lambda: task_manager.search_ranked("rapport mensuel")),
+        ("search_ranked[typo]", lambda: task_manager.search_ranked("raport fourniseur")),
+        ("get_tasks_by_user[user]", lambda: task_manager.get_tasks_by_user(1, return_pagination=True)),
+        ("get_tasks_by_user[unassigned]", lambda: task_manager.get_tasks_by_user(None, return_pagination=True)),
+        ("get_tasks_by_user[user+status]", lambda: task_manager.get_tasks_by_user(1, status="TODO")),
+        ("get_tasks_by_tags[2]", lambda: task_manager.get_tasks_by_tags(["backend", "urgent"])),
+        ("get_tasks_by_tag[rare]", lambda: task_manager.get_tasks_by_tag("migration")),
+        ("get_all_tags", task_manager.get_all_tags),
+        ("get_overdue_tasks", task_manager.get_overdue_tasks),
+        ("get_users[page1]", lambda: task_manager.get_users(page=1, page_size=20)),
+    ]
+    return cases
+
+
+def _bench_mutations(base, repeat):
+    results = {}
+
+    def run_creates():
+        for i in range(MUTATION_BATCH):
+            task_manager.create_task(f"Bench {i}", "description", priority="HIGH")
+
+    durations = []
+    for _ in range(repeat):
+        _reset(base)
+        durations += _time_call(run_creates, 1)
+    results["create_task"] = _summary(durations, MUTATION_BATCH)
+
+    step = max(1, len(base) // MUTATION_BATCH)
+    ids = [t["id"] for t in base[::step]][:MUTATION_BATCH]
+
+    def run_deletes():
+        for tid in ids:
+            task_manager.delete_task(tid)
+
+    durations = []
+    for _ in range(repeat):
+        _reset(base)
+        durations += _time_call(run_deletes, 1)
+    results["delete_task"] = _summary(durations, len(ids))
+
+    bulk_ids = [t["id"] for t in base[::2]]
+    durations = []
+    for _ in range(repeat):
+        _reset(base)
+        durations += _time_call(lambda: task_manager.delete_tasks(bulk_ids), 1)
+    results["delete_tasks[half]"] = _summary(durations, len(bulk_ids))
+    task_manager.task_list[:] = base
+    return results
+
+
+def run_suite(sizes, repeat, seed):
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    tmpdir = tempfile.mkdtemp(prefix="bench-")
+    task_manager.USERS_FILE = os.path.join(tmpdir, "users.json")
+    for size in sizes:
+        n_users = max(10, size // 100)
+        click.echo(f"== {size} tâches / {n_users} utilisateurs", err=True)
+        task_manager._save_users(generate_users(n_users, seed=seed))
+        base = generate_tasks(size, n_users=n_users, seed=seed)
+        task_manager.task_list[:] = base
+
+        results = {}
+        for name, fn in _query_cases(n_users):
+            results[name] = _summary(_time_call(fn, repeat))
+            click.echo(f"  {name:<55} {results[name]['median_s'] * 1000:10.3f} ms", err=True)
+        for name, res in _bench_mutations(base, repeat).items():
+            results[name] = res
+            click.echo(f"  {name:<55} {res['median_s'] * 1000:10.3f} ms/op", err=True)
+        report["results"][str(size)] = results
+    return report
+
+
+def compare(current, baseline, threshold):
+    """Retourne la liste des régressions (médiane > baseline * (1 + threshold))."""
+    regressions = []
+    for size, cases in current["results"].items():
+        base_cases = baseline.get("results", {}).get(size, {})
+        for name, res in cases.items():
+            ref = base_cases.get(name)
+            if not ref or ref["median_s"] <= 0:
+                continue
+            ratio = res["median_s"] / ref["median_s"]
+            if ratio > 1 + threshold:
+                regressions.append({"size": size, "case": name, "ratio": ratio,
+                                    "baseline_s": ref["median_s"], "current_s": res["median_s"]})
+    return regressions
+
+
+def check_guards(report):
+    """Retourne la liste des garde-fous non respectés."""
+    violations = []
+    for size, cases in report["results"].items():
+        if int(size) < GUARD_MIN_SIZE:
+            continue
+        for name, reference, max_ratio in GUARDS:
+            if name not in cases or reference not in cases:
+                continue
+            ratio = cases[name]["median_s"] / cases[reference]["median_s"]
+            if ratio > max_ratio:
+                violations.append({"size": size, "case": name, "reference": reference, "ratio": ratio})
+    return violations
+
+
+@click.command()
+@click.option("--sizes", default="1000,100000,1000000", help="Tailles de jeux de données, séparées par des virgules")
+@click.option("--repeat", type=int, default=3, help="Nombre de répétitions par cas")
+@click.option("--seed", type=int, default=42)
+@click.option("--output", default="benchmarks/results.json", help="Fichier JSON de résultats")
+@click.option("--compare", "baseline_path", default=None, help="Baseline JSON à comparer")
+@click.option("--threshold", type=float, default=0.2, help="Tolérance avant de signaler une régression (0.2 = +20%)")
+def main(sizes, repeat, seed, output, baseline_path, threshold):
+    """Mesure les performances des chemins de requête de task_manager."""
+    size_list = [int(s) for s in sizes.split(",") if s.strip()]
+    report = run_suite(size_list, repeat, seed)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    click.echo(f"Résultats écrits dans {output}", err=True)
+
+    violations = check_guards(report)
+    for v in violations:
+        click.echo(f"GARDE-FOU {v['size']:>8} {v['case']:<55} x{v['ratio']:.2f} par rapport à {v['reference']}", err=True)
+    if violations:
+        sys.exit(1)
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, threshold)
+        for r in regressions:
+            click.echo(f"REGRESSION {r['size']:>8} {r['case']:<55} x{r['ratio']:.2f}", err=True)
+        if regressions:
+            sys.exit(1)
+        click.echo("Aucune régression détectée.", err=True)
+
+
+if __name__ == "__main__":
+    main()
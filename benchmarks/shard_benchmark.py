@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Compare le chargement d'un fichier unique et de fragments lus en parallèle (US047).
+
+Exemple :
+    python benchmarks/shard_benchmark.py --tasks 1000000 --shards 8
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import task_manager  # noqa: E402
+from generators import generate_tasks  # noqa: E402
+
+
+def _median(fn, repeat):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+@click.command()
+@click.option("--tasks", "n_tasks", type=int, default=1000000, help="Nombre de tâches générées")
+@click.option("--shards", "n_shards", type=int, default=8, help="Nombre de fragments (découpage par plage d'ID)")
+@click.option("--repeat", type=int, default=3, help="Nombre de répétitions par mesure")
+@click.option("--seed", type=int, default=42)
+def main(n_tasks, n_shards, repeat, seed):
+    """Mesure le démarrage à froid : fichier unique, fragments en séquentiel, fragments en parallèle."""
+    tasks = generate_tasks(n_tasks, n_users=max(10, n_tasks // 100), seed=seed)
+    tmpdir = tempfile.mkdtemp(prefix="shards-")
+    single = os.path.join(tmpdir, "tasks.json")
+    shard_dir = os.path.join(tmpdir, "shards")
+    os.makedirs(shard_dir)
+    task_manager._atomic_write_json(single, tasks)
+    size = -(-n_tasks // n_shards)
+    for i in range(n_shards):
+        task_manager._atomic_write_json(os.path.join(shard_dir, f"tasks-{i:04d}.json"), tasks[i * size:(i + 1) * size])
+    del tasks
+    click.echo(f"{n_tasks} tâches, {n_shards} fragments, codec {task_manager.json_codec()}, {os.cpu_count()} cœurs",
+               err=True)
+
+    def load_single():
+        # Comme au chargement du module : conversion en _Task sans ramasse-miettes
+        with task_manager._gc_paused():
+            return task_manager.TaskList(task_manager._Task(t) for t in task_manager._load_tasks(single))
+
+    cases = [
+        ("fichier unique", load_single),
+        ("fragments, 1 processus", lambda: task_manager._load_tasks(shard_dir, workers=1)),
+        ("fragments, parallèle", lambda: task_manager._load_tasks(shard_dir)),
+    ]
+    reference = None
+    for name, fn in cases:
+        seconds = _median(fn, repeat)
+        reference = reference or seconds
+        click.echo(f"{name:<25} {seconds:8.3f} s  x{reference / seconds:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Détection des quasi-doublons (US050) : index MinHash/LSH contre comparaison de chaque titre.
+
+Mesure la construction de l'index, le temps d'une recherche find_similar et d'une création avec
+avertissement, puis la même recherche par parcours de toutes les tâches (Jaccard exact des trigrammes).
+
+Exemple :
+    python benchmarks/similarity_benchmark.py --tasks 200000 --queries 200
+"""
+import os
+import random
+import sys
+import time
+
+import click
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import task_manager  # noqa: E402
+from generators import generate_tasks  # noqa: E402
+
+
+def _linear_scan(text, tasks, threshold):
+    query = task_manager._shingle_hashes(text)
+    found = []
+    for task in tasks:
+        other = task_manager._shingle_hashes(task_manager._similarity_text(task))
+        if other and len(query & other) / len(query | other) >= threshold:
+            found.append(task)
+    return found
+
+
+@click.command()
+@click.option("--tasks", "n_tasks", type=int, default=200000, help="Nombre de tâches générées")
+@click.option("--queries", type=int, default=200, help="Nombre de recherches mesurées")
+@click.option("--scan-queries", type=int, default=3, help="Recherches par parcours complet (lentes)")
+@click.option("--seed", type=int, default=42)
+def main(n_tasks, queries, scan_queries, seed):
+    """Compare find_similar (LSH) au parcours complet de toutes les tâches."""
+    click.echo(f"Génération de {n_tasks} tâches…", err=True)
+    task_manager.task_list[:] = [task_manager._Task(t) for t in generate_tasks(n_tasks, seed=seed)]
+    task_manager.rebuild_indexes()
+    start = time.perf_counter()
+    task_manager._get_similarity_index()
+    click.echo(f"construction de l'index     {time.perf_counter() - start:10.2f} s")
+
+    rng = random.Random(seed)
+    texts = [f"{rng.choice(task_manager.task_list)['title']} {rng.choice(['urgent', 'v2', ''])}".strip()
+             for _ in range(queries)]
+    start = time.perf_counter()
+    for text in texts:
+        task_manager.find_similar(text)
+    click.echo(f"find_similar (LSH)          {(time.perf_counter() - start) / queries * 1000:10.3f} ms")
+
+    threshold = task_manager.SIMILARITY_THRESHOLD
+    start = time.perf_counter()
+    for text in texts[:scan_queries]:
+        _linear_scan(text, task_manager.task_list, threshold)
+    click.echo(f"parcours complet            {(time.perf_counter() - start) / max(scan_queries, 1) * 1000:10.3f} ms")
+
+    start = time.perf_counter()
+    for text in texts:
+        task_manager.create_task(text, warn_duplicates=False)
+    plain = time.perf_counter() - start
+    with task_manager.warnings.catch_warnings():
+        task_manager.warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        for text in texts:
+            task_manager.create_task(text, warn_duplicates=True)
+        checked = time.perf_counter() - start
+    click.echo(f"create_task sans / avec vérification {plain / queries * 1000:8.3f} / {checked / queries * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+US041 – API HTTP/JSON locale (bibliothèque standard uniquement).
+
+Connexions persistantes (HTTP/1.1), pagination par curseur et lectures conditionnelles :
+chaque réponse GET porte un ETag dérivé des compteurs de version du magasin, de la date du jour
+(retards) et de l'URL demandée,
+et une requête If-None-Match identique reçoit 304 Not Modified sans recalcul.
+
+    GET    /tasks?status=&not_status=&priority=&assignee_id=&tag=&tags_mode=&keyword=
+                 &sort_by=&order=&limit=&cursor=&archived=true
+    GET    /tasks/count?...          GET /tasks/<id>        POST /tasks
+    PATCH  /tasks/<id>               DELETE /tasks/<id>
+    GET    /tags   GET /stats   GET /users?prefix=&after=&limit=   GET /changes?since=
+"""
+import base64
+import hashlib
+import threading
+from dataclasses import replace
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import task_manager
+from task_manager import (
+    TaskQuery, query_tasks, count_tasks, create_task, get_task, update_task, change_task_status,
+    set_task_priority, set_due_date, assign_task, delete_task, add_tags, remove_tag,
+    get_all_tags, get_task_stats, get_users, get_changes, current_sequence, ChangeFeedTruncated,
+    json_dumps, json_loads, task_to_dict,
+)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+# Le module task_manager n'est pas prévu pour des accès concurrents : un seul appel à la fois
+_store_lock = threading.Lock()
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _etag(url):
+    """
+    Change dès qu'une tâche ou un utilisateur change (version de la liste, flux de modifications, écritures)
+    et à minuit, les retards (overdue, /stats) dépendant de la date ; le chemin et la chaîne de requête
+    y sont mêlés pour que deux URL différentes n'aient jamais le même ETag.
+    """
+    version = (f"{task_manager.task_list.version}.{current_sequence()}.{task_manager._users_generation}"
+               f".{date.today().toordinal()}")
+    return f'"{version}-{hashlib.blake2b(url.encode(), digest_size=8).hexdigest()}"'
+
+
+def _encode_cursor(after_id, offset):
+    raw = json_dumps({"after": after_id, "offset": offset})
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        data = json_loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after_id, offset = data["after"], data["offset"]
+    except (ValueError, KeyError, TypeError):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid cursor")
+    if not all(isinstance(v, int) and not isinstance(v, bool) for v in (after_id, offset)) or offset < 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid cursor")
+    return after_id, offset
+
+
+def _int_param(params, name, default=None):
+    value = params.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid {name}")
+
+
+def _query_from_params(params, multi):
+    q = TaskQuery(
+        status=params.get("status"),
+        exclude_status=multi.get("not_status") or None,
+        priority=params.get("priority"),
+        tags=multi.get("tag") or None,
+        tags_mode=params.get("tags_mode", "any"),
+        keyword=params.get("keyword"),
+        due_from=params.get("due_from"),
+        due_to=params.get("due_to"),
+        sort_by=params.get("sort_by", "created_at"),
+        order=params.get("order", "desc"),
+        page_size=None,
+        include_archived=params.get("archived") == "true",
+    )
+    if "assignee_id" in params:
+        value = params["assignee_id"]
+        q.assignee_id = None if value in ("", "none", "null") else _int_param(params, "assignee_id")
+    if params.get("overdue") in ("true", "false"):
+        q.overdue = params["overdue"] == "true"
+    if q.sort_by == "none":
+        q.sort_by = None
+    return q
+
+
+def list_tasks(params, multi):
+    """
+    Page de tâches avec curseur : le curseur désigne la dernière tâche renvoyée, d'où query_tasks
+    reprend directement (TaskQuery.after_id) ; sa position ne sert que si cette tâche a été supprimée.
+    """
+    limit = min(_int_param(params, "limit", DEFAULT_LIMIT), MAX_LIMIT)
+    if limit <= 0:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid limit")
+    q = _query_from_params(params, multi)
+    q.page_size = limit
+    offset = 0
+    if params.get("cursor"):
+        q.after_id, offset = _decode_cursor(params["cursor"])
+    try:
+        page, pagination = query_tasks(q, return_pagination=True)
+    except ValueError as e:
+        if str(e) != "Task not found":
+            raise
+        tasks = query_tasks(replace(q, after_id=None, page_size=None))
+        page = tasks[offset:offset + limit]
+        pagination = {"total_items": len(tasks), "has_next": offset + len(page) < len(tasks)}
+    end = offset + len(page)
+    next_cursor = _encode_cursor(page[-1].get("id"), end) if page and pagination["has_next"] else None
+    return {"items": [task_to_dict(t) for t in page], "total": pagination["total_items"],
+            "next_cursor": next_cursor}
+
+
+# Types acceptés pour chaque champ des corps POST/PATCH (None = champ effacé)
+FIELD_TYPES = {
+    "title": (str,),
+    "description": (str, type(None)),
+    "status": (str,),
+    "priority": (str,),
+    "due_date": (str, type(None)),
+    "assignee_id": (int, type(None)),
+    "add_tags": (list,),
+    "remove_tags": (list,),
+}
+
+
+def _check_fields(body):
+    """400 si un champ connu n'a pas le type attendu (plutôt qu'une exception au fond du module)."""
+    for name, types in FIELD_TYPES.items():
+        if name not in body:
+            continue
+        value = body[name]
+        if not isinstance(value, types) or isinstance(value, bool):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid {name}")
+        if isinstance(value, list) and not all(isinstance(tag, str) for tag in value):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid {name}")
+
+
+def _update_fields(task_id, body):
+    """Applique les champs du corps PATCH via les fonctions de modification du module."""
+    _check_fields(body)
+    if "title" in body or "description" in body:
+        update_task(task_id, title=body.get("title"), description=body.get("description"))
+    if "status" in body:
+        change_task_status(task_id, body["status"])
+    if "priority" in body:
+        set_task_priority(task_id, body["priority"])
+    if "due_date" in body:
+        set_due_date(task_id, body["due_date"])
+    if "assignee_id" in body:
+        assign_task(task_id, body["assignee_id"])
+    for tag in body.get("remove_tags", []):
+        remove_tag(task_id, tag)
+    if body.get("add_tags"):
+        add_tags(task_id, body["add_tags"])
+    return get_task(task_id)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # connexions persistantes
+    server_version = "TaskManagerAPI/1.0"
+    quiet = True
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload=None, etag=None):
+        body = b"" if payload is None else json_dumps(payload, default=str)
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        if status != HTTPStatus.NOT_MODIFIED:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            body = json_loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid JSON body")
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Invalid JSON body")
+        return body
+
+    def _route(self, method):
+        url = urlsplit(self.path)
+        parts = [p for p in url.path.split("/") if p]
+        multi = parse_qs(url.query)
+        params = {k: v[-1] for k, v in multi.items()}
+        if method == "GET":
+            with _store_lock:
+                etag = _etag(self.path)
+                if self.headers.get("If-None-Match") == etag:
+                    return HTTPStatus.NOT_MODIFIED, None, etag
+                return HTTPStatus.OK, self._get(parts, params, multi), etag
+        body = self._body()
+        with _store_lock:
+            return self._write(method, parts, body) + (None,)
+
+    def _get(self, parts, params, multi):
+        if parts == ["tasks"]:
+            return list_tasks(params, multi)
+        if parts == ["tasks", "count"]:
+            return {"count": count_tasks(_query_from_params(params, multi))}
+        if len(parts) == 2 and parts[0] == "tasks":
+            return task_to_dict(get_task(parts[1]))
+        if parts == ["tags"]:
+            return get_all_tags()
+        if parts == ["stats"]:
+            return get_task_stats(by_user=params.get("by") == "user")
+        if parts == ["users"]:
+            users, pagination = get_users(page_size=_int_param(params, "limit", DEFAULT_LIMIT), return_pagination=True,
+                                          name_prefix=params.get("prefix"), after_id=_int_param(params, "after"))
+            return {"items": users, "total": pagination["total_items"], "next_cursor": pagination["next_cursor"]}
+        if parts == ["changes"]:
+            try:
+                return {"seq": current_sequence(), "events": get_changes(_int_param(params, "since", 0))}
+            except ChangeFeedTruncated as e:
+                raise ApiError(HTTPStatus.GONE, str(e))
+        raise ApiError(HTTPStatus.NOT_FOUND, "Not found")
+
+    def _write(self, method, parts, body):
+        if method == "POST" and parts == ["tasks"]:
+            _check_fields(body)
+            task = create_task(body.get("title", ""), body.get("description", ""), body.get("due_date"),
+                               body.get("priority", "NORMAL"))
+            return HTTPStatus.CREATED, task_to_dict(task)
+        if len(parts) == 2 and parts[0] == "tasks":
+            if method == "PATCH":
+                return HTTPStatus.OK, task_to_dict(_update_fields(parts[1], body))
+            if method == "DELETE":
+                delete_task(parts[1])
+                return HTTPStatus.NO_CONTENT, None
+        raise ApiError(HTTPStatus.NOT_FOUND, "Not found")
+
+    def _handle(self, method):
+        try:
+            status, payload, etag = self._route(method)
+        except ApiError as e:
+            status, payload, etag = e.status, {"error": str(e)}, None
+        except ValueError as e:
+            # Mêmes messages que la CLI ; "... not found" devient 404
+            status = HTTPStatus.NOT_FOUND if str(e).endswith("not found") else HTTPStatus.BAD_REQUEST
+            payload, etag = {"error": str(e)}, None
+        self._send(status, payload, etag)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def make_server(host="127.0.0.1", port=8000, verbose=False):
+    """Crée le serveur (port=0 : port libre choisi par le système, lisible dans server.server_address)."""
+    handler = type("Handler", (ApiHandler,), {"quiet": not verbose})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host="127.0.0.1", port=8000, verbose=False):
+    server = make_server(host, port, verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
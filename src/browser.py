@@ -0,0 +1,212 @@
+"""
+US040 – Navigation plein écran dans les tâches (curses).
+
+Les pages sont demandées une à une à query_tasks, gardées en cache tant que les tâches ne
+changent pas, et la page suivante est préparée par un thread en arrière-plan pendant que
+l'utilisateur lit la page courante. Seules les lignes visibles sont dessinées.
+"""
+import curses
+import threading
+from dataclasses import replace
+
+from task_manager import TaskQuery, query_tasks, count_tasks, current_sequence, ALLOWED_STATUS, ALLOWED_PRIORITIES
+
+FILTER_HELP = "status:TODO prio:HIGH tag:backend user:7 mots…"
+
+
+def parse_filter(text, base=None):
+    """
+    Convertit la saisie du filtre en TaskQuery : les critères `status:`, `not:`, `prio:`, `tag:`
+    et `user:` (ou `user:none`) passent par les index bitmap, les autres mots forment le mot-clé.
+    """
+    q = replace(base or TaskQuery())
+    words = []
+    for token in text.split():
+        key, sep, value = token.partition(":")
+        key = key.lower()
+        if not sep or not value:
+            words.append(token)
+        elif key == "status" and value.upper() in ALLOWED_STATUS:
+            q.status = value.upper()
+        elif key == "not" and value.upper() in ALLOWED_STATUS:
+            q.exclude_status = [*(q.exclude_status or []), value.upper()]
+        elif key in ("prio", "priority") and value.upper() in ALLOWED_PRIORITIES:
+            q.priority = value.upper()
+        elif key == "tag":
+            q.tags = [*(q.tags or []), value]
+            q.tags_mode = "all"
+        elif key == "user":
+            if value.lower() == "none":
+                q.assignee_id = None
+            elif value.isdigit():
+                q.assignee_id = int(value)
+            else:
+                words.append(token)
+        else:
+            words.append(token)
+    q.keyword = " ".join(words) or None
+    return q
+
+
+class PageFetcher:
+    """
+    Pages d'une requête, chargées à la demande via query_tasks et mises en cache.
+    Le cache est vidé dès que le numéro de séquence du flux de modifications change.
+    prefetch(n) prépare la page n dans un thread ; les appels au moteur sont sérialisés.
+    """
+
+    def __init__(self, query, page_size):
+        self.query = query
+        self.page_size = page_size
+        self.pages = {}
+        self.total = None
+        self.seq = current_sequence()
+        self.lock = threading.Lock()
+        self.prefetching = None
+
+    def _check_fresh(self):
+        seq = current_sequence()
+        if seq != self.seq:
+            self.pages.clear()
+            self.total = None
+            self.seq = seq
+
+    def total_items(self):
+        with self.lock:
+            self._check_fresh()
+            if self.total is None:
+                self.total = count_tasks(self.query)
+            return self.total
+
+    def total_pages(self):
+        return max(1, -(-self.total_items() // self.page_size))
+
+    def page(self, number):
+        with self.lock:
+            self._check_fresh()
+            if number not in self.pages:
+                q = replace(self.query, page=number, page_size=self.page_size)
+                self.pages[number], pagination = query_tasks(q, return_pagination=True)
+                self.total = pagination["total_items"]
+            return self.pages[number]
+
+    def prefetch(self, number):
+        if number in self.pages or number > self.total_pages():
+            return
+        thread = threading.Thread(target=self.page, args=(number,), name="browse-prefetch", daemon=True)
+        thread.start()
+        self.prefetching = thread
+
+
+def _row(task, width):
+    tags = ",".join(task.get("tags", []))
+    due = (task.get("due_date") or "")[:10]
+    line = f"{task['id']:>6} {task.get('status', ''):<8} {task.get('priority', 'NORMAL'):<8} {due:<10} {task.get('title', '')}"
+    if tags:
+        line += f"  [{tags}]"
+    return line[:width - 1]
+
+
+class TaskBrowser:
+    """Boucle curses : ↑/↓ ou j/k, PgUp/PgDn ou p/n, / pour filtrer, Entrée pour le détail, q pour quitter."""
+
+    def __init__(self, stdscr, query, filter_text=""):
+        self.screen = stdscr
+        self.base_query = query
+        self.filter_text = filter_text
+        self.editing = False
+        self.page_number = 1
+        self.cursor = 0
+        self.detail = None
+        self.fetcher = None
+        self._reset()
+
+    def _visible_rows(self):
+        return max(1, self.screen.getmaxyx()[0] - 4)
+
+    def _reset(self):
+        self.fetcher = PageFetcher(parse_filter(self.filter_text, self.base_query), self._visible_rows())
+        self.page_number = 1
+        self.cursor = 0
+
+    def draw(self):
+        height, width = self.screen.getmaxyx()
+        self.screen.erase()
+        tasks = self.fetcher.page(self.page_number)
+        self.cursor = min(self.cursor, max(len(tasks) - 1, 0))
+        total = self.fetcher.total_items()
+        header = f"Tâches {total} – page {self.page_number}/{self.fetcher.total_pages()}"
+        self.screen.addnstr(0, 0, header, width - 1, curses.A_BOLD)
+        for i, task in enumerate(tasks[:height - 4]):
+            attr = curses.A_REVERSE if i == self.cursor else curses.A_NORMAL
+            self.screen.addnstr(1 + i, 0, _row(task, width), width - 1, attr)
+        if self.detail is not None:
+            self.screen.addnstr(height - 2, 0, self.detail.replace("\n", " "), width - 1, curses.A_DIM)
+        prompt = f"/{self.filter_text}" if self.editing or self.filter_text else f"/ filtrer ({FILTER_HELP})  q quitter"
+        self.screen.addnstr(height - 1, 0, prompt, width - 1)
+        self.screen.refresh()
+        self.fetcher.prefetch(self.page_number + 1)
+        return tasks
+
+    def _edit_filter(self, key):
+        if key == "\x1b":  # Échap : on abandonne la saisie
+            self.editing = False
+            self.filter_text = ""
+        elif key in ("\n", "\r", curses.KEY_ENTER):
+            self.editing = False
+            return
+        elif key in (curses.KEY_BACKSPACE, "\x7f", "\b"):
+            self.filter_text = self.filter_text[:-1]
+        elif isinstance(key, str) and key.isprintable():
+            self.filter_text += key
+        else:
+            return
+        self._reset()  # filtrage à chaque frappe : seule la première page est recalculée
+
+    def handle(self, key, tasks):
+        """Traite une touche (str pour un caractère, int pour une touche spéciale) ; False pour quitter."""
+        if self.editing:
+            self._edit_filter(key)
+            return True
+        if key in ("q", "\x1b"):
+            return False
+        self.detail = None
+        if key == "/":
+            self.editing = True
+        elif key in (curses.KEY_DOWN, "j"):
+            if self.cursor < len(tasks) - 1:
+                self.cursor += 1
+            elif self.page_number < self.fetcher.total_pages():
+                self.page_number += 1
+                self.cursor = 0
+        elif key in (curses.KEY_UP, "k"):
+            if self.cursor > 0:
+                self.cursor -= 1
+            elif self.page_number > 1:
+                self.page_number -= 1
+                self.cursor = self._visible_rows() - 1
+        elif key in (curses.KEY_NPAGE, "n", " "):
+            self.page_number = min(self.page_number + 1, self.fetcher.total_pages())
+            self.cursor = 0
+        elif key in (curses.KEY_PPAGE, "p"):
+            self.page_number = max(self.page_number - 1, 1)
+            self.cursor = 0
+        elif key in ("\n", "\r", curses.KEY_ENTER) and tasks:
+            task = tasks[min(self.cursor, len(tasks) - 1)]
+            self.detail = task.get("description") or "–"  # seule la description sélectionnée est lue
+        elif key == curses.KEY_RESIZE:
+            self._reset()
+        return True
+
+    def run(self):
+        curses.curs_set(0)
+        self.screen.keypad(True)
+        while True:
+            tasks = self.draw()
+            if not self.handle(self.screen.get_wch(), tasks):
+                return
+
+
+def run_browser(query=None, filter_text=""):
+    """Ouvre le navigateur plein écran sur la requête donnée (toutes les tâches par défaut)."""
+    curses.wrapper(lambda stdscr: TaskBrowser(stdscr, query or TaskQuery(), filter_text).run())
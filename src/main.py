@@ -1,5 +1,11 @@
 #!/usr/bin/env python3
 
+import io
+import shlex
+import time
+import warnings
+from contextlib import redirect_stdout
+
 import click
 from rich.console import Console
 from rich.table import Table
@@ -10,12 +16,29 @@ from task_manager import (
     get_tasks, create_task, get_task, update_task, change_task_status,
     delete_task, search_tasks, filter_tasks_by_status, assign_task,
     get_tasks_by_user, get_overdue_tasks, set_due_date, set_task_priority,
-    add_tag, remove_tag, get_tasks_by_tag, get_all_tags,
+    add_tag, remove_tag, get_tasks_by_tag, get_all_tags, get_task_stats,
+    TaskQuery, query_tasks, explain_query, count_tasks, complete,
+    get_changes, wait_for_changes, ChangeFeedTruncated, start_hot_reload, stop_hot_reload,
+    get_tasks_due_within, parse_duration, delete_tasks, delete_tasks_where,
+    enable_description_store, disable_description_store,
+    enable_query_cache, clear_query_cache, query_cache_stats,
+    enable_archive, disable_archive, archive_done_tasks,
+    deferred_user_writes, flush_users, json_dumps, peek_next, pop_next,
+    find_similar, DuplicateTaskWarning,
     # Utilisateurs
-    create_user, get_users
+    create_user, get_users, _load_users,
+    # Instrumentation
+    profiler, enable_profiling, metrics_snapshot, format_metrics
 )
 
 console = Console()
+_batch_errors = None  # US043 : erreurs signalées par la ligne en cours d'un batch
+
+
+def _print_error(e):
+    console.print(str(e), style="bold red")
+    if _batch_errors is not None:
+        _batch_errors.append(str(e))
 
 
 def _print_tasks(tasks, title):
@@ -40,13 +63,65 @@ def _print_tasks(tasks, title):
             t.get("priority", "NORMAL"),
             ", ".join(t.get("tags", [])) or "–"
         )
+    with profiler.stage("render"):
+        console.print(table)
+
+
+def _print_profile(metrics_format=None):
+    """Affiche la décomposition des temps et compteurs collectés pendant la commande."""
+    snap = metrics_snapshot()
+    table = Table(title="Profil d'exécution")
+    table.add_column("Étape", style="cyan")
+    table.add_column("Appels", style="white", justify="right")
+    table.add_column("Total (ms)", style="magenta", justify="right")
+    for name, t in sorted(snap["timings"].items(), key=lambda x: -x[1]["total_s"]):
+        table.add_row(name, str(t["calls"]), f"{t['total_s'] * 1000:.3f}")
+    for name, value in sorted(snap["counters"].items()):
+        table.add_row(name, str(value), "–")
     console.print(table)
+    if metrics_format:
+        click.echo(format_metrics(metrics_format))
 
 
 @click.group()
-def cli():
+@click.option("--profile", is_flag=True, help="Afficher le détail des temps par étape après la commande")
+@click.option("--metrics", "metrics_format", type=click.Choice(["json", "prometheus"]), default=None,
+              help="Avec --profile, exporter aussi les mesures (JSON ou texte Prometheus)")
+@click.option("--descriptions-file", default=None, metavar="PATH",
+              help="Garder les descriptions dans un fichier créé à côté de PATH plutôt qu'en mémoire")
+@click.option("--cache-dir", default=None, metavar="PATH", help="Répertoire du cache de requêtes ($XDG_CACHE_HOME/task_manager, ~/.cache/task_manager par défaut)")
+@click.option("--no-cache", is_flag=True, help="Ne pas utiliser le cache de requêtes sur disque")
+@click.option("--archive-after", default=None, metavar="DURÉE",
+              help="Archiver les tâches DONE depuis plus de DURÉE (ex. 30d) qui ne le sont pas encore")
+@click.option("--archive-file", default=None, metavar="PATH",
+              help="Utiliser l'archive persistante PATH (tasks.archive par défaut avec --archive-after)")
+@click.pass_context
+def cli(ctx, profile, metrics_format, descriptions_file, cache_dir, no_cache, archive_after, archive_file):
     """Gestionnaire de Tâches - Version CLI Python"""
-    pass
+    if not no_cache:
+        enable_query_cache(cache_dir)
+    if descriptions_file:
+        enable_description_store(descriptions_file)
+        ctx.call_on_close(disable_description_store)
+    if archive_after or archive_file:
+        try:
+            older_than = parse_duration(archive_after) if archive_after else None
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--archive-after")
+        # L'archive reste sur disque : seules les tâches nouvellement éligibles y sont écrites
+        try:
+            enable_archive(archive_file, persistent=True)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--archive-file")
+        ctx.call_on_close(lambda: disable_archive(rehydrate=False))
+        if archive_after:
+            archive_done_tasks(older_than)
+    if profile:
+        load = profiler.timings.get("load_tasks")
+        enable_profiling()
+        if load:
+            profiler.record("load_tasks", load[0])
+        ctx.call_on_close(lambda: _print_profile(metrics_format))
 
 
 #
@@ -66,7 +141,7 @@ def list(sort_by, order, page, page_size):
             sort_by=sort_by, order=order
         )
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     if not tasks:
         console.print("Aucune tâche à afficher.", style="yellow")
@@ -75,19 +150,37 @@ def list(sort_by, order, page, page_size):
     _print_tasks(tasks, title)
 
 
+@cli.command()
+@click.option("--sort-by", type=click.Choice(["created_at", "title", "status", "priority"]), default="created_at")
+@click.option("--order", type=click.Choice(["asc", "desc"]), default="desc")
+@click.option("--filter", "filter_text", default="", help="Filtre initial, ex. 'status:TODO tag:backend rapport'")
+def browse(sort_by, order, filter_text):
+    """Parcourir les tâches en plein écran (pages chargées à la demande, / pour filtrer)"""
+    from browser import run_browser
+    run_browser(TaskQuery(sort_by=sort_by, order=order), filter_text)
+
+
 @cli.command()
 @click.argument("title")
 @click.option("--description", default="", help="Description optionnelle")
 @click.option("--due-date", default=None, help="Échéance au format YYYY-MM-DD ou ISO")
 @click.option("--priority", type=click.Choice(["LOW","NORMAL","HIGH","CRITICAL"]), default="NORMAL")
-def create(title, description, due_date, priority):
+@click.option("--check-duplicates", is_flag=True, help="Signaler les tâches existantes très proches")
+def create(title, description, due_date, priority, check_duplicates):
     """Créer une nouvelle tâche"""
     try:
-        t = create_task(title, description=description, due_date=due_date, priority=priority)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", DuplicateTaskWarning)
+            t = create_task(title, description=description, due_date=due_date, priority=priority,
+                            warn_duplicates=check_duplicates)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Tâche créée (ID {t['id']})", style="green")
+    for w in caught:
+        if isinstance(w.message, DuplicateTaskWarning):
+            similar = ", ".join(f"{d['id']} ({d.get('title', '')})" for d in w.message.similar)
+            console.print(f"Doublon possible : {similar}", style="yellow")
 
 
 @cli.command()
@@ -99,7 +192,7 @@ def update(task_id, title, description):
     try:
         t = update_task(task_id, title=title, description=description)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Tâche {task_id} mise à jour.", style="green")
 
@@ -112,7 +205,7 @@ def status_cmd(task_id, status):
     try:
         t = change_task_status(task_id, status)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Statut de la tâche {task_id} → {status}", style="green")
 
@@ -124,23 +217,63 @@ def delete(task_id):
     try:
         delete_task(task_id)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Tâche {task_id} supprimée.", style="green")
 
 
+@cli.command()
+@click.argument("task_ids", type=int, nargs=-1, required=True)
+def delete_many(task_ids):
+    """Supprimer plusieurs tâches par ID"""
+    deleted = delete_tasks(task_ids)
+    console.print(f"{deleted} tâche(s) supprimée(s).", style="green")
+
+
+@cli.command()
+@click.option("--status", type=click.Choice(["TODO","ONGOING","DONE"]), default=None)
+@click.option("--priority", type=click.Choice(["LOW","NORMAL","HIGH","CRITICAL"]), default=None)
+@click.option("--user", "user_id", type=int, default=None, help="ID de l'utilisateur assigné")
+@click.option("--unassigned", is_flag=True, help="Seulement les tâches non assignées")
+@click.option("--tag", "tags", multiple=True, help="Tag (option répétable)")
+@click.option("--keyword", default=None)
+@click.option("--overdue", "overdue_flag", is_flag=True, default=None, help="Seulement les tâches en retard")
+@click.option("--dry-run", is_flag=True, help="Compter les tâches concernées sans les supprimer")
+def delete_where(status, priority, user_id, unassigned, tags, keyword, overdue_flag, dry_run):
+    """Supprimer toutes les tâches correspondant aux critères"""
+    q = TaskQuery(status=status, priority=priority, tags=[*tags] or None, keyword=keyword,
+                  overdue=overdue_flag, sort_by=None, page_size=None)
+    if unassigned:
+        q.assignee_id = None
+    elif user_id is not None:
+        q.assignee_id = user_id
+    try:
+        if dry_run:
+            count = count_tasks(q)
+        else:
+            count = delete_tasks_where(q)
+    except ValueError as e:
+        _print_error(e)
+        return
+    if dry_run:
+        console.print(f"{count} tâche(s) seraient supprimée(s).", style="yellow")
+    else:
+        console.print(f"{count} tâche(s) supprimée(s).", style="green")
+
+
 @cli.command()
 @click.argument("keyword", required=False, default="")
 @click.option("--sort-by", type=click.Choice(["created_at","title","status","priority"]), default="created_at")
 @click.option("--order", type=click.Choice(["asc","desc"]), default="desc")
 @click.option("--page", type=int, default=1)
 @click.option("--page-size", type=int, default=10)
-def search(keyword, sort_by, order, page, page_size):
+@click.option("--ranked", is_flag=True, help="Classer par pertinence (tolère les fautes de frappe)")
+def search(keyword, sort_by, order, page, page_size, ranked):
     """Rechercher des tâches par mot-clé"""
     try:
-        tasks = search_tasks(keyword, page=page, page_size=page_size, sort_by=sort_by, order=order)
+        tasks = search_tasks(keyword, page=page, page_size=page_size, sort_by=sort_by, order=order, ranked=ranked)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     if not tasks:
         console.print(f"Aucun résultat pour '{keyword}'.", style="yellow")
@@ -148,6 +281,23 @@ def search(keyword, sort_by, order, page, page_size):
     _print_tasks(tasks, f"Résultats pour '{keyword}'")
 
 
+@cli.command()
+@click.argument("query")
+@click.option("--threshold", type=float, default=None, help="Similarité minimale entre 0 et 1 (0.5 par défaut)")
+@click.option("--limit", type=int, default=10)
+def similar(query, threshold, limit):
+    """Tâches proches d'une tâche (ID) ou d'un texte : titres et descriptions quasi identiques"""
+    try:
+        tasks = find_similar(int(query) if query.isdigit() else query, threshold=threshold, limit=limit)
+    except ValueError as e:
+        _print_error(e)
+        return
+    if not tasks:
+        console.print(f"Aucune tâche proche de '{query}'.", style="yellow")
+        return
+    _print_tasks(tasks, f"Tâches proches de '{query}'")
+
+
 @cli.command()
 @click.argument("status", type=click.Choice(["TODO","ONGOING","DONE"]))
 @click.option("--sort-by", type=click.Choice(["created_at","title","status","priority"]), default="created_at")
@@ -159,7 +309,7 @@ def filter(status, sort_by, order, page, page_size):
     try:
         tasks = filter_tasks_by_status(status, page=page, page_size=page_size, sort_by=sort_by, order=order)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     if not tasks:
         console.print(f"Aucune tâche au statut {status}.", style="yellow")
@@ -178,12 +328,93 @@ def by_user(user_id, sort_by, order, page, page_size):
     try:
         tasks = get_tasks_by_user(user_id, page=page, page_size=page_size, sort_by=sort_by, order=order)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     header = f"Tâches pour user {user_id}" if user_id else "Tâches non assignées"
     _print_tasks(tasks, header)
 
 
+@cli.command(name="next")
+@click.argument("user_id", type=int, required=False)
+@click.option("--take", is_flag=True, help="Prendre la tâche : elle passe en ONGOING")
+def next_cmd(user_id, take):
+    """Afficher la prochaine tâche TODO d'un utilisateur (ou non assignée si omis) : priorité, échéance, ancienneté"""
+    try:
+        task = pop_next(user_id) if take else peek_next(user_id)
+    except ValueError as e:
+        _print_error(e)
+        return
+    if task is None:
+        console.print("Aucune tâche à traiter.", style="yellow")
+        return
+    header = f"Prochaine tâche pour user {user_id}" if user_id is not None else "Prochaine tâche non assignée"
+    _print_tasks([task], header + (" (prise)" if take else ""))
+
+
+@cli.command()
+@click.option("--status", type=click.Choice(["TODO","ONGOING","DONE"]), default=None)
+@click.option("--not-status", "exclude_status", type=click.Choice(["TODO","ONGOING","DONE"]), multiple=True,
+              help="Statut à exclure (option répétable)")
+@click.option("--priority", type=click.Choice(["LOW","NORMAL","HIGH","CRITICAL"]), default=None)
+@click.option("--user", "user_id", type=int, default=None, help="ID de l'utilisateur assigné")
+@click.option("--unassigned", is_flag=True, help="Seulement les tâches non assignées")
+@click.option("--tag", "tags", multiple=True, help="Tag (option répétable)")
+@click.option("--all-tags", is_flag=True, help="Exiger tous les tags plutôt qu'au moins un")
+@click.option("--keyword", default=None)
+@click.option("--due-from", default=None)
+@click.option("--due-to", default=None)
+@click.option("--created-from", default=None)
+@click.option("--created-to", default=None)
+@click.option("--overdue/--not-overdue", "overdue_flag", default=None)
+@click.option("--sort-by", type=click.Choice(["created_at","title","status","priority"]), default="created_at")
+@click.option("--order", type=click.Choice(["asc","desc"]), default="desc")
+@click.option("--page", type=int, default=1)
+@click.option("--page-size", type=int, default=20)
+@click.option("--explain", is_flag=True, help="Afficher le plan d'exécution au lieu des résultats")
+@click.option("--count", "count_only", is_flag=True, help="Afficher seulement le nombre de tâches")
+def query(status, exclude_status, priority, user_id, unassigned, tags, all_tags, keyword, due_from, due_to,
+          created_from, created_to, overdue_flag, sort_by, order, page, page_size, explain, count_only):
+    """Requête combinant tous les critères (statut, priorité, assigné, tags, mot-clé, dates, retard)"""
+    q = TaskQuery(
+        status=status, exclude_status=[*exclude_status] or None, priority=priority, keyword=keyword,
+        tags=[*tags] or None, tags_mode="all" if all_tags else "any",
+        due_from=due_from, due_to=due_to, created_from=created_from, created_to=created_to,
+        overdue=overdue_flag, sort_by=sort_by, order=order, page=page, page_size=page_size,
+    )
+    if unassigned:
+        q.assignee_id = None
+    elif user_id is not None:
+        q.assignee_id = user_id
+    try:
+        if count_only:
+            console.print(str(count_tasks(q)))
+            return
+        if explain:
+            plan = explain_query(q)
+        else:
+            tasks, pag = query_tasks(q, return_pagination=True)
+    except ValueError as e:
+        _print_error(e)
+        return
+    if explain:
+        table = Table(title="Plan de requête")
+        table.add_column("Élément", style="cyan")
+        table.add_column("Valeur", style="white")
+        access = f"index {plan['index']}" if plan["access"] == "index" else "parcours complet"
+        table.add_row("Accès", access)
+        table.add_row("Candidats estimés", f"{plan['estimated_rows']} / {plan['total_rows']}")
+        for name, cost in plan["alternatives"]:
+            table.add_row("Bitmap" if plan["access"] == "index" else "Alternative", f"{name} ({cost})")
+        table.add_row("Filtres", ", ".join(plan["filters"]) or "–")
+        table.add_row("Tri", plan["sort"])
+        console.print(table)
+        return
+    if not tasks:
+        console.print("Aucune tâche ne correspond.", style="yellow")
+        return
+    _print_tasks(tasks, f"Résultats (page {pag['current_page']}/{pag['total_pages']}, {pag['total_items']} tâches)")
+
+
 @cli.command()
 def overdue():
     """Lister les tâches en retard"""
@@ -194,6 +425,23 @@ def overdue():
     _print_tasks(tasks, "Tâches en retard")
 
 
+@cli.command()
+@click.option("--within", default="24h", help="Horizon des rappels : 30m, 24h, 2d, 1w…")
+@click.option("--no-overdue", is_flag=True, help="Ignorer les tâches déjà en retard")
+def remind(within, no_overdue):
+    """Lister les tâches ouvertes arrivant à échéance"""
+    try:
+        horizon = parse_duration(within)
+    except ValueError as e:
+        _print_error(e)
+        return
+    items = get_tasks_due_within(horizon, include_overdue=not no_overdue)
+    if not items:
+        console.print(f"Aucune échéance dans les {within}.", style="green")
+        return
+    _print_tasks([t for t, _ in items], f"Echéances dans les {within}")
+
+
 @cli.command()
 @click.argument("task_id", type=int)
 @click.argument("user_id", type=int, required=False)
@@ -202,7 +450,7 @@ def assign(task_id, user_id):
     try:
         t = assign_task(task_id, user_id)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     state = f"assignée à {user_id}" if user_id else "désassignée"
     console.print(f"Tâche {task_id} {state}.", style="green")
@@ -216,7 +464,7 @@ def due(task_id, due_date):
     try:
         t = set_due_date(task_id, due_date)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Échéance de la tâche {task_id} → {t.get('due_date')}", style="green")
 
@@ -229,7 +477,7 @@ def priority(task_id, priority):
     try:
         t = set_task_priority(task_id, priority)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Priorité de la tâche {task_id} → {t['priority']}", style="green")
 
@@ -242,7 +490,7 @@ def addtag(task_id, tag):
     try:
         t = add_tag(task_id, tag)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Tag '{tag}' ajouté à la tâche {task_id}.", style="green")
 
@@ -255,7 +503,7 @@ def rmtag(task_id, tag):
     try:
         t = remove_tag(task_id, tag)
     except ValueError as e:
-        console.print(str(e), style="bold red")
+        _print_error(e)
         return
     console.print(f"Tag '{tag}' retiré de la tâche {task_id}.", style="green")
 
@@ -283,8 +531,181 @@ def tags():
     table.add_column("Utilisations", style="cyan")
     for tag, count in sorted(freq.items(), key=lambda x: x[0]):
         table.add_row(tag, str(count))
+    with profiler.stage("render"):
+        console.print(table)
+
+
+@cli.command()
+@click.option("--by", "by", type=click.Choice(["user"]), default=None, help="Tableau croisé par utilisateur")
+def stats(by):
+    """Afficher les statistiques agrégées des tâches"""
+    st = get_task_stats(by_user=(by == "user"))
+    table = Table(title=f"Statistiques ({st['total']} tâches, {st['overdue']} en retard)")
+    table.add_column("Dimension", style="cyan")
+    table.add_column("Valeur", style="white")
+    table.add_column("Nombre", style="magenta", justify="right")
+    for status in ("TODO", "ONGOING", "DONE"):
+        table.add_row("Statut", status, str(st["by_status"].get(status, 0)))
+    for prio in ("CRITICAL", "HIGH", "NORMAL", "LOW"):
+        table.add_row("Priorité", prio, str(st["by_priority"].get(prio, 0)))
+    for tag, count in sorted(st["by_tag"].items(), key=lambda x: (-x[1], x[0])):
+        table.add_row("Tag", tag, str(count))
     console.print(table)
 
+    if by == "user":
+        names = {u["id"]: u["name"] for u in _load_users()}
+        cross = Table(title="Tâches par utilisateur")
+        cross.add_column("Utilisateur", style="cyan")
+        for status in ("TODO", "ONGOING", "DONE"):
+            cross.add_column(status, style="green", justify="right")
+        cross.add_column("Total", style="magenta", justify="right")
+        rows = sorted(st["by_user"].items(), key=lambda x: (x[0] is None, x[0] or 0))
+        for uid, counts in rows:
+            label = "Non assignées" if uid is None else f"{uid} – {names.get(uid, '?')}"
+            cross.add_row(label, *(str(counts.get(s, 0)) for s in ("TODO", "ONGOING", "DONE")),
+                          str(sum(counts.values())))
+        console.print(cross)
+
+
+@cli.command(name="complete")
+@click.argument("kind", type=click.Choice(["tag", "title", "user"]))
+@click.argument("prefix", required=False, default="")
+@click.option("--limit", type=int, default=10)
+def complete_cmd(kind, prefix, limit):
+    """Compléter un tag, un titre ou un nom d'utilisateur (une proposition par ligne)"""
+    try:
+        values = complete(kind, prefix, limit=limit)
+    except ValueError as e:
+        _print_error(e)
+        return
+    for value in values:
+        click.echo(value)
+
+
+@cli.command()
+@click.option("--since", type=int, default=0, help="Dernier numéro de séquence déjà traité")
+@click.option("--follow", is_flag=True, help="Continuer à afficher les nouveaux événements")
+@click.option("--duration", type=float, default=None, help="Avec --follow, arrêter après N secondes")
+@click.option("--reload", "hot_reload", is_flag=True, help="Avec --follow, recharger tasks.json/users.json quand ils changent")
+def watch(since, follow, duration, hot_reload):
+    """Afficher le flux des modifications (un événement JSON par ligne)"""
+    deadline = time.monotonic() + duration if duration is not None else None
+    seq = since
+    if follow and hot_reload:
+        start_hot_reload()
+    try:
+        events = get_changes(seq)
+        while True:
+            for event in events:
+                click.echo(json_dumps(event).decode("utf-8"))
+                seq = event["seq"]
+            if not follow or (deadline is not None and time.monotonic() >= deadline):
+                return
+            wait = 1.0 if deadline is None else max(0.0, min(1.0, deadline - time.monotonic()))
+            events = wait_for_changes(seq, timeout=wait)
+    except ChangeFeedTruncated as e:
+        _print_error(e)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_hot_reload()
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", help="Adresse d'écoute")
+@click.option("--port", type=int, default=8000, help="Port d'écoute")
+@click.option("--verbose", is_flag=True, help="Journaliser chaque requête")
+def serve(host, port, verbose):
+    """Exposer les tâches via une API HTTP/JSON locale (Ctrl+C pour arrêter)"""
+    from api_server import serve as serve_api
+    console.print(f"API disponible sur http://{host}:{port}/tasks", style="green")
+    serve_api(host, port, verbose)
+
+
+@cli.group()
+def cache():
+    """Gérer le cache de requêtes sur disque"""
+
+
+@cache.command(name="clear")
+@click.pass_context
+def cache_clear(ctx):
+    """Supprimer toutes les entrées du cache"""
+    removed = clear_query_cache(ctx.find_root().params["cache_dir"])
+    console.print(f"{removed} entrée(s) supprimée(s) du cache.", style="green")
+
+
+@cache.command(name="stats")
+@click.pass_context
+def cache_stats(ctx):
+    """Afficher la taille et l'occupation du cache"""
+    st = query_cache_stats(ctx.find_root().params["cache_dir"])
+    table = Table(title=f"Cache de requêtes ({st['path']})")
+    table.add_column("Mesure", style="cyan")
+    table.add_column("Valeur", style="magenta", justify="right")
+    table.add_row("Entrées", str(st["entries"]))
+    table.add_row("Entrées à jour", str(st["current_entries"]))
+    table.add_row("Entrées périmées", str(st["stale_entries"]))
+    table.add_row("Taille (octets)", f"{st['bytes']} / {st['max_bytes']}")
+    console.print(table)
+
+
+def _run_batch_line(ctx, args):
+    """Exécute une ligne de batch dans le contexte de la CLI ; retourne (sortie, message d'erreur ou None)."""
+    global _batch_errors
+    _batch_errors = []
+    out = io.StringIO()
+    error = None
+    try:
+        with redirect_stdout(out):
+            name, cmd, rest = cli.resolve_command(ctx, args)
+            if cmd is batch:
+                raise click.UsageError("Nested batch is not allowed")
+            with cmd.make_context(name, rest, parent=ctx) as sub_ctx:
+                cmd.invoke(sub_ctx)
+    except click.ClickException as e:
+        error = e.format_message()
+    except (click.exceptions.Exit, click.Abort):
+        pass
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    if error is None and _batch_errors:
+        error = _batch_errors[-1]
+    _batch_errors = None
+    return out.getvalue().rstrip(), error
+
+
+@cli.command()
+@click.argument("source", type=click.File("r", encoding="utf-8"), default="-")
+@click.option("--flush-every", type=int, default=100, show_default=True,
+              help="Écrire les utilisateurs sur disque toutes les N commandes (0 : seulement à la fin)")
+@click.option("--stop-on-error", is_flag=True, help="S'arrêter à la première commande en erreur")
+@click.pass_context
+def batch(ctx, source, flush_every, stop_on_error):
+    """Exécuter une commande par ligne (fichier ou - pour stdin) dans un seul processus, résultats en NDJSON"""
+    executed = 0
+    with deferred_user_writes():
+        for number, line in enumerate(source, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                args = shlex.split(line)
+            except ValueError as e:
+                output, error = "", str(e)
+            else:
+                output, error = _run_batch_line(ctx.parent, args)
+            click.echo(json_dumps({"line": number, "command": line, "ok": error is None,
+                                   "output": output, "error": error}).decode("utf-8"))
+            executed += 1
+            if flush_every > 0 and executed % flush_every == 0:
+                try:
+                    flush_users()
+                except OSError as e:
+                    _print_error(e)  # lot conservé : réessayé au prochain flush
+            if error is not None and stop_on_error:
+                break
+
 
 #
 # --- UTILISATEURS ---
@@ -297,8 +718,8 @@ def new_user(name, email):
     """Créer un nouvel utilisateur"""
     try:
         u = create_user(name, email)
-    except ValueError as e:
-        console.print(str(e), style="bold red")
+    except (ValueError, OSError) as e:  # OSError : écriture de users.json impossible, l'utilisateur reste en attente
+        _print_error(e)
         return
     console.print(f"Utilisateur créé (ID {u['id']})", style="green")
 
@@ -306,20 +727,34 @@ def new_user(name, email):
 @cli.command()
 @click.option("--page", type=int, default=1)
 @click.option("--page-size", type=int, default=20)
-def users(page, page_size):
+@click.option("--prefix", default=None, help="Seulement les noms commençant par ce préfixe")
+@click.option("--after", "after_id", type=int, default=None, help="Page suivant l'utilisateur d'ID donné (curseur)")
+def users(page, page_size, prefix, after_id):
     """Lister les utilisateurs"""
-    users, pag = get_users(page=page, page_size=page_size, return_pagination=True)
+    try:
+        users, pag = get_users(page=page, page_size=page_size, return_pagination=True,
+                               name_prefix=prefix, after_id=after_id)
+    except ValueError as e:
+        _print_error(e)
+        return
     if not users:
         console.print("Aucun utilisateur.", style="yellow")
         return
-    table = Table(title=f"Utilisateurs (page {pag['current_page']}/{pag['total_pages']})")
+    if after_id is not None:
+        title = f"Utilisateurs après {after_id} ({pag['total_items']} au total)"
+    else:
+        title = f"Utilisateurs (page {pag['current_page']}/{pag['total_pages']})"
+    table = Table(title=title)
     table.add_column("ID", style="cyan")
     table.add_column("Nom", style="white")
     table.add_column("Email", style="green")
     table.add_column("Créé le", style="magenta")
     for u in users:
         table.add_row(str(u["id"]), u["name"], u["email"], u["created_at"])
-    console.print(table)
+    with profiler.stage("render"):
+        console.print(table)
+    if pag["next_cursor"] is not None:
+        console.print(f"Page suivante : --after {pag['next_cursor']}", style="dim")
 
 
 if __name__ == '__main__':
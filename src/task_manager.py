@@ -1,41 +1,581 @@
 import json
 import os
-from typing import List, Dict, Union
-from datetime import datetime
+import sys
+import select
+import hashlib
+import tempfile
+import threading
+import atexit
+import time
+import bisect
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, List, Dict, Optional, Union
+from datetime import datetime, timedelta
 import re
+import heapq
+import math
+import unicodedata
+import itertools
+import functools
+import gc
+import operator
+import random
+import warnings
+import zlib
+import glob
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from array import array
+from collections import Counter, deque
 
-DATA_FILE = "tasks.json"
+# US028 – Instrumentation légère des chemins critiques
+class _Profiler:
+    """
+    Collecte des durées par étape et des compteurs (enregistrements parcourus, retenus, hits de cache...).
+    Désactivé par défaut : chaque point d'instrumentation se résume alors à un test de booléen.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.timings = {}   # étape -> [durée totale (s), nombre d'appels]
+        self.counters = {}  # compteur -> valeur
+
+    def reset(self):
+        self.timings.clear()
+        self.counters.clear()
+
+    def record(self, name, seconds):
+        entry = self.timings.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def stage(self, name):
+        """Context manager mesurant une étape (no-op si désactivé)."""
+        if self.enabled:
+            return self._timed(name)
+        return _NULL_STAGE
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+profiler = _Profiler()
+
+def enable_profiling(enabled=True):
+    """Active (ou désactive) l'instrumentation et remet les mesures à zéro."""
+    profiler.enabled = enabled
+    profiler.reset()
+
+def metrics_snapshot():
+    """Retourne les mesures courantes : {"timings": {étape: {"total_s", "calls"}}, "counters": {...}}."""
+    return {
+        "timings": {name: {"total_s": total, "calls": calls} for name, (total, calls) in profiler.timings.items()},
+        "counters": dict(profiler.counters),
+    }
+
+def format_metrics(fmt="json"):
+    """Sérialise les mesures au format 'json' ou texte Prometheus ('prometheus')."""
+    snap = metrics_snapshot()
+    if fmt == "json":
+        return json_dumps(snap, pretty=True).decode("utf-8")
+    if fmt != "prometheus":
+        raise ValueError("Invalid metrics format")
+    lines = [
+        "# TYPE task_manager_stage_seconds_total counter",
+        *(f'task_manager_stage_seconds_total{{stage="{name}"}} {t["total_s"]:.9f}' for name, t in snap["timings"].items()),
+        "# TYPE task_manager_stage_calls_total counter",
+        *(f'task_manager_stage_calls_total{{stage="{name}"}} {t["calls"]}' for name, t in snap["timings"].items()),
+        "# TYPE task_manager_events_total counter",
+        *(f'task_manager_events_total{{counter="{name}"}} {value}' for name, value in snap["counters"].items()),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# US046 – Codec JSON : orjson (ou ujson) s'il est installé, json de la bibliothèque standard sinon
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+try:
+    import ujson
+except ImportError:  # dépendance optionnelle
+    ujson = None
+
+JSON_PRETTY = False  # fichiers écrits par le module : compacts par défaut, indentés si True
+
+
+def _stdlib_dumps(obj, pretty=False, sort_keys=False, default=None):
+    if pretty:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, sort_keys=sort_keys, default=default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys, default=default)
+    return text.encode("utf-8")
+
+def _orjson_dumps(obj, pretty=False, sort_keys=False, default=None):
+    option = orjson.OPT_NON_STR_KEYS  # ex. statistiques par utilisateur, indexées par id
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=default, option=option)
+
+def _ujson_dumps(obj, pretty=False, sort_keys=False, default=None):
+    return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, indent=2 if pretty else 0,
+                       sort_keys=sort_keys, default=default).encode("utf-8")
+
+_JSON_CODECS = {
+    "orjson": (_orjson_dumps, lambda data: orjson.loads(data)),
+    "ujson": (_ujson_dumps, lambda data: ujson.loads(data)),
+    "json": (_stdlib_dumps, json.loads),
+}
+_json_codec = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+def set_json_codec(name=None):
+    """Choisit le codec ('orjson', 'ujson' ou 'json') ; None : le plus rapide des codecs installés."""
+    global _json_codec
+    if name is None:
+        name = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+    if name not in _JSON_CODECS:
+        raise ValueError("Unknown JSON codec")
+    if (name == "orjson" and orjson is None) or (name == "ujson" and ujson is None):
+        raise ValueError("JSON codec not installed")
+    _json_codec = name
+
+def json_codec():
+    return _json_codec
+
+def json_dumps(obj, pretty=False, sort_keys=False, default=None) -> bytes:
+    """Sérialise en UTF-8 (compact sauf pretty=True) avec le codec courant."""
+    return _JSON_CODECS[_json_codec][0](obj, pretty, sort_keys, default)
+
+def json_loads(data):
+    """Désérialise des octets ou une chaîne ; lève ValueError si le JSON est invalide."""
+    return _JSON_CODECS[_json_codec][1](data)
+
+
+# US047 : un fichier, un répertoire de fragments (*.json) ou un motif glob (ex. "data/tasks-*.json")
+DATA_FILE = os.environ.get("TASK_MANAGER_DATA", "tasks.json")
+_loaded_identity = None  # US042 : (chemin, inode, taille, mtime) du fichier effectivement chargé
+
+def _file_identity(path):
+    st = os.stat(path)
+    return (os.path.realpath(path), st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
 
 # US001 - Chargement initial des tâches (fallback si JSON corrompu)
-def _load_tasks():
-    """Charge une seule fois les tâches depuis le fichier JSON, ne jamais écrire dans ce fichier."""
-    if os.path.exists(DATA_FILE):
+@contextmanager
+def _gc_paused():
+    """Suspend le ramasse-miettes cyclique pendant la création en masse d'objets tous conservés (US047)."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _load_tasks(path=None, workers=None):
+    """
+    Charge une seule fois les tâches depuis le fichier JSON, ne jamais écrire dans ce fichier.
+    path (DATA_FILE par défaut) peut aussi désigner des fragments, lus en parallèle (US047).
+    """
+    global _loaded_identity
+    path = DATA_FILE if path is None else path
+    shards = _shard_paths(path)
+    if shards is not None:
+        return _load_shards(shards, workers)
+    if os.path.exists(path):
+        start = time.perf_counter()
         try:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            identity = _file_identity(path)
+            with open(path, 'rb') as f, _gc_paused():
+                tasks = json_loads(f.read())
+            # Fichier modifié pendant la lecture : pas d'identité fiable pour le cache de requêtes
+            _loaded_identity = identity if _file_identity(path) == identity else None
+            return tasks
+        except (ValueError, IOError):
             pass
+        finally:
+            # Toujours mesuré : le chargement a lieu à l'import, avant l'activation éventuelle du profilage
+            profiler.record("load_tasks", time.perf_counter() - start)
     # Fallback minimal si problème :
     return [
         {"id": 1, "title": "Première tâche", "description": "Description de la première tâche", "status": "TODO", "created_at": datetime.now().isoformat(timespec="seconds")},
         {"id": 2, "title": "Deuxième tâche", "description": "Description de la deuxième tâche", "status": "DONE", "created_at": datetime.now().isoformat(timespec="seconds")}
     ]
 
+# US047 – Fragments chargés en parallèle (un processus par fragment, résultat transmis en colonnes)
+LOAD_WORKERS = None  # None : autant de processus que de fragments, dans la limite des cœurs
+_ABSENT = ...        # valeur impossible en JSON : champ absent de l'enregistrement
+
+def _shard_paths(spec):
+    """Fragments désignés par spec, triés par nom (l'ordre des fragments est celui de task_list) ; None pour un fichier."""
+    if os.path.isdir(spec):
+        return sorted(glob.glob(os.path.join(spec, "*.json")))
+    if any(c in spec for c in "*?["):
+        return sorted(glob.glob(spec))
+    return None
+
+def _parse_shard(path, columnar=True):
+    """
+    Lit un fragment ; dans un processus fils, le renvoie en colonnes (champs, valeurs par champ) pour que
+    les noms de champs ne soient transmis qu'une fois. None si le fragment est illisible.
+    """
+    try:
+        with open(path, 'rb') as f:
+            records = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(records, list):
+        return None
+    if not columnar:
+        return records
+    fields = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    fields = [*fields]
+    return fields, [[record.get(field, _ABSENT) for record in records] for field in fields]
+
+def _records_from_columns(fields, columns, factory=dict):
+    if not columns:
+        return []
+    if all(_ABSENT not in column for column in columns):
+        return [factory(zip(fields, values)) for values in zip(*columns)]
+    return [factory((f, v) for f, v in zip(fields, values) if v is not _ABSENT) for values in zip(*columns)]
+
+def _parse_shards(paths, workers=None):
+    """Fragments lus : en colonnes s'ils viennent d'un pool de processus, en enregistrements sinon."""
+    workers = workers or LOAD_WORKERS or min(len(paths), os.cpu_count() or 1)
+    # Pas de pool dans un processus fils (ex. ré-import du module au démarrage d'un worker)
+    if workers > 1 and len(paths) > 1 and multiprocessing.parent_process() is None:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return [*pool.map(_parse_shard, paths)], True
+        except (OSError, BrokenExecutor):
+            pass  # processus indisponibles : lecture séquentielle
+    return [_parse_shard(path, columnar=False) for path in paths], False
+
+def _load_shards(paths, workers=None, factory=None):
+    """Tâches de tous les fragments, dans l'ordre des fragments ; les fragments illisibles sont ignorés."""
+    global _loaded_identity
+    start = time.perf_counter()
+    try:
+        identities = [_file_identity(p) for p in paths]
+        with _gc_paused():
+            parsed, columnar = _parse_shards(paths, workers)
+            # Construction en un seul passage, directement en _Task depuis les colonnes
+            factory = factory or _Task
+            if columnar:
+                tasks = [task for shard in parsed if shard is not None for task in _records_from_columns(*shard, factory)]
+            else:
+                tasks = [factory(record) for shard in parsed if shard is not None for record in shard]
+        profiler.count("shards_loaded", sum(shard is not None for shard in parsed))
+        stable = all(_file_identity(p) == identity for p, identity in zip(paths, identities))
+        _loaded_identity = ("shards", tuple(identities)) if stable else None
+        return tasks
+    except OSError:
+        _loaded_identity = None
+        return []
+    finally:
+        profiler.record("load_tasks", time.perf_counter() - start)
+
 USERS_FILE = "users.json"
 
 # US001 - Chargement initial des utilisateurs (fallback vide)
 def _load_users():
     if os.path.exists(USERS_FILE):
         try:
-            with open(USERS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            with open(USERS_FILE, 'rb') as f:
+                return json_loads(f.read())
+        except (ValueError, IOError):
             pass
     return []
 
 
-# On charge task_list UNE FOIS au lancement, puis on NE MODIFIE PLUS JAMAIS LE FICHIER
-task_list: List[Dict] = _load_tasks()
+# US029 – Liste de tâches qui signale ses modifications structurelles
+class TaskList(list):
+    """
+    list dont chaque modification structurelle (append, clear, del, affectation de tranche...)
+    incrémente `version`. Les index maintenus par ce module s'appuient sur ce compteur pour
+    détecter une modification faite en dehors des fonctions du module et se reconstruire.
+    Les dict ajoutés sont convertis en _Task, pour que leurs modifications directes mettent les index à jour.
+    """
+    version = 0
+
+    @staticmethod
+    def _wrap(item):
+        return _Task(item) if type(item) is dict else item
+
+    def _touch(self):
+        self.version += 1
+
+    def _purge(self, items=None):
+        """
+        US037 : retire les tâches supprimées avant une modification faite hors du module, pour
+        qu'une pierre tombale ne masque jamais une tâche réinsérée. Pour un ajout, seuls les
+        éléments ajoutés sont vérifiés (les ajouts du module ne déclenchent pas de compactage).
+        """
+        if not _tombstones or self is not task_list:
+            return
+        if items is not None and all(id(item) not in _tombstones for item in items):
+            return
+        live = [t for t in self if id(t) not in _tombstones]
+        _tombstones.clear()
+        super().__setitem__(slice(None), live)
+
+    def append(self, item):
+        item = self._wrap(item)
+        self._purge((item,))
+        super().append(item)
+        self._touch()
+
+    def extend(self, items):
+        items = [*map(self._wrap, items)]
+        self._purge(items)
+        super().extend(items)
+        self._touch()
+
+    def insert(self, index, item):
+        item = self._wrap(item)
+        self._purge((item,))
+        super().insert(index, item)
+        self._touch()
+
+    def pop(self, index=-1):
+        self._purge()
+        item = super().pop(index)
+        self._touch()
+        return item
+
+    def remove(self, item):
+        self._purge()
+        super().remove(item)
+        self._touch()
+
+    def clear(self):
+        self._purge()
+        super().clear()
+        self._touch()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._touch()
+
+    def reverse(self):
+        super().reverse()
+        self._touch()
+
+    def __setitem__(self, index, value):
+        value = [*map(self._wrap, value)] if isinstance(index, slice) else self._wrap(value)
+        self._purge()
+        super().__setitem__(index, value)
+        self._touch()
+
+    def __delitem__(self, index):
+        self._purge()
+        super().__delitem__(index)
+        self._touch()
+
+    def __iadd__(self, items):
+        items = [*map(self._wrap, items)]
+        self._purge(items)
+        result = super().__iadd__(items)
+        self._touch()
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._touch()
+        return result
+
+
+# US029 – Registre des index maintenus incrémentalement.
+# Chaque index expose rebuild(tasks), insert(task), remove(task) et update(task, before).
+_indexes = []
+_indexes_version = None
+_desc_store = None  # US039 : stockage des descriptions sur disque, si activé
+_txn = None  # US044 : transaction en cours (journal d'annulation), si ouverte
+# US037 – Suppression différée : la tâche reste dans task_list jusqu'au compactage
+_tombstones = {}   # id(tâche) -> tâche supprimée
+
+def _live_tasks():
+    """task_list sans les tâches supprimées en attente de compactage."""
+    if not _tombstones:
+        return task_list
+    return [t for t in task_list if id(t) not in _tombstones]
+
+def _register_index(index):
+    global _indexes_version
+    _indexes.append(index)
+    if _indexes_version is not None and _indexes_version == task_list.version:
+        # Les autres index sont à jour : seul le nouveau est construit
+        index.rebuild(_live_tasks())
+    else:
+        _indexes_version = None  # reconstruction complète au prochain accès
+
+def _ensure_indexes():
+    """Reconstruit les index si task_list a été modifiée en dehors des fonctions du module."""
+    global _indexes_version
+    if _indexes_version != task_list.version:
+        live = _live_tasks()  # les tâches supprimées en attente de compactage ne reviennent pas (US037)
+        for index in _indexes:
+            index.rebuild(live)
+        _indexes_version = task_list.version
+        if _desc_store is not None:
+            _desc_store.spill_all(task_list)
+
+def rebuild_indexes():
+    """Force la reconstruction des index (ex. après modification directe d'un dictionnaire de tâche)."""
+    global _indexes_version
+    _indexes_version = None
+    _ensure_indexes()
+
+def _snapshot(task):
+    """Copie superficielle d'une tâche (liste de tags incluse), utilisée comme état 'avant'."""
+    before = dict(task)
+    if "tags" in before:
+        before["tags"] = list(before["tags"])
+    return before
+
+def _on_insert(task):
+    global _indexes_version
+    if _txn is not None:
+        _txn.record_insert(task)
+    for index in _indexes:
+        index.insert(task)
+    _indexes_version = task_list.version
+    if _desc_store is not None:
+        _desc_store.spill(task)
+
+def _on_remove(task):
+    global _indexes_version
+    for index in _indexes:
+        index.remove(task)
+    _indexes_version = task_list.version
+
+def _on_remove_many(tasks):
+    """Comme _on_remove pour chaque tâche ; un index qui expose remove_many les retire en une fois."""
+    global _indexes_version
+    for index in _indexes:
+        remove_many = getattr(index, "remove_many", None)
+        if remove_many is not None:
+            remove_many(tasks)
+        else:
+            for task in tasks:
+                index.remove(task)
+    _indexes_version = task_list.version
+
+def _on_update(task, before):
+    if _txn is not None:
+        _txn.record_update(task, before)
+    for index in _indexes:
+        index.update(task, before)
+    if _desc_store is not None:
+        _desc_store.spill(task)  # après les index, qui ont pu lire la nouvelle description
+
+_update_depth = 0
+
+@contextmanager
+def _updating(task):
+    """
+    Encadre la modification d'une tâche : les index reçoivent l'état avant/après en sortie de bloc.
+    Les affectations faites dans le bloc sur une _Task ne déclenchent pas de notification propre.
+    """
+    global _update_depth
+    _ensure_indexes()
+    before = _snapshot(task)
+    _update_depth += 1
+    try:
+        yield task
+    finally:
+        _update_depth -= 1
+        _on_update(task, before)
+
+
+class _Task(dict):
+    """
+    Tâche dont les modifications directes (task["status"] = ..., del, update...) sont
+    répercutées dans les index, pour les tâches créées ou chargées par ce module.
+    """
+
+    def _notify(self, method, *args):
+        if _update_depth or _indexes_version != task_list.version or id(self) not in _index.rows:
+            # Déjà encadré par _updating, index à reconstruire de toute façon, ou tâche hors de la liste
+            return method(self, *args)
+        with _updating(self):
+            return method(self, *args)
+
+    def __setitem__(self, key, value):
+        self._notify(dict.__setitem__, key, value)
+
+    def __delitem__(self, key):
+        self._notify(dict.__delitem__, key)
+
+    def update(self, *args, **kwargs):
+        self._notify(lambda d: dict.update(d, *args, **kwargs))
+
+    def pop(self, *args):
+        return self._notify(dict.pop, *args)
+
+    def setdefault(self, key, default=None):
+        return self._notify(dict.setdefault, key, default)
+
+    def popitem(self):
+        return self._notify(dict.popitem)
+
+    def clear(self):
+        self._notify(dict.clear)
+
+    # US039 – Description déportée sur disque : position dans _desc_store.locations, indexée par id(tâche)
+    def __missing__(self, key):
+        if key == "description" and _desc_store is not None:
+            at = _desc_store.locations.get(id(self))
+            if at is not None:
+                return _desc_store.read(at)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key == "description" and _desc_store is not None and not dict.__contains__(self, key):
+            at = _desc_store.locations.get(id(self))
+            if at is not None:
+                return _desc_store.read(at)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (key == "description" and _desc_store is not None
+                                                and id(self) in _desc_store.locations)
+
+    def __del__(self):
+        # L'adresse de la tâche peut être réutilisée : sa position ne doit pas lui survivre
+        if _desc_store is not None:
+            _desc_store.locations.pop(id(self), None)
+
+
+# On charge task_list UNE FOIS au lancement, puis on NE MODIFIE PLUS JAMAIS LE FICHIER.
+# Un processus fils qui ré-importe le module (spawn/forkserver, ex. worker de _parse_shards) ne charge
+# rien : il n'a besoin que des fonctions ; s'il lui faut les tâches, il appelle reload_tasks().
+with _gc_paused():
+    task_list: List[Dict] = TaskList(t if isinstance(t, _Task) else _Task(t)
+                                     for t in (_load_tasks() if multiprocessing.parent_process() is None else ()))
 
 #def _save_tasks(tasks_to_save: List[Dict]):
 #    """Sauvegarde la liste courante des tâches dans le fichier JSON."""
@@ -71,6 +611,845 @@ def sort_tasks(tasks, sort_by="created_at", order="desc"):
     else:
         raise ValueError("Invalid sort criteria")
 
+# US030 – Index secondaires et planificateur de requêtes unifié
+ALLOWED_STATUS = ("TODO", "ONGOING", "DONE")
+ALLOWED_PRIORITIES = ("LOW", "NORMAL", "HIGH", "CRITICAL")
+_UNSET = object()
+
+
+# US038 – Bitmaps compressés façon roaring pour les index secondaires
+_ROARING_SHIFT = 16
+_ROARING_LOW = (1 << _ROARING_SHIFT) - 1
+_ROARING_BYTES = (1 << _ROARING_SHIFT) // 8
+_ARRAY_MAX = 4096  # au-delà, un bloc passe d'un ensemble de positions à un bitmap dense
+_BIT_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+_all_positions = None
+
+def _dense(values):
+    """Ensemble de positions (< 65536) -> entier bitmap."""
+    data = bytearray(_ROARING_BYTES)
+    for v in values:
+        data[v >> 3] |= 1 << (v & 7)
+    return int.from_bytes(data, "little")
+
+def _positions(bits):
+    """Entier bitmap -> positions des bits à 1, croissantes (décodage entièrement en C via compress)."""
+    global _all_positions
+    if _all_positions is None:
+        _all_positions = tuple(range(1 << _ROARING_SHIFT))
+    flags = format(bits, f"0{1 << _ROARING_SHIFT}b").encode().translate(_BIT_FLAGS)[::-1]
+    return [*itertools.compress(_all_positions, flags)]
+
+def _normalize(container):
+    """Choisit la représentation d'un bloc selon sa cardinalité ; None si vide."""
+    if isinstance(container, set):
+        if len(container) > _ARRAY_MAX:
+            return _dense(container)
+        return container or None
+    if not container:
+        return None
+    if container.bit_count() <= _ARRAY_MAX // 2:
+        return set(_positions(container))
+    return container
+
+def _sparse_and_dense(values, bits):
+    data = bits.to_bytes(_ROARING_BYTES, "little")
+    return {v for v in values if data[v >> 3] >> (v & 7) & 1}
+
+def _sparse_minus_dense(values, bits):
+    data = bits.to_bytes(_ROARING_BYTES, "little")
+    return {v for v in values if not data[v >> 3] >> (v & 7) & 1}
+
+
+class _Bitmap:
+    """
+    Ensemble de numéros de ligne découpé en blocs de 65536 lignes (ligne >> 16), à la manière de roaring :
+    un bloc peu rempli est un ensemble de positions, un bloc dense un entier utilisé comme bitmap.
+    Intersection, union et différence se font bloc à bloc (opérations d'ensembles ou binaires),
+    et la cardinalité se lit sans énumérer les lignes. La cardinalité d'un bloc dense est comptée
+    une fois puis tenue à jour par add/discard : il ne repasse en ensemble que sous _ARRAY_MAX / 2.
+    """
+
+    __slots__ = ("chunks", "counts")
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks if chunks is not None else {}
+        self.counts = {}  # bloc dense -> cardinalité, si déjà connue
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Bitmap construit en une passe (reconstruction d'index)."""
+        by_chunk = {}
+        for row in rows:
+            by_chunk.setdefault(row >> _ROARING_SHIFT, []).append(row & _ROARING_LOW)
+        return cls({key: _normalize(set(lows)) for key, lows in by_chunk.items()})
+
+    def _count(self, key, container):
+        count = self.counts.get(key)
+        if count is None:
+            count = self.counts[key] = container.bit_count()
+        return count
+
+    def add(self, row):
+        key, low = row >> _ROARING_SHIFT, row & _ROARING_LOW
+        container = self.chunks.get(key)
+        if container is None:
+            self.chunks[key] = {low}
+        elif isinstance(container, set):
+            container.add(low)
+            if len(container) > _ARRAY_MAX:
+                self.chunks[key] = _dense(container)
+                self.counts[key] = len(container)
+        elif not container >> low & 1:
+            self.chunks[key] = container | (1 << low)
+            if key in self.counts:
+                self.counts[key] += 1
+
+    def discard(self, row):
+        key, low = row >> _ROARING_SHIFT, row & _ROARING_LOW
+        container = self.chunks.get(key)
+        if container is None:
+            return
+        if isinstance(container, set):
+            container.discard(low)
+            if not container:
+                del self.chunks[key]
+        elif container >> low & 1:
+            count = self._count(key, container) - 1
+            container ^= 1 << low
+            if count <= _ARRAY_MAX // 2:
+                del self.counts[key]
+                self.chunks[key] = set(_positions(container))
+            else:
+                self.counts[key] = count
+                self.chunks[key] = container
+
+    def discard_many(self, rows):
+        """Retire plusieurs lignes en modifiant chaque bloc une seule fois (suppressions en masse)."""
+        by_chunk = {}
+        for row in rows:
+            by_chunk.setdefault(row >> _ROARING_SHIFT, []).append(row & _ROARING_LOW)
+        for key, lows in by_chunk.items():
+            container = self.chunks.get(key)
+            if container is None:
+                continue
+            if isinstance(container, set):
+                container.difference_update(lows)
+                rest = container or None
+            else:
+                self.counts.pop(key, None)
+                rest = _normalize(container & ~_dense(lows))
+            if rest is None:
+                del self.chunks[key]
+            else:
+                self.chunks[key] = rest
+
+    def __contains__(self, row):
+        container = self.chunks.get(row >> _ROARING_SHIFT)
+        low = row & _ROARING_LOW
+        if isinstance(container, set):
+            return low in container
+        return container is not None and bool(container >> low & 1)
+
+    def __len__(self):
+        return sum(len(c) if isinstance(c, set) else self._count(key, c) for key, c in self.chunks.items())
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+    def __and__(self, other):
+        small, large = (self.chunks, other.chunks) if len(self.chunks) <= len(other.chunks) else (other.chunks, self.chunks)
+        result = {}
+        for key, a in small.items():
+            b = large.get(key)
+            if b is None:
+                continue
+            if isinstance(a, set) and isinstance(b, set):
+                both = a & b
+            elif isinstance(a, set):
+                both = _sparse_and_dense(a, b)
+            elif isinstance(b, set):
+                both = _sparse_and_dense(b, a)
+            else:
+                both = a & b
+            both = _normalize(both)
+            if both is not None:
+                result[key] = both
+        return _Bitmap(result)
+
+    def __or__(self, other):
+        result = {key: (set(c) if isinstance(c, set) else c) for key, c in self.chunks.items()}
+        for key, b in other.chunks.items():
+            a = result.get(key)
+            if a is None:
+                merged = set(b) if isinstance(b, set) else b
+            elif isinstance(a, set) and isinstance(b, set):
+                merged = a | b
+            else:
+                merged = (_dense(a) if isinstance(a, set) else a) | (_dense(b) if isinstance(b, set) else b)
+            result[key] = _normalize(merged)
+        return _Bitmap(result)
+
+    def __sub__(self, other):
+        result = {}
+        for key, a in self.chunks.items():
+            b = other.chunks.get(key)
+            if b is None:
+                rest = set(a) if isinstance(a, set) else a
+            elif isinstance(a, set):
+                rest = a - b if isinstance(b, set) else _sparse_minus_dense(a, b)
+            else:
+                rest = _normalize(a & ~(_dense(b) if isinstance(b, set) else b))
+            if rest:
+                result[key] = rest
+        return _Bitmap(result)
+
+    def to_list(self):
+        """Lignes dans l'ordre croissant."""
+        rows = []
+        for key in sorted(self.chunks):
+            base = key << _ROARING_SHIFT
+            container = self.chunks[key]
+            positions = sorted(container) if isinstance(container, set) else _positions(container)
+            rows.extend(map(base.__add__, positions) if base else positions)
+        return rows
+
+    def __iter__(self):
+        """Lignes dans l'ordre croissant, décodées bloc par bloc (arrêt anticipé possible, US045)."""
+        return self.iter_from(0)
+
+    def iter_from(self, start):
+        """Lignes >= start dans l'ordre croissant : les blocs antérieurs ne sont pas décodés (curseur, US041)."""
+        first = start >> _ROARING_SHIFT
+        for key in sorted(self.chunks):
+            if key < first:
+                continue
+            base = key << _ROARING_SHIFT
+            container = self.chunks[key]
+            positions = sorted(container) if isinstance(container, set) else _positions(container)
+            if key == first:
+                positions = positions[bisect.bisect_left(positions, start & _ROARING_LOW):]
+            yield from (map(base.__add__, positions) if base else positions)
+
+    @classmethod
+    def union_all(cls, bitmaps):
+        result = cls()
+        for bitmap in bitmaps:
+            result = result | bitmap
+        return result
+
+
+class _TaskIndex:
+    """
+    Index des tâches :
+    - chaque tâche reçoit un numéro de ligne croissant (l'ordre des lignes est l'ordre de task_list),
+      renuméroté de façon dense à chaque compactage
+    - by_id : id de tâche -> tâche (première occurrence, comme un parcours de la liste)
+    - postings : valeur de statut / priorité / assigné / tag -> bitmap des lignes ; all_rows : toutes les lignes
+    """
+
+    FIELDS = ("status", "priority", "assignee_id")
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.rows = {}       # id(tâche) -> ligne
+        self.by_row = []     # ligne -> tâche (None pour une ligne supprimée)
+        self.by_id = {}
+        self.id_counts = Counter()  # doublons d'id : évite de rechercher une autre occurrence à chaque suppression
+        self.postings = {field: {} for field in self.FIELDS}
+        self.by_tag = {}
+        self.next_row = 0
+        self._max_id = None  # recalculé à la demande
+        # Lignes collectées par valeur, puis chaque bitmap construit en une passe
+        postings = {field: {} for field in self.FIELDS}
+        by_tag = {}
+        for row, task in enumerate(tasks):
+            self.rows[id(task)] = row
+            self.by_row.append(task)
+            self.by_id.setdefault(task.get("id"), task)
+            self.id_counts[task.get("id")] += 1
+            for field, value in self._values(task):
+                postings[field].setdefault(value, []).append(row)
+            for tag in task.get("tags", []):
+                by_tag.setdefault(tag, []).append(row)
+        self.next_row = len(self.by_row)
+        self.all_rows = _Bitmap.from_rows(range(self.next_row))
+        for field, values in postings.items():
+            self.postings[field] = {value: _Bitmap.from_rows(rows) for value, rows in values.items()}
+        self.by_tag = {tag: _Bitmap.from_rows(rows) for tag, rows in by_tag.items()}
+
+    @staticmethod
+    def _values(task):
+        """(champ, valeur) indexés de la tâche."""
+        return (
+            ("status", task.get("status")),
+            ("priority", task.get("priority", "NORMAL")),
+            ("assignee_id", task.get("assignee_id")),
+        )
+
+    def _add_postings(self, task, row):
+        for field, value in self._values(task):
+            bitmap = self.postings[field].get(value)
+            if bitmap is None:
+                bitmap = self.postings[field][value] = _Bitmap()
+            bitmap.add(row)
+        for tag in task.get("tags", []):
+            bitmap = self.by_tag.get(tag)
+            if bitmap is None:
+                bitmap = self.by_tag[tag] = _Bitmap()
+            bitmap.add(row)
+
+    def _remove_postings(self, task, row):
+        for field, value in self._values(task):
+            rows = self.postings[field].get(value)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self.postings[field][value]
+        for tag in task.get("tags", []):
+            rows = self.by_tag.get(tag)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self.by_tag[tag]
+
+    def insert(self, task, row=None):
+        """row : ligne libérée à réutiliser (annulation d'une suppression, US044), sinon nouvelle ligne."""
+        if row is not None and row < self.next_row and self.by_row[row] is None:
+            self.by_row[row] = task
+        else:
+            row = self.next_row
+            self.next_row += 1
+            self.by_row.append(task)
+        self.rows[id(task)] = row
+        self.all_rows.add(row)
+        self.by_id.setdefault(task.get("id"), task)
+        self.id_counts[task.get("id")] += 1
+        if self._max_id is not None and isinstance(task.get("id"), int):
+            self._max_id = max(self._max_id, task["id"])
+        self._add_postings(task, row)
+
+    def remove(self, task):
+        row = self._forget(task)
+        if row is not None:
+            self.all_rows.discard(row)
+            self._remove_postings(task, row)
+
+    def remove_many(self, tasks):
+        """Comme remove pour chaque tâche, mais chaque bitmap n'est modifié qu'une fois (suppressions en masse)."""
+        removed, pending = [], {}
+        for task in tasks:
+            row = self._forget(task)
+            if row is None:
+                continue
+            removed.append(row)
+            for field, value in self._values(task):
+                pending.setdefault((field, value), []).append(row)
+            for tag in task.get("tags", []):
+                pending.setdefault((None, tag), []).append(row)
+        self.all_rows.discard_many(removed)
+        for (field, value), rows in pending.items():
+            postings = self.by_tag if field is None else self.postings[field]
+            bitmap = postings.get(value)
+            if bitmap is not None:
+                bitmap.discard_many(rows)
+                if not bitmap:
+                    del postings[value]
+
+    def _forget(self, task):
+        """Libère la ligne de la tâche (hors bitmaps) et retourne son numéro, ou None."""
+        row = self.rows.pop(id(task), None)
+        if row is None:
+            return None
+        self.by_row[row] = None
+        tid = task.get("id")
+        self.id_counts[tid] -= 1
+        if not self.id_counts[tid]:
+            del self.id_counts[tid]
+        if self.by_id.get(tid) is task:
+            del self.by_id[tid]
+        if tid in self.id_counts and tid not in self.by_id:
+            # Doublon d'id : la première occurrence restante prend le relais
+            for other_row in sorted(self.rows.values()):
+                if self.by_row[other_row].get("id") == tid:
+                    self.by_id[tid] = self.by_row[other_row]
+                    break
+        if tid == self._max_id:
+            self._max_id = None  # recalculé à la demande
+        return row
+
+    def update(self, task, before):
+        row = self.rows.get(id(task))
+        if row is None:
+            return
+        self._remove_postings(before, row)
+        self._add_postings(task, row)
+
+    def max_id(self):
+        if self._max_id is None:
+            self._max_id = max((tid for tid in self.by_id if isinstance(tid, int)), default=0)
+        return self._max_id
+
+    def tasks_for_rows(self, rows):
+        """Tâches correspondant aux lignes d'un bitmap, dans l'ordre de task_list."""
+        return [*map(self.by_row.__getitem__, rows.to_list())]
+
+    def iter_rows(self, rows):
+        """Comme tasks_for_rows, mais paresseux (US045)."""
+        return map(self.by_row.__getitem__, rows)
+
+
+_index = _TaskIndex()
+_register_index(_index)
+
+
+# US045 – Ordre par date de création maintenu par index (ordre stable : à date égale, ordre de task_list)
+class _CreatedOrderIndex:
+    """Liste triée de (created_at, ligne) ; enregistré après _index, dont il reprend les numéros de ligne."""
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.key_of = {}
+        self.keys = []
+        for task in tasks:
+            row = _index.rows.get(id(task))
+            if row is not None:
+                key = self.key_of[id(task)] = (task.get("created_at") or "", row)
+                self.keys.append(key)
+        self.keys.sort()
+
+    def insert(self, task):
+        row = _index.rows.get(id(task))
+        if row is not None:
+            key = self.key_of[id(task)] = (task.get("created_at") or "", row)
+            bisect.insort(self.keys, key)
+
+    def remove(self, task):
+        key = self.key_of.pop(id(task), None)
+        if key is not None:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+
+    def remove_many(self, tasks):
+        """Suppressions en masse : la liste triée est refiltrée une seule fois."""
+        removed = {self.key_of.pop(id(task)) for task in tasks if id(task) in self.key_of}
+        if removed:
+            self.keys = [key for key in self.keys if key not in removed]
+
+    def update(self, task, before):
+        if task.get("created_at") != before.get("created_at"):
+            self.remove(task)
+            self.insert(task)
+
+    def ordered_rows(self, descending=False, after=None):
+        """
+        Lignes par date croissante ; en décroissant, les dates égales gardent l'ordre de task_list (comme sorted).
+        after : tâche indexée après laquelle le parcours reprend (curseur, US041), trouvée par bisect.
+        """
+        keys = self.keys
+        anchor = None if after is None else self.key_of[id(after)]
+        if not descending:
+            for i in range(0 if anchor is None else bisect.bisect_right(keys, anchor), len(keys)):
+                yield keys[i][1]
+            return
+        end = len(keys)
+        if anchor is not None:
+            # Fin du groupe de même date (lignes suivantes), puis les dates antérieures
+            for i in range(bisect.bisect_right(keys, anchor), bisect.bisect_left(keys, (anchor[0], math.inf))):
+                yield keys[i][1]
+            end = bisect.bisect_left(keys, (anchor[0],))
+        while end:
+            start = end - 1
+            created = keys[start][0]
+            while start and keys[start - 1][0] == created:
+                start -= 1
+            for i in range(start, end):
+                yield keys[i][1]
+            end = start
+
+
+_created_index = _CreatedOrderIndex()
+_register_index(_created_index)
+
+def _find_task(tid, rehydrate=False):
+    """
+    Retourne la tâche d'id tid (int) via l'index primaire, ou None.
+    rehydrate=True : une tâche archivée (US049) est d'abord réintégrée dans task_list.
+    """
+    _ensure_indexes()
+    task = _index.by_id.get(tid)
+    if task is None and rehydrate and _archive is not None:
+        task = _archive.rehydrate(tid)
+    return task
+
+
+@dataclass
+class TaskQuery:
+    """
+    Requête combinant librement les critères de filtrage, le tri et la pagination.
+    - exclude_status : statuts à écarter (ex. ["DONE"])
+    - assignee_id : id d'utilisateur, None pour les tâches non assignées (non renseigné = pas de filtre)
+    - tags / tags_mode : 'any' (au moins un des tags) ou 'all' (tous les tags)
+    - due_from/due_to, created_from/created_to : bornes ISO incluses
+    - overdue : True/False pour ne garder que les tâches (non) en retard
+    - sort_by=None conserve l'ordre de task_list ; page_size=None désactive la pagination
+    - include_archived : consulter aussi l'archive (US049), comme le fait toujours status="DONE"
+    - after_id : pagination par curseur, la page commence après cette tâche (page est alors ignoré) ;
+      dans l'ordre de task_list ou par created_at, le parcours reprend directement à sa position
+    """
+    status: Optional[str] = None
+    exclude_status: Optional[List[str]] = None
+    priority: Optional[str] = None
+    assignee_id: Any = _UNSET
+    tags: Optional[List[str]] = None
+    tags_mode: str = "any"
+    keyword: Optional[str] = None
+    due_from: Optional[str] = None
+    due_to: Optional[str] = None
+    created_from: Optional[str] = None
+    created_to: Optional[str] = None
+    overdue: Optional[bool] = None
+    sort_by: Optional[str] = "created_at"
+    order: str = "desc"
+    page: int = 1
+    page_size: Optional[int] = 20
+    include_archived: bool = False
+    after_id: Optional[int] = None
+
+
+def _parse_bound(value):
+    try:
+        return datetime.fromisoformat(value)
+    except Exception:
+        raise ValueError("Invalid date format")
+
+def _validate_query(q):
+    """Normalise et valide la requête (mêmes messages d'erreur que get_tasks)."""
+    if q.page_size is not None and q.page_size <= 0:
+        raise ValueError("Invalid page size")
+    if q.status is not None and q.status not in ALLOWED_STATUS:
+        raise ValueError("Invalid filter status")
+    if q.exclude_status and not set(q.exclude_status) <= set(ALLOWED_STATUS):
+        raise ValueError("Invalid filter status")
+    if q.priority is not None:
+        q.priority = q.priority.upper()
+        if q.priority not in ALLOWED_PRIORITIES:
+            raise ValueError("Invalid priority. Allowed values: LOW, NORMAL, HIGH, CRITICAL")
+    if q.tags_mode not in ("any", "all"):
+        raise ValueError("Invalid tags mode")
+    if q.after_id is not None and (isinstance(q.after_id, bool) or not isinstance(q.after_id, int)):
+        raise ValueError("Invalid cursor")
+    return q
+
+def _date_predicate(field, lower, upper):
+    lo = _parse_bound(lower) if lower is not None else None
+    hi = _parse_bound(upper) if upper is not None else None
+
+    def predicate(t):
+        value = t.get(field)
+        if not value:
+            return False
+        try:
+            dt = datetime.fromisoformat(value)
+        except Exception:
+            return False
+        return (lo is None or dt >= lo) and (hi is None or dt <= hi)
+    return predicate
+
+def _keyword_predicate(kw):
+    """
+    Mot-clé (minuscule) dans le titre ou la description. Si les descriptions sont sur disque (US039),
+    l'index textuel désigne les seules tâches candidates ; la description déportée d'une candidate
+    est relue directement (sans passer par le cache LRU) pour confirmer la sous-chaîne.
+    """
+    if _desc_store is None:
+        return lambda t: kw in t.get("title", "").lower() or kw in t.get("description", "").lower()
+    store = _desc_store
+    candidates = _get_text_index().keyword_docs(kw)
+
+    def predicate(t):
+        if candidates is not None and id(t) not in candidates:
+            return False
+        if kw in t.get("title", "").lower():
+            return True
+        at = store.locations.get(id(t)) if not dict.__contains__(t, "description") else None
+        if at is None:
+            return kw in t.get("description", "").lower()
+        return kw in store.peek(at).lower()
+    return predicate
+
+def _predicates(q):
+    """Liste de (description, prédicat) pour chaque critère de la requête."""
+    preds = []
+    if q.status is not None:
+        preds.append((f"status={q.status}", lambda t, s=q.status: t.get("status") == s))
+    if q.exclude_status:
+        excluded = set(q.exclude_status)
+        preds.append((f"status∉{sorted(excluded)}", lambda t: t.get("status") not in excluded))
+    if q.priority is not None:
+        preds.append((f"priority={q.priority}", lambda t, p=q.priority: t.get("priority", "NORMAL") == p))
+    if q.assignee_id is not _UNSET:
+        preds.append((f"assignee_id={q.assignee_id}", lambda t, u=q.assignee_id: t.get("assignee_id") == u))
+    if q.tags:
+        wanted = set(q.tags)
+        if q.tags_mode == "all":
+            preds.append((f"tags⊇{sorted(wanted)}", lambda t: wanted.issubset(t.get("tags", []))))
+        else:
+            preds.append((f"tags∩{sorted(wanted)}", lambda t: not wanted.isdisjoint(t.get("tags", []))))
+    if q.keyword:
+        kw = q.keyword.lower()
+        preds.append((f"keyword~{kw!r}", _keyword_predicate(kw)))
+    if q.due_from is not None or q.due_to is not None:
+        preds.append((f"due_date∈[{q.due_from}, {q.due_to}]", _date_predicate("due_date", q.due_from, q.due_to)))
+    if q.created_from is not None or q.created_to is not None:
+        preds.append((f"created_at∈[{q.created_from}, {q.created_to}]", _date_predicate("created_at", q.created_from, q.created_to)))
+    if q.overdue is not None:
+        preds.append((f"overdue={q.overdue}", lambda t, o=q.overdue: is_overdue(t) == o))
+    return preds
+
+def _index_candidates(q):
+    """Accès par index possibles : liste de (description, bitmap des lignes candidates)."""
+    access = []
+    empty = _Bitmap()
+    if q.status is not None:
+        access.append((f"status={q.status}", _index.postings["status"].get(q.status, empty)))
+    if q.exclude_status:
+        statuses = _index.postings["status"]
+        excluded = _Bitmap.union_all(statuses.get(s, empty) for s in set(q.exclude_status))
+        access.append((f"status∉{sorted(set(q.exclude_status))}", _index.all_rows - excluded))
+    if q.priority is not None:
+        access.append((f"priority={q.priority}", _index.postings["priority"].get(q.priority, empty)))
+    if q.assignee_id is not _UNSET:
+        access.append((f"assignee_id={q.assignee_id}", _index.postings["assignee_id"].get(q.assignee_id, empty)))
+    if q.tags:
+        tag_rows = [_index.by_tag.get(tag, empty) for tag in sorted(set(q.tags))]
+        if q.tags_mode == "all":
+            combined = tag_rows[0]
+            for rows in tag_rows[1:]:
+                combined = combined & rows
+            access.append((f"tags={sorted(q.tags)} (all)", combined))
+        else:
+            access.append((f"tags={sorted(q.tags)} (any)", _Bitmap.union_all(tag_rows)))
+    return access
+
+def _combined_bitmap(access):
+    """Intersection (ET bit à bit) des accès, du plus sélectif au moins sélectif ; None sans accès."""
+    combined = None
+    for _, bitmap in sorted(access, key=lambda a: len(a[1])):
+        combined = bitmap if combined is None else combined & bitmap
+        if not combined:
+            break
+    return combined
+
+def _plan_query(q):
+    """
+    Combine tous les critères indexés par ET bit à bit ; le nombre de candidats est alors exact.
+    Sans critère indexé, ou si la combinaison ne réduit rien, parcours complet.
+    """
+    access = _index_candidates(q)
+    total = len(_index.rows)
+    combined = _combined_bitmap(access)
+    estimated = len(combined) if combined is not None else total
+    if combined is None or estimated >= total:
+        return {"access": "scan", "index": None, "estimated_rows": total, "source": None,
+                "alternatives": [(name, len(bitmap)) for name, bitmap in access]}
+    ordered = sorted(access, key=lambda a: len(a[1]))
+    return {"access": "index", "index": " & ".join(name for name, _ in ordered), "estimated_rows": estimated,
+            "source": combined, "alternatives": [(name, len(bitmap)) for name, bitmap in ordered]}
+
+def _filtered(q, candidates):
+    """Chaîne de générateurs : un filtre paresseux par critère, rien n'est matérialisé."""
+    # Tous les critères sont revérifiés sur les candidats : l'index ne sert qu'à réduire le parcours
+    stream = iter(candidates)
+    for _, predicate in _predicates(q):
+        stream = filter(predicate, stream)
+    return stream
+
+def _run_query(q, plan=None):
+    """Exécute la requête validée et retourne la liste complète (triée) des tâches retenues."""
+    _ensure_indexes()
+    if plan is None:
+        with profiler.stage("plan"):
+            plan = _plan_query(q)
+    with profiler.stage("filter"):
+        candidates = _live_tasks() if plan["access"] == "scan" else _index.tasks_for_rows(plan["source"])
+        tasks = [*_filtered(q, candidates)]
+    profiler.count("index_scans" if plan["access"] == "index" else "full_scans")
+    profiler.count("tasks_scanned", len(candidates))
+    profiler.count("tasks_matched", len(tasks))
+    if q.sort_by is not None:
+        with profiler.stage("sort"):
+            tasks = sort_tasks(tasks, sort_by=q.sort_by, order=q.order)
+    return tasks
+
+def _paginate(items, page, page_size, return_pagination):
+    if page_size is None:
+        return (items, None) if return_pagination else items
+    total_items = len(items)
+    total_pages = (total_items + page_size - 1) // page_size if total_items else 0
+    start = (page - 1) * page_size
+    end = start + page_size
+    paged = items[start:end]
+    if return_pagination:
+        pagination = {
+            "current_page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "total_items": total_items,
+            "has_next": end < total_items
+        }
+        return paged, pagination
+    return paged
+
+# US045 – Pipeline paresseux : ordre fourni par un index et arrêt dès que la page est remplie
+def _ordered_candidates(q, plan, needed, after=None):
+    """
+    Candidats déjà dans l'ordre demandé (ordre de task_list, ou index created_at), ou None si un tri
+    reste préférable. L'index created_at n'est parcouru que si l'on s'attend à remplir les `needed`
+    premières places en visitant moins de lignes qu'il n'y a de candidats à trier.
+    after : seuls les candidats qui suivent cette tâche (curseur, US041).
+    """
+    source = plan["source"]
+    if q.sort_by is None:
+        if after is not None:
+            rows = _index.all_rows if source is None else source
+            return _index.iter_rows(rows.iter_from(_index.rows[id(after)] + 1))
+        return _live_tasks() if source is None else _index.iter_rows(source)
+    if q.sort_by != "created_at" or q.order not in ("asc", "desc"):
+        return None
+    if source is not None and needed * len(_index.rows) > len(source) ** 2:
+        return None  # peu de candidats : les trier coûte moins que parcourir l'index
+    rows = _created_index.ordered_rows(descending=q.order == "desc", after=after)
+    if source is not None:
+        rows = filter(source.__contains__, rows)
+    return _index.iter_rows(rows)
+
+def _count_matches(q, plan):
+    """Nombre de tâches retenues, sans tri ni liste : cardinalité du bitmap si tous les critères sont indexés."""
+    if all(getattr(q, name) is None for name in _UNINDEXED_CRITERIA):
+        profiler.count("bitmap_counts")
+        return len(_index.rows) if plan["source"] is None else len(plan["source"])
+    candidates = _live_tasks() if plan["source"] is None else _index.iter_rows(plan["source"])
+    return sum(1 for _ in _filtered(q, candidates))
+
+def _paginate_after(q, tasks, anchor):
+    """
+    Page des tâches (déjà dans l'ordre de la requête) qui suivent `anchor`, que celle-ci fasse encore
+    partie du résultat ou non ; total_items reste le nombre total de tâches retenues.
+    """
+    tid = anchor.get("id")
+    after = next((i + 1 for i, task in enumerate(tasks) if task.get("id") == tid), None)
+    if after is None:
+        if q.sort_by is None:
+            raise ValueError("Invalid cursor")
+        # Égalités départagées par l'ordre de task_list, comme dans le tri d'origine (archive en dernier)
+        base = sorted(tasks + [anchor], key=lambda t: _index.rows.get(id(t), len(_index.rows)))
+        ordered = sort_tasks(base, sort_by=q.sort_by, order=q.order)
+        after = next(i for i, t in enumerate(ordered) if t is anchor)
+    items, pagination = _paginate(tasks[after:], 1, q.page_size, True)
+    if pagination is not None:
+        pagination["current_page"] = q.page
+        pagination["total_items"] = len(tasks)
+        pagination["total_pages"] = (len(tasks) + q.page_size - 1) // q.page_size
+    return items, pagination
+
+def _query_page(q, with_total):
+    """Page demandée ; total_items est calculé à part (et seulement si with_total)."""
+    _ensure_indexes()
+    anchor = None
+    if q.after_id is not None:
+        anchor = _index.by_id.get(q.after_id)
+        if anchor is None:
+            raise ValueError("Task not found")
+    if q.page_size is None or q.page < 1:
+        tasks = _run_query(q)
+        return _paginate(tasks, q.page, q.page_size, True) if anchor is None else _paginate_after(q, tasks, anchor)
+    with profiler.stage("plan"):
+        plan = _plan_query(q)
+    start = 0 if anchor is not None else (q.page - 1) * q.page_size
+    end = start + q.page_size
+    ordered = _ordered_candidates(q, plan, end + 1, after=anchor)
+    if ordered is None:
+        tasks = _run_query(q, plan)
+        if anchor is None:
+            return _paginate(tasks, q.page, q.page_size, True)
+        return _paginate_after(q, tasks, anchor)
+    visited = itertools.count()
+    with profiler.stage("filter"):
+        ordered = (task for task, _ in zip(ordered, visited))
+        window = [*itertools.islice(_filtered(q, ordered), start, end + 1)]  # +1 : y a-t-il une suite ?
+    profiler.count("streamed_queries")
+    profiler.count("index_scans" if plan["access"] == "index" else "full_scans")
+    profiler.count("tasks_scanned", next(visited))
+    profiler.count("tasks_matched", len(window))
+    total_items = _count_matches(q, plan) if with_total else None
+    return window[:q.page_size], {
+        "current_page": q.page,
+        "page_size": q.page_size,
+        "total_pages": None if total_items is None else (total_items + q.page_size - 1) // q.page_size,
+        "total_items": total_items,
+        "has_next": len(window) > q.page_size,
+    }
+
+def query_tasks(query: TaskQuery, return_pagination=False, with_total=True):
+    """
+    Exécute une TaskQuery (tous critères combinables) et retourne la page demandée.
+    with_total=False : total_items et total_pages valent None dans la pagination (has_next reste
+    renseigné) ; avec un ordre fourni par un index, seules les tâches de la page sont alors parcourues.
+    """
+    q = _validate_query(query)
+    with_total = with_total and return_pagination
+    if _wants_archive(q):
+        items, pagination = _query_with_archive(q)
+        return (items, pagination) if return_pagination else items
+    # US042 : les requêtes dépendant de l'heure courante (overdue) ne sont pas mises en cache
+    entry = None
+    if _query_cache is not None and q.overdue is None:
+        entry = _query_cache.entry("query", {**_query_key(q), "with_total": with_total})
+    if entry is not None:
+        cached = _query_cache.get(entry)
+        items = _tasks_by_ids(cached.get("ids")) if isinstance(cached, dict) else None
+        if items is not None:
+            return (items, cached["pagination"]) if return_pagination else items
+    items, pagination = _query_page(q, with_total)
+    if entry is not None:
+        _query_cache.put(entry, {"ids": [t.get("id") for t in items], "pagination": pagination})
+    return (items, pagination) if return_pagination else items
+
+def _tasks_by_ids(ids):
+    """
+    Tâches vivantes d'ids donnés, dans cet ordre (entrée du cache de requêtes, US042), ou None si l'une
+    d'elles n'existe plus. Sans index à jour, un seul passage sur task_list évite de les reconstruire.
+    """
+    if not isinstance(ids, list):
+        return None
+    if _indexes_version == task_list.version:
+        found = _index.by_id
+    else:
+        wanted = set(ids)
+        found = {t.get("id"): t for t in _live_tasks() if t.get("id") in wanted}
+    tasks = [found.get(tid) for tid in ids]
+    return None if any(task is None for task in tasks) else tasks
+
+def explain_query(query: TaskQuery) -> Dict:
+    """Décrit le plan choisi pour la requête sans l'exécuter."""
+    q = _validate_query(query)
+    _ensure_indexes()
+    plan = _plan_query(q)
+    return {
+        "access": plan["access"],
+        "index": plan["index"],
+        "estimated_rows": plan["estimated_rows"],
+        "total_rows": len(_index.rows),
+        "alternatives": plan["alternatives"],
+        "filters": [name for name, _ in _predicates(q)],
+        "sort": f"{q.sort_by} {q.order}" if q.sort_by else "list order",
+        "page": None if q.page_size is None else {"page": q.page, "page_size": q.page_size},
+    }
+
 # US001/US002/US003/US016 - Listing et pagination des tâches
 # avec filtres par statut, mot-clé, priorité et tri
 # US002 pagination, US003 recherche par mot-clé, US016 priorité
@@ -101,58 +1480,22 @@ def get_tasks(
     :param status: Statut à filtrer ('TODO', 'ONGOING', 'DONE')
     :param priority: Priorité à filtrer ('LOW', 'NORMAL', 'HIGH', 'CRITICAL')
     """
-    if page_size <= 0:
-        raise ValueError("Invalid page size")
-
-    tasks = list(task_list)
-
-    # Filtrage par statut
-    if status is not None:
-        allowed_status = {"TODO", "ONGOING", "DONE"}
-        if status not in allowed_status:
-            raise ValueError("Invalid filter status")
-        tasks = [t for t in tasks if t.get("status") == status]
-
-    # Filtrage par priorité
-    if priority is not None:
-        allowed_prio = {"LOW", "NORMAL", "HIGH", "CRITICAL"}
-        prio = priority.upper()
-        if prio not in allowed_prio:
-            raise ValueError("Invalid priority. Allowed values: LOW, NORMAL, HIGH, CRITICAL")
-        tasks = [t for t in tasks if t.get("priority", "NORMAL") == prio]
-
-    # Recherche par mot-clé
-    if keyword is not None and keyword != "":
-        kw = keyword.lower()
-        tasks = [
-            t for t in tasks
-            if kw in t.get("title", "").lower() or kw in t.get("description", "").lower()
-        ]
-
-    # Tri (accepte 'priority' en plus des autres)
-    tasks = sort_tasks(tasks, sort_by=sort_by, order=order)
-
-    # Pagination
-    total_items = len(tasks)
-    total_pages = (total_items + page_size - 1) // page_size if total_items else 0
-    start = (page - 1) * page_size
-    end = start + page_size
-    paged_tasks = tasks[start:end]
-
-    if return_pagination:
-        pagination = {
-            "current_page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "total_items": total_items
-        }
-        return paged_tasks, pagination
-    else:
-        return paged_tasks
+    query = TaskQuery(
+        status=status,
+        priority=priority,
+        keyword=keyword,
+        sort_by=sort_by,
+        order=order,
+        page=page,
+        page_size=page_size,
+    )
+    return query_tasks(query, return_pagination=return_pagination)
 
 # US014/US016/US017 - Création de tâche avec titre, description, échéance, priorité et tags initiaux
 
-def create_task(title: str, description: str = "", due_date: str = None, priority: str = "NORMAL") -> Dict:
+def create_task(title: str, description: str = "", due_date: str = None, priority: str = "NORMAL",
+                warn_duplicates: bool = False) -> Dict:
+    """warn_duplicates=True : DuplicateTaskWarning si des tâches proches existent déjà (US050)."""
     title_stripped = title.strip()
     if not title_stripped:
         raise ValueError("Title is required")
@@ -171,8 +1514,15 @@ def create_task(title: str, description: str = "", due_date: str = None, priorit
         except Exception:
             raise ValueError("Invalid date format")
         due_date = due_dt.isoformat(timespec='seconds')
-    new_id = max((task["id"] for task in task_list), default=0) + 1
-    new_task = {
+    if warn_duplicates:
+        similar = find_similar(f"{title_stripped}\n{description}", threshold=DUPLICATE_THRESHOLD)
+        if similar:
+            warnings.warn(DuplicateTaskWarning(
+                f"Similar tasks already exist: {', '.join(str(t.get('id')) for t in similar)}", similar), stacklevel=2)
+    _ensure_indexes()
+    # Les ids des tâches archivées (US049) restent réservés : une nouvelle tâche ne les masque jamais
+    new_id = max(_index.max_id(), _archive.max_id if _archive is not None else 0) + 1
+    new_task = _Task({
         "id": new_id,
         "title": title_stripped,
         "description": description,
@@ -180,8 +1530,9 @@ def create_task(title: str, description: str = "", due_date: str = None, priorit
         "created_at": datetime.now().isoformat(timespec="seconds"),
         "due_date": due_date,
         "priority": prio
-    }
+    })
     task_list.append(new_task)
+    _on_insert(new_task)
     return new_task
 
 # US005 - Récupération d'une tâche par ID
@@ -191,9 +1542,11 @@ def get_task(task_id: Union[int, str]) -> Dict:
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
 
-    for task in task_list:
-        if task.get("id") == tid:
-            return task
+    task = _find_task(tid)
+    if task is None and _archive is not None:
+        task = _archive.get(tid)  # US049 : copie lue dans l'archive, sans réintégration
+    if task is not None:
+        return task
 
     raise ValueError("Task not found")
 
@@ -203,20 +1556,23 @@ def update_task(task_id, title=None, description=None):
         tid = int(task_id)
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
-    for task in task_list:
-        if task.get("id") == tid:
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        if title is not None:
+            title_stripped = title.strip()
+            if not title_stripped:
+                raise ValueError("Title is required")
+            if len(title_stripped) > 100:
+                raise ValueError("Title cannot exceed 100 characters")
+        if description is not None:
+            if len(description) > 500:
+                raise ValueError("Description cannot exceed 500 characters")
+        with _updating(task):
             if title is not None:
-                title_stripped = title.strip()
-                if not title_stripped:
-                    raise ValueError("Title is required")
-                if len(title_stripped) > 100:
-                    raise ValueError("Title cannot exceed 100 characters")
                 task["title"] = title_stripped
             if description is not None:
-                if len(description) > 500:
-                    raise ValueError("Description cannot exceed 500 characters")
                 task["description"] = description
-            return task
+        return task
     raise ValueError("Task not found")
 
 # US007 - Changement de statut
@@ -228,10 +1584,16 @@ def change_task_status(task_id, status):
         tid = int(task_id)
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
-    for task in task_list:
-        if task.get("id") == tid:
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        with _updating(task):
+            # US049 : date de fin, point de départ du délai avant archivage
+            if status == "DONE" and task.get("status") != "DONE":
+                task["completed_at"] = datetime.now().isoformat(timespec="seconds")
+            elif status != "DONE":
+                task.pop("completed_at", None)
             task["status"] = status
-            return task
+        return task
     raise ValueError("Task not found")
 
 # US008 - Suppression de tâche
@@ -240,18 +1602,25 @@ def delete_task(task_id):
         tid = int(task_id)
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
-    for i, task in enumerate(task_list):
-        if task.get("id") == tid:
-            del task_list[i]
-            return
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        _tombstone(task)
+        _maybe_compact()
+        return
     raise ValueError("Task not found")
 
 # US009 - Recherche de tâches (keyword)
-def search_tasks(keyword, page=1, page_size=10, sort_by="created_at", order="desc"):
+def search_tasks(keyword, page=1, page_size=10, sort_by="created_at", order="desc", ranked=False):
     """
     Recherche les tâches par mot-clé dans le titre ou la description.
     Utilise get_tasks pour centraliser la logique.
+    Avec ranked=True, les résultats sont classés par pertinence (voir search_ranked) et sort_by/order sont ignorés.
     """
+    if ranked:
+        if page_size <= 0:
+            raise ValueError("Invalid page size")
+        start = (page - 1) * page_size
+        return search_ranked(keyword, limit=start + page_size)[start:]
     return get_tasks(
         page=page,
         page_size=page_size,
@@ -287,36 +1656,138 @@ def assign_task(task_id: Union[int, str], user_id: Union[int, str, None]):
         except (TypeError, ValueError):
             raise ValueError("Invalid user ID format")
 
-        user_found = any(u.get("id") == uid for u in _load_users())
+        user_found = uid in _user_directory().by_id
         if not user_found:
             raise ValueError("User not found")
     else:
         uid = None  # désassignation
 
-    for task in task_list:
-        if task.get("id") == tid:
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        with _updating(task):
             task["assignee_id"] = uid
-            return task
+        return task
 
     raise ValueError("Task not found")
 
 USERS_FILE = "users.json"
 
-def _load_users():
-    if os.path.exists(USERS_FILE):
+# US026 – Persistance atomique et écritures regroupées (group-commit) des utilisateurs
+# Fenêtre de regroupement en secondes : 0 => chaque sauvegarde est écrite immédiatement,
+# sinon les sauvegardes successives sont fusionnées en une seule écriture à la fin de la fenêtre.
+USERS_COMMIT_WINDOW = 0.0
+
+_users_lock = threading.RLock()
+_pending_users = None
+_users_timer = None
+_users_generation = 0  # incrémenté à chaque sauvegarde faite par ce processus
+_users_deferred = False  # US043 : sauvegardes gardées en mémoire jusqu'au prochain flush_users()
+
+def _atomic_write_json(path, data, pretty=None):
+    """
+    Écrit data dans path via un fichier temporaire, fsync puis rename (jamais de fichier tronqué).
+    JSON compact, sauf pretty=True (par défaut : JSON_PRETTY).
+    """
+    payload = json_dumps(data, pretty=JSON_PRETTY if pretty is None else pretty)
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
         try:
-            with open(USERS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError):
+            os.unlink(tmp_path)
+        except OSError:
             pass
+        raise
+    # fsync du répertoire pour rendre le rename durable
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+def _load_users():
+    with _users_lock:
+        if _pending_users is not None:
+            # Lecture de ses propres écritures tant qu'elles ne sont pas sur disque
+            return list(_pending_users)
+    if os.path.exists(USERS_FILE):
+        with profiler.stage("load_users"):
+            try:
+                with open(USERS_FILE, 'rb') as f:
+                    return json_loads(f.read())
+            except (ValueError, IOError):
+                pass
     return []
 
 def _save_users(users):
+    global _pending_users, _users_timer, _users_generation
+    with _users_lock:
+        _users_generation += 1
+        _pending_users = list(users)
+        if _users_deferred:
+            return
+        if USERS_COMMIT_WINDOW <= 0:
+            flush_users()
+        elif _users_timer is None:
+            _start_users_timer()
+
+def _start_users_timer():
+    global _users_timer
+    _users_timer = threading.Timer(USERS_COMMIT_WINDOW, _flush_users_later)
+    _users_timer.daemon = True
+    _users_timer.start()
+
+def _flush_users_later():
+    """Écriture différée (thread du minuteur) : en cas d'échec, nouvelle tentative après une fenêtre."""
     try:
-        with open(USERS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(users, f, ensure_ascii=False, indent=2)
+        flush_users()
     except IOError:
-        pass
+        with _users_lock:
+            if _pending_users is not None and _users_timer is None:
+                _start_users_timer()
+
+def flush_users():
+    """
+    Écrit sur disque les utilisateurs en attente (no-op si rien n'est en attente).
+    Si l'écriture échoue, ils restent en attente (réessayés au prochain flush) et l'erreur est propagée.
+    """
+    global _pending_users, _users_timer
+    with _users_lock:
+        if _users_timer is not None:
+            _users_timer.cancel()
+            _users_timer = None
+        if _pending_users is None:
+            return
+        _atomic_write_json(USERS_FILE, _pending_users)
+        _pending_users = None
+
+atexit.register(flush_users)
+
+# US043 – Écritures différées pour les traitements par lots
+@contextmanager
+def deferred_user_writes():
+    """
+    Dans ce bloc, les sauvegardes d'utilisateurs restent en mémoire (lues par _load_users) et ne sont
+    écrites que par un appel explicite à flush_users() ou en sortie de bloc.
+    """
+    global _users_deferred
+    with _users_lock:
+        previous, _users_deferred = _users_deferred, True
+    try:
+        yield
+    finally:
+        with _users_lock:
+            _users_deferred = previous
+        if not previous:
+            flush_users()
 
 # US010 - Création d'un nouvel utilisateur
 def create_user(name: str, email: str) -> dict:
@@ -331,12 +1802,11 @@ def create_user(name: str, email: str) -> dict:
     if not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
         raise ValueError("Invalid email format")
     
-    users = _load_users()
-    for user in users:
-        if user["email"].lower() == email:
-            raise ValueError("Email already in use")
+    directory = _user_directory()
+    if email in directory.by_email:
+        raise ValueError("Email already in use")
 
-    new_id = max([u["id"] for u in users], default=0) + 1
+    new_id = directory.max_id + 1
     from datetime import datetime
     user = {
         "id": new_id,
@@ -344,28 +1814,42 @@ def create_user(name: str, email: str) -> dict:
         "email": email,
         "created_at": datetime.now().isoformat(timespec="seconds")
     }
-    users.append(user)
-    _save_users(users)
+    _save_users(directory.records + [user])
+    directory.add(user)
+    directory.signature = _users_signature()
     return user
 
-# US011 - Lister les utilisateurs
-def get_users(page=1, page_size=20, return_pagination=False):
+# US011/US035 - Lister les utilisateurs (index trié par nom, pagination par curseur)
+def get_users(page=1, page_size=20, return_pagination=False, name_prefix=None, after_id=None):
     """
     Retourne la liste paginée et triée (par nom) des utilisateurs.
+    - name_prefix : ne garder que les noms commençant par ce préfixe (insensible à la casse)
+    - after_id : pagination par curseur, la page commence après cet utilisateur (page est alors ignoré)
+    La pagination contient aussi next_cursor : id à passer en after_id pour la page suivante (None à la fin).
     """
-    users = _load_users()
-    users = sorted(users, key=lambda u: u["name"].lower())
-    total_items = len(users)
+    if page_size <= 0:
+        raise ValueError("Invalid page size")
+    directory = _user_directory()
+    keys = directory.keys
+    lo, hi = directory.prefix_range(name_prefix)
+    if after_id is not None:
+        cursor = directory.by_id.get(after_id)
+        if cursor is None:
+            raise ValueError("User not found")
+        start = max(lo, bisect.bisect_right(keys, _UserDirectory.key(cursor), lo, hi))
+    else:
+        start = lo + (page - 1) * page_size
+    end = min(start + page_size, hi)
+    paged_users = [directory.by_id[uid] for _, uid in keys[start:end]] if start < hi else []
+    total_items = hi - lo
     total_pages = (total_items + page_size - 1) // page_size if total_items else 0
-    start = (page - 1) * page_size
-    end = start + page_size
-    paged_users = users[start:end]
     if return_pagination:
         pagination = {
             "current_page": page,
             "page_size": page_size,
             "total_pages": total_pages,
-            "total_items": total_items
+            "total_items": total_items,
+            "next_cursor": paged_users[-1]["id"] if paged_users and end < hi else None
         }
         return paged_users, pagination
     else:
@@ -393,53 +1877,21 @@ def get_tasks_by_user(
             uid = int(user_id)
         except (TypeError, ValueError):
             raise ValueError("Invalid user ID format")
-        users = _load_users()
-        if not any(u.get("id") == uid for u in users):
+        if uid not in _user_directory().by_id:
             raise ValueError("User not found")
     else:
         uid = None
 
-    # Filtrage par assigné
-    def assigned_filter(t):
-        if uid is None:
-            return t.get("assignee_id") is None
-        else:
-            return t.get("assignee_id") == uid
-
-    tasks = [t for t in task_list if assigned_filter(t)]
-
-    # Appliquer autres filtres (statut, mot-clé)
-    if status is not None:
-        allowed_status = {"TODO", "ONGOING", "DONE"}
-        if status not in allowed_status:
-            raise ValueError("Invalid filter status")
-        tasks = [t for t in tasks if t["status"] == status]
-
-    if keyword is not None and keyword != "":
-        kw = keyword.lower()
-        tasks = [
-            t for t in tasks
-            if kw in t.get("title", "").lower() or kw in t.get("description", "").lower()
-        ]
-
-    # Tri et pagination
-    tasks = sort_tasks(tasks, sort_by=sort_by, order=order)
-    total_items = len(tasks)
-    total_pages = (total_items + page_size - 1) // page_size if total_items else 0
-    start = (page - 1) * page_size
-    end = start + page_size
-    paged_tasks = tasks[start:end]
-
-    if return_pagination:
-        pagination = {
-            "current_page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "total_items": total_items
-        }
-        return paged_tasks, pagination
-    else:
-        return paged_tasks
+    query = TaskQuery(
+        assignee_id=uid,
+        status=status,
+        keyword=keyword,
+        sort_by=sort_by,
+        order=order,
+        page=page,
+        page_size=page_size,
+    )
+    return query_tasks(query, return_pagination=return_pagination)
 
 # US014 – Définition (ou suppression) de la date d’échéance
 def set_due_date(task_id, due_date):
@@ -447,20 +1899,22 @@ def set_due_date(task_id, due_date):
         tid = int(task_id)
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
-    for task in task_list:
-        if task.get("id") == tid:
-            if due_date is None:
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        if due_date is None:
+            with _updating(task):
                 task["due_date"] = None
-                return task
-            try:
-                from datetime import datetime
-                due_dt = datetime.fromisoformat(due_date)
-            except Exception:
-                raise ValueError("Invalid date format")
-            task["due_date"] = due_dt.isoformat(timespec='seconds')
-            if due_dt < datetime.now():
-                print("Warning: Due date is in the past")
             return task
+        try:
+            from datetime import datetime
+            due_dt = datetime.fromisoformat(due_date)
+        except Exception:
+            raise ValueError("Invalid date format")
+        with _updating(task):
+            task["due_date"] = due_dt.isoformat(timespec='seconds')
+        if due_dt < datetime.now():
+            print("Warning: Due date is in the past")
+        return task
     raise ValueError("Task not found")
 
 # US016 – Définition/maj de la priorité
@@ -473,10 +1927,11 @@ def set_task_priority(task_id, priority):
         tid = int(task_id)
     except (TypeError, ValueError):
         raise ValueError("Invalid ID format")
-    for task in task_list:
-        if task.get("id") == tid:
+    task = _find_task(tid, rehydrate=True)
+    if task is not None:
+        with _updating(task):
             task["priority"] = prio
-            return task
+        return task
     raise ValueError("Task not found")
 
 # US015 – Vérifier si une tâche est en retard
@@ -514,19 +1969,20 @@ def get_overdue_tasks():
     """
     Renvoie la liste des tâches en retard selon is_overdue().
     """
-    return [t for t in task_list if is_overdue(t)]
+    return query_tasks(TaskQuery(overdue=True, sort_by=None, page_size=None))
 
 # US017 – Ajout d’un tag à une tâche
 def add_tag(task_id, tag):
     tag = tag.strip()
     if not tag or len(tag) > 20:
         raise ValueError("Invalid tag validation")
-    for task in task_list:
-        if task.get("id") == int(task_id):
-            tags = set(task.get("tags", []))
-            tags.add(tag)
+    task = _find_task(int(task_id), rehydrate=True)
+    if task is not None:
+        tags = set(task.get("tags", []))
+        tags.add(tag)
+        with _updating(task):
             task["tags"] = list(tags)
-            return task
+        return task
     raise ValueError("Task not found")
 
 # US017 – Ajout de plusieurs tags
@@ -537,27 +1993,2294 @@ def add_tags(task_id, tags_list):
 
 # US017 – Suppression d’un tag
 def remove_tag(task_id, tag):
-    for task in task_list:
-        if task.get("id") == int(task_id):
-            tags = set(task.get("tags", []))
-            tags.discard(tag)
+    task = _find_task(int(task_id), rehydrate=True)
+    if task is not None:
+        tags = set(task.get("tags", []))
+        tags.discard(tag)
+        with _updating(task):
             task["tags"] = list(tags)
-            return task
+        return task
     raise ValueError("Task not found")
 
 # US017 – Recherche de tâches par un tag
 def get_tasks_by_tag(tag):
-    return [t for t in task_list if tag in t.get("tags", [])]
+    return query_tasks(TaskQuery(tags=[tag], sort_by=None, page_size=None))
 
 # US017 – Recherche de tâches par plusieurs tags
 def get_tasks_by_tags(tags):
-    tags_set = set(tags)
-    return [t for t in task_list if tags_set.intersection(set(t.get("tags", [])))]
+    return query_tasks(TaskQuery(tags=list(tags), sort_by=None, page_size=None))
 
 # US017 – Récupération de tous les tags avec leur fréquence
 def get_all_tags():
-    tags = {}
-    for t in task_list:
-        for tag in t.get("tags", []):
-            tags[tag] = tags.get(tag, 0) + 1
-    return tags
+    entry = _query_cache.entry("tags", None) if _query_cache is not None else None
+    if entry is not None:
+        cached = _query_cache.get(entry)
+        if cached is not None:
+            return cached
+    # Fréquences tenues à jour par les statistiques incrémentales (US029)
+    _ensure_indexes()
+    freq = dict(_stats.by_tag)
+    if entry is not None:
+        _query_cache.put(entry, freq)
+    return freq
+
+# US029 – Statistiques agrégées maintenues incrémentalement
+def _due_day(task):
+    """Date d'échéance (ISO 'YYYY-MM-DD') d'une tâche ouverte, ou None (même règles que is_overdue)."""
+    due_str = task.get("due_date")
+    if not due_str or task.get("status") not in ("TODO", "ONGOING"):
+        return None
+    try:
+        if "T" in due_str:
+            return datetime.fromisoformat(due_str).date().isoformat()
+        return datetime.strptime(due_str, "%Y-%m-%d").date().isoformat()
+    except Exception:
+        return None
+
+
+class _TaskStats:
+    """
+    Compteurs par statut, priorité, assigné, tag et couple (assigné, statut).
+    Les échéances des tâches ouvertes sont gardées triées : le nombre de tâches en retard
+    est obtenu par une recherche dichotomique sur la date du jour.
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.total = 0
+        self.by_status = {}
+        self.by_priority = {}
+        self.by_assignee = {}
+        self.by_tag = {}
+        self.by_assignee_status = {}
+        self.due_days = []
+        for task in tasks:
+            self._apply(task, 1)
+        self.due_days.sort()
+
+    @staticmethod
+    def _bump(counter, key, delta):
+        value = counter.get(key, 0) + delta
+        if value:
+            counter[key] = value
+        else:
+            counter.pop(key, None)
+
+    def _apply(self, task, delta, keep_sorted=False, removed_days=None):
+        self.total += delta
+        self._bump(self.by_status, task.get("status"), delta)
+        self._bump(self.by_priority, task.get("priority", "NORMAL"), delta)
+        assignee = task.get("assignee_id")
+        self._bump(self.by_assignee, assignee, delta)
+        self._bump(self.by_assignee_status, (assignee, task.get("status")), delta)
+        for tag in task.get("tags", []):
+            self._bump(self.by_tag, tag, delta)
+        day = _due_day(task)
+        if day is not None:
+            if delta > 0:
+                if keep_sorted:
+                    bisect.insort(self.due_days, day)
+                else:
+                    self.due_days.append(day)
+            elif removed_days is not None:
+                removed_days[day] += 1
+            else:
+                i = bisect.bisect_left(self.due_days, day)
+                if i < len(self.due_days) and self.due_days[i] == day:
+                    del self.due_days[i]
+
+    def insert(self, task):
+        self._apply(task, 1, keep_sorted=True)
+
+    def remove(self, task):
+        self._apply(task, -1)
+
+    def remove_many(self, tasks):
+        """Suppressions en masse : les échéances retirées sont filtrées en un seul parcours."""
+        removed_days = Counter()
+        for task in tasks:
+            self._apply(task, -1, removed_days=removed_days)
+        if removed_days:
+            kept = []
+            for day in self.due_days:
+                if removed_days[day]:
+                    removed_days[day] -= 1
+                else:
+                    kept.append(day)
+            self.due_days = kept
+
+    def update(self, task, before):
+        self._apply(before, -1)
+        self._apply(task, 1, keep_sorted=True)
+
+    def overdue(self, today=None):
+        today = (today or datetime.now().date()).isoformat()
+        return bisect.bisect_left(self.due_days, today)
+
+
+_stats = _TaskStats()
+_register_index(_stats)
+
+def get_task_stats(by_user=False):
+    """
+    Retourne les compteurs agrégés des tâches sans parcourir task_list :
+    total, par statut, par priorité, par assigné (None = non assignée), par tag et nombre en retard.
+    Avec by_user=True, ajoute le tableau croisé {assignee_id: {statut: nombre}}.
+    """
+    _ensure_indexes()
+    stats = {
+        "total": _stats.total,
+        "by_status": dict(_stats.by_status),
+        "by_priority": dict(_stats.by_priority),
+        "by_assignee": dict(_stats.by_assignee),
+        "by_tag": dict(_stats.by_tag),
+        "overdue": _stats.overdue(),
+    }
+    if by_user:
+        cross = {}
+        for (assignee, status), count in _stats.by_assignee_status.items():
+            cross.setdefault(assignee, {})[status] = count
+        stats["by_user"] = cross
+    return stats
+
+# US031 – Recherche classée (BM25) tolérante aux fautes de frappe
+TITLE_WEIGHT = 3.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+_TOKEN_RE = re.compile(r"\w+")
+
+def _tokenize(text):
+    """Découpe en termes minuscules sans accents ('Réunion' -> 'reunion')."""
+    if not text:
+        return []
+    folded = text.lower()
+    if not folded.isascii():
+        folded = unicodedata.normalize("NFKD", folded)
+        folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(folded)
+
+def _trigrams(term):
+    padded = f"$${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _max_typos(term):
+    return 0 if len(term) <= 3 else (1 if len(term) <= 7 else 2)
+
+def _edit_distance(a, b, limit):
+    """
+    Distance d'édition entre a et b (insertion, suppression, substitution, inversion de deux
+    lettres voisines), ou limit + 1 dès qu'elle dépasse limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class _TextIndex:
+    """
+    Index inversé terme -> {id(tâche): (tf titre, tf description)} avec les longueurs de documents
+    pour BM25, et index de trigrammes du vocabulaire pour retrouver les termes proches d'une faute.
+    term_bounds : par terme, [tf pondéré maximal, longueur minimale] de ses documents, d'où un majorant
+    de sa contribution BM25 (croissante en tf, décroissante en longueur) ; ces bornes ne sont pas
+    resserrées après une suppression, elles restent donc valables.
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.postings = {}
+        self.term_bounds = {}
+        self.docs = {}        # id(tâche) -> (tâche, longueur pondérée, termes titre, termes description)
+        self.total_length = 0.0
+        self.vocab_trigrams = {}
+        for task in tasks:
+            self.insert(task)
+
+    def _add_term(self, term):
+        for gram in _trigrams(term):
+            self.vocab_trigrams.setdefault(gram, set()).add(term)
+
+    def _drop_term(self, term):
+        for gram in _trigrams(term):
+            terms = self.vocab_trigrams.get(gram)
+            if terms is not None:
+                terms.discard(term)
+                if not terms:
+                    del self.vocab_trigrams[gram]
+
+    def insert(self, task):
+        title_terms = Counter(_tokenize(task.get("title", "")))
+        desc_terms = Counter(_tokenize(task.get("description", "")))
+        length = TITLE_WEIGHT * sum(title_terms.values()) + sum(desc_terms.values())
+        oid = id(task)
+        self.docs[oid] = (task, length, title_terms, desc_terms)
+        self.total_length += length
+        for term in title_terms.keys() | desc_terms.keys():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                self.term_bounds[term] = [0.0, length]
+                self._add_term(term)
+            tfs = posting[oid] = (title_terms.get(term, 0), desc_terms.get(term, 0))
+            bounds = self.term_bounds[term]
+            bounds[0] = max(bounds[0], TITLE_WEIGHT * tfs[0] + tfs[1])
+            bounds[1] = min(bounds[1], length)
+
+    def remove(self, task):
+        oid = id(task)
+        doc = self.docs.pop(oid, None)
+        if doc is None:
+            return
+        _, length, title_terms, desc_terms = doc
+        self.total_length -= length
+        for term in title_terms.keys() | desc_terms.keys():
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(oid, None)
+                if not posting:
+                    del self.postings[term]
+                    del self.term_bounds[term]
+                    self._drop_term(term)
+
+    def update(self, task, before):
+        if id(task) not in self.docs:
+            return
+        # Description lue dans le dictionnaire : une description déportée sur disque n'est pas relue (US039)
+        if task.get("title") != before.get("title") or dict.get(task, "description") != before.get("description"):
+            self.remove(task)
+            self.insert(task)
+
+    def containing(self, fragment):
+        """Termes du vocabulaire qui contiennent fragment (ses trigrammes internes filtrent les candidats)."""
+        grams = sorted((self.vocab_trigrams.get(fragment[i:i + 3], ()) for i in range(len(fragment) - 2)), key=len)
+        terms = grams[0] if grams else self.postings
+        return [term for term in terms if fragment in term]
+
+    def keyword_docs(self, kw):
+        """
+        id des tâches dont le titre ou la description peut contenir la sous-chaîne kw : chacun de ses
+        termes est contenu dans un de leurs termes. Sur-ensemble à confirmer sur le texte ; None si kw
+        n'a aucun terme (ex. ponctuation seule).
+        """
+        docs = None
+        for fragment in sorted(set(_tokenize(kw)), key=len, reverse=True):
+            found = set()
+            for term in self.containing(fragment):
+                found.update(self.postings[term])
+            docs = found if docs is None else docs & found
+            if not docs:
+                break
+        return docs
+
+    def expand(self, term, fuzzy=True):
+        """Termes du vocabulaire à considérer pour term : [(terme, distance)]."""
+        if term in self.postings or not fuzzy:
+            return [(term, 0)] if term in self.postings else []
+        limit = _max_typos(term)
+        if limit == 0:
+            return []
+        grams = _trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            for candidate in self.vocab_trigrams.get(gram, ()):
+                shared[candidate] += 1
+        # Chaque faute (inversion comprise) détruit au plus 4 trigrammes : filtre avant le calcul de distance
+        min_shared = max(1, len(grams) - 4 * limit)
+        matches = []
+        for candidate, count in shared.items():
+            if count >= min_shared:
+                distance = _edit_distance(term, candidate, limit)
+                if distance <= limit:
+                    matches.append((candidate, distance))
+        return matches
+
+    def search(self, text, limit=10, fuzzy=True):
+        """
+        Retourne les `limit` meilleurs (score, tâche), par élagage MaxScore : les listes de termes sont
+        parcourues par majorant décroissant (termes rares d'abord) et le parcours s'arrête dès que la
+        somme des majorants des listes restantes ne peut plus dépasser le k-ième score. Un terme
+        fréquent ("rapport") n'est donc parcouru que si les termes rares n'ont pas rempli le top k.
+        """
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        lists = []
+        for term in set(_tokenize(text)):
+            for candidate, distance in self.expand(term, fuzzy):
+                posting = self.postings[candidate]
+                df = len(posting)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5)) / (1 + distance)
+                max_tf, min_length = self.term_bounds[candidate]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * min_length / avg_length)
+                lists.append((idf * max_tf * (BM25_K1 + 1) / (max_tf + norm), idf, posting))
+        lists.sort(key=lambda item: item[0], reverse=True)
+        bounds = [*itertools.accumulate(bound for bound, _, _ in reversed(lists))][::-1]  # majorant des listes i..fin
+        top = []  # tas min de (score, -rang, id(tâche)) : top[0] est le k-ième score
+        seen = set()
+        for i, (_, _, posting) in enumerate(lists):
+            rest = lists[i:]  # un document vu ici n'apparaît dans aucune liste précédente
+            for oid in posting:
+                if len(top) == limit and bounds[i] <= top[0][0]:
+                    break
+                if oid in seen:
+                    continue
+                seen.add(oid)
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.docs[oid][1] / avg_length)
+                score = 0.0
+                for _, idf, other in rest:
+                    tfs = other.get(oid)
+                    if tfs is not None:
+                        tf = TITLE_WEIGHT * tfs[0] + tfs[1]
+                        score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                entry = (score, -len(seen), oid)
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, entry)
+            else:
+                continue
+            break  # plus aucun document non vu ne peut entrer dans le top k
+        profiler.count("tasks_scanned", len(seen))
+        return [(score, self.docs[oid][0]) for score, _, oid in sorted(top, reverse=True)]
+
+
+_text_index = None
+
+def _get_text_index():
+    """Construit l'index textuel à la première recherche classée, puis le maintient incrémentalement."""
+    global _text_index
+    if _text_index is None:
+        _text_index = _TextIndex()
+        _register_index(_text_index)
+    _ensure_indexes()
+    return _text_index
+
+def search_ranked(text, limit=10, fuzzy=True, with_scores=False):
+    """
+    Recherche classée par pertinence (BM25, titre pondéré TITLE_WEIGHT fois plus que la description).
+    Avec fuzzy=True, un terme absent du vocabulaire est remplacé par les termes proches
+    (1 faute jusqu'à 7 lettres, 2 au-delà), avec un poids réduit.
+    """
+    if limit <= 0:
+        raise ValueError("Invalid limit")
+    with profiler.stage("search"):
+        results = _get_text_index().search(text, limit=limit, fuzzy=fuzzy)
+    if with_scores:
+        return results
+    return [task for _, task in results]
+
+# US032 – Autocomplétion par préfixe (tags, titres, noms d'utilisateurs)
+def _fold(text):
+    """Clé de comparaison : minuscules sans accents."""
+    folded = text.lower()
+    if not folded.isascii():
+        folded = unicodedata.normalize("NFKD", folded)
+        folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return folded
+
+
+class _TopList:
+    """
+    Meilleures valeurs d'un préfixe court, triées par rang (-fréquence, clé, valeur).
+    Invariant : toute valeur de la liste est mieux classée que toute valeur hors liste ;
+    `floor` minore le rang des valeurs hors liste (None si la liste est exhaustive).
+    """
+
+    __slots__ = ("items", "floor", "depth")
+
+    def __init__(self, ranks, depth):
+        best = heapq.nsmallest(depth + 1, ranks)
+        self.items = best[:depth]
+        self.floor = best[depth] if len(best) > depth else None
+        self.depth = depth
+
+    def get(self, limit):
+        if limit <= len(self.items) or self.floor is None:
+            return self.items[:limit]
+        return None
+
+    def update(self, old_rank, new_rank):
+        items = self.items
+        if old_rank is not None:
+            i = bisect.bisect_left(items, old_rank)
+            if i < len(items) and items[i] == old_rank:
+                del items[i]
+        if new_rank is None or (self.floor is not None and new_rank >= self.floor):
+            return  # reste hors liste : `floor` reste un minorant valable
+        bisect.insort(items, new_rank)
+        if len(items) > 2 * self.depth:
+            self.floor = items.pop()
+
+
+class _PrefixIndex:
+    """
+    Valeurs normalisées réparties par leurs SHORT_PREFIX premiers caractères, chaque paquet
+    étant trié : un préfixe long forme une plage contiguë d'un seul paquet, trouvée par bisect,
+    dont le résultat est mis en cache et invalidé à la modification d'une valeur. Les préfixes
+    courts (plages trop larges pour être parcourues) tiennent leur palmarès à jour à chaque
+    modification ; il n'est recalculé que lorsqu'il ne contient plus assez de valeurs.
+    """
+
+    CACHE_SIZE = 4096
+    SHORT_PREFIX = 2
+    TOP_DEPTH = 32
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.buckets = {}  # SHORT_PREFIX premiers caractères -> liste triée de (clé, valeur)
+        self.counts = {}
+        self.folded = {}
+        self.cache = {}
+        self.tops = {}  # préfixe court -> _TopList
+
+    def _changed(self, value, folded, old_count, new_count):
+        old_rank = (-old_count, folded, value) if old_count else None
+        new_rank = (-new_count, folded, value) if new_count else None
+        for i in range(min(len(folded), self.SHORT_PREFIX) + 1):
+            top = self.tops.get(folded[:i])
+            if top is not None:
+                top.update(old_rank, new_rank)
+        for i in range(self.SHORT_PREFIX + 1, len(folded) + 1):
+            self.cache.pop(folded[:i], None)
+
+    def add(self, value, n=1):
+        if not value:
+            return
+        count = self.counts.get(value, 0)
+        if count:
+            folded = self.folded[value]
+        else:
+            folded = self.folded[value] = _fold(value)
+            bucket = self.buckets.setdefault(folded[:self.SHORT_PREFIX], [])
+            bisect.insort(bucket, (folded, value))
+        self.counts[value] = count + n
+        self._changed(value, folded, count, count + n)
+
+    def discard(self, value, n=1):
+        count = self.counts.get(value)
+        if count is None:
+            return
+        folded = self.folded[value]
+        if count > n:
+            self.counts[value] = count - n
+        else:
+            del self.counts[value], self.folded[value]
+            head = folded[:self.SHORT_PREFIX]
+            bucket = self.buckets[head]
+            del bucket[bisect.bisect_left(bucket, (folded, value))]
+            if not bucket:
+                del self.buckets[head]
+        self._changed(value, folded, count, self.counts.get(value, 0))
+
+    def _range(self, folded):
+        if len(folded) >= self.SHORT_PREFIX:
+            bucket = self.buckets.get(folded[:self.SHORT_PREFIX], [])
+            lo = bisect.bisect_left(bucket, (folded,))
+            hi = bisect.bisect_left(bucket, (folded + "\U0010ffff",))
+            return bucket[lo:hi]
+        return [key for head, bucket in self.buckets.items() if head.startswith(folded) for key in bucket]
+
+    def complete(self, prefix, limit=10):
+        folded = _fold(prefix)
+        counts = self.counts
+        if len(folded) <= self.SHORT_PREFIX:
+            top = self.tops.get(folded)
+            best = top.get(limit) if top is not None else None
+            if best is None:
+                ranks = [(-counts[value], key, value) for key, value in self._range(folded)]
+                top = self.tops[folded] = _TopList(ranks, max(self.TOP_DEPTH, limit))
+                best = top.get(limit)
+            else:
+                profiler.count("cache_hits")
+            return [(value, -count) for count, _, value in best]
+        cached = self.cache.get(folded)
+        if cached is not None and cached[0] >= limit:
+            profiler.count("cache_hits")
+            return cached[1][:limit]
+        best = heapq.nsmallest(limit, self._range(folded), key=lambda k: (-counts[k[1]], k[0], k[1]))
+        result = [(value, counts[value]) for _, value in best]
+        if len(self.cache) >= self.CACHE_SIZE:
+            self.cache.clear()
+        self.cache[folded] = (limit, result)
+        return result
+
+
+class _TaskCompletionIndex:
+    """Maintient les index de préfixes des tags et des titres au fil des modifications de tâches."""
+
+    def __init__(self):
+        self.tags = _PrefixIndex()
+        self.titles = _PrefixIndex()
+
+    def rebuild(self, tasks):
+        self.tags.clear()
+        self.titles.clear()
+        for task in tasks:
+            self.insert(task)
+
+    def insert(self, task):
+        self.titles.add(task.get("title", ""))
+        for tag in task.get("tags", []):
+            self.tags.add(tag)
+
+    def remove(self, task):
+        self.titles.discard(task.get("title", ""))
+        for tag in task.get("tags", []):
+            self.tags.discard(tag)
+
+    def update(self, task, before):
+        if task.get("title") != before.get("title"):
+            self.titles.discard(before.get("title", ""))
+            self.titles.add(task.get("title", ""))
+        old_tags, new_tags = before.get("tags", []), task.get("tags", [])
+        if old_tags != new_tags:
+            for tag in old_tags:
+                self.tags.discard(tag)
+            for tag in new_tags:
+                self.tags.add(tag)
+
+
+_completion_index = None
+def _users_signature():
+    """Identifie l'état courant des utilisateurs (écritures de ce processus + fichier sur disque)."""
+    try:
+        st = os.stat(USERS_FILE)
+        file_state = (st.st_mtime_ns, st.st_size, st.st_ino)
+    except OSError:
+        file_state = None
+    return (_users_generation, USERS_FILE, file_state)
+
+def complete(kind, prefix, limit=10, with_counts=False):
+    """
+    Complétions de prefix (insensible à la casse et aux accents) triées par fréquence décroissante.
+    kind : 'tag', 'title' ou 'user'.
+    """
+    global _completion_index
+    if limit <= 0:
+        raise ValueError("Invalid limit")
+    if kind == "user":
+        index = _user_directory().names
+    elif kind in ("tag", "title"):
+        if _completion_index is None:
+            _completion_index = _TaskCompletionIndex()
+            _register_index(_completion_index)
+        _ensure_indexes()
+        index = _completion_index.tags if kind == "tag" else _completion_index.titles
+    else:
+        raise ValueError("Invalid completion kind. Allowed values: tag, title, user")
+    results = index.complete(prefix, limit)
+    if with_counts:
+        return results
+    return [value for value, _ in results]
+
+# US033 – Flux de modifications (change feed) pour les consommateurs incrémentaux
+CHANGE_FEED_SIZE = 10000
+
+
+class ChangeFeedTruncated(ValueError):
+    """La position demandée est sortie du tampon circulaire : une relecture complète est nécessaire."""
+
+
+class _ChangeFeed:
+    """
+    Tampon circulaire borné d'événements {"seq", "op", "task_id", "fields", "ts"} :
+    op vaut 'insert', 'update', 'delete', 'archive' (tâche passée dans l'archive, US049)
+    ou 'reset' (liste modifiée hors du module, tout relire).
+    """
+
+    def __init__(self, size=CHANGE_FEED_SIZE):
+        self.events = deque(maxlen=size)
+        self.seq = 0
+        self.started = False
+        self.condition = threading.Condition()
+
+    def _emit(self, op, task_id=None, fields=None):
+        if _txn is not None:
+            _txn.events.append((op, task_id, fields))  # publié seulement à la validation (US044)
+            return
+        with self.condition:
+            self.seq += 1
+            self.events.append({
+                "seq": self.seq,
+                "op": op,
+                "task_id": task_id,
+                "fields": fields or [],
+                "ts": datetime.now().isoformat(timespec="seconds"),
+            })
+            self.condition.notify_all()
+
+    def rebuild(self, tasks):
+        # La première construction correspond au chargement initial, pas à une modification
+        if self.started:
+            self._emit("reset")
+        self.started = True
+
+    def insert(self, task):
+        self._emit("insert", task.get("id"), sorted(task.keys()))
+
+    def remove(self, task):
+        self._emit("archive" if _archive is not None and _archive.moving else "delete", task.get("id"))
+
+    def update(self, task, before):
+        fields = sorted(k for k in task.keys() | before.keys() if task.get(k) != before.get(k))
+        if fields:
+            self._emit("update", task.get("id"), fields)
+
+    def read(self, since_seq=0, limit=None):
+        with self.condition:
+            oldest = self.events[0]["seq"] if self.events else self.seq + 1
+            if since_seq < oldest - 1:
+                raise ChangeFeedTruncated("Change feed truncated, full resync required")
+            start = len(self.events) - (self.seq - since_seq)
+            events = [*itertools.islice(self.events, max(start, 0), None)]
+        return events[:limit] if limit is not None else events
+
+
+_change_feed = _ChangeFeed()
+_register_index(_change_feed)
+
+def current_sequence():
+    """Numéro de séquence du dernier événement émis (0 si aucun)."""
+    return _change_feed.seq
+
+def get_changes(since_seq=0, limit=None):
+    """
+    Retourne les événements de numéro > since_seq, dans l'ordre.
+    Lève ChangeFeedTruncated si des événements postérieurs à since_seq ont été évincés du tampon.
+    """
+    _ensure_indexes()
+    return _change_feed.read(since_seq, limit)
+
+def wait_for_changes(since_seq, timeout=None):
+    """Bloque jusqu'à ce qu'un événement de numéro > since_seq existe (ou timeout), puis les retourne."""
+    with _change_feed.condition:
+        _change_feed.condition.wait_for(lambda: _change_feed.seq > since_seq, timeout=timeout)
+    return get_changes(since_seq)
+
+# US034 – Rechargement à chaud de tasks.json par différence d'enregistrements
+_record_hashes = None  # id -> empreinte du contenu, référence pour le prochain rechargement
+
+def _record_hash(record):
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+def _read_tasks_file():
+    """Lit DATA_FILE ; None si absent ou illisible (on garde alors l'état en mémoire)."""
+    shards = _shard_paths(DATA_FILE)
+    if shards is not None:
+        parsed = [_parse_shard(path, columnar=False) for path in shards]
+        if not shards or None in parsed:
+            return None
+        return [record for shard in parsed for record in shard]
+    try:
+        with open(DATA_FILE, 'rb') as f:
+            records = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    return records if isinstance(records, list) else None
+
+def _as_record(task):
+    """Copie de la tâche en dict simple, description comprise même si elle est sur disque (US039)."""
+    record = dict(task)
+    if "description" not in record and "description" in task:
+        record["description"] = task["description"]
+    return record
+
+def task_to_dict(task):
+    """Copie de la tâche en dict simple, sérialisable en JSON (description comprise même si elle est sur disque)."""
+    return _as_record(task)
+
+def _snapshot_record_hashes():
+    global _record_hashes
+    _record_hashes = {t.get("id"): _record_hash(_as_record(t)) for t in _live_tasks()}
+
+def reload_tasks():
+    """
+    Recharge DATA_FILE en n'appliquant que la différence avec l'état de référence :
+    les enregistrements dont l'empreinte n'a pas changé ne sont pas touchés, les autres
+    passent par les mêmes notifications que les fonctions de modification (index, flux de modifications).
+    Retourne {"inserted", "updated", "deleted"} ou None si le fichier est illisible.
+    """
+    global _record_hashes
+    records = _read_tasks_file()
+    if records is None:
+        return None
+    if _record_hashes is None:
+        _snapshot_record_hashes()
+    _ensure_indexes()
+    new_hashes = {}
+    summary = {"inserted": 0, "updated": 0, "deleted": 0}
+    with profiler.stage("reload"):
+        for record in records:
+            tid = record.get("id")
+            digest = new_hashes[tid] = _record_hash(record)
+            if _record_hashes.get(tid) == digest:
+                continue
+            task = _find_task(tid)
+            if task is None:
+                new_task = _Task(record)
+                task_list.append(new_task)
+                _on_insert(new_task)
+                summary["inserted"] += 1
+            else:
+                with _updating(task):
+                    dict.clear(task)
+                    dict.update(task, record)
+                summary["updated"] += 1
+        for tid in _record_hashes.keys() - new_hashes.keys():
+            task = _find_task(tid)
+            if task is not None:
+                _tombstone(task)
+                summary["deleted"] += 1
+        _maybe_compact()
+    _record_hashes = new_hashes
+    profiler.count("records_reloaded", summary["inserted"] + summary["updated"] + summary["deleted"])
+    return summary
+
+def _reload_users():
+    """Invalide les caches dérivés de USERS_FILE après une modification externe."""
+    global _users_dir
+    _users_dir = None
+
+
+class FileWatcher:
+    """
+    Surveille des fichiers et appelle callback(path) quand leur (mtime, taille, inode) change.
+    Sous Linux, inotify (via ctypes) réveille le thread dès qu'un événement touche le répertoire ;
+    sinon, ou si inotify est indisponible, les fichiers sont simplement interrogés toutes les `interval` secondes.
+    """
+
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE, IN_DELETE = 0x2, 0x8, 0x80, 0x100, 0x200
+
+    def __init__(self, paths, callback, interval=1.0, use_inotify=True):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.callback = callback
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self._states = {p: self._stat(p) for p in self.paths}
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            return None
+
+    def check(self):
+        """Compare l'état des fichiers au dernier connu ; appelle callback pour chaque fichier modifié."""
+        changed = []
+        for path in self.paths:
+            state = self._stat(path)
+            if state != self._states[path]:
+                self._states[path] = state
+                changed.append(path)
+        for path in changed:
+            self.callback(path)
+        return changed
+
+    def _open_inotify(self):
+        if not self.use_inotify or not sys.platform.startswith("linux"):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE
+            for directory in {os.path.dirname(p) for p in self.paths}:
+                if libc.inotify_add_watch(fd, directory.encode(), mask) < 0:
+                    os.close(fd)
+                    return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                ready, _, _ = select.select([self._inotify], [], [], self.interval)
+                if ready:
+                    try:
+                        os.read(self._inotify, 65536)  # le contenu importe peu : on revérifie par stat
+                    except BlockingIOError:
+                        pass
+            else:
+                self._stop.wait(self.interval)
+            if not self._stop.is_set():
+                self.check()
+
+    @property
+    def mode(self):
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self):
+        if self._thread is None:
+            self._inotify = self._open_inotify()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="task-file-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            os.close(self._inotify)
+            self._inotify = None
+
+
+_hot_reload_watcher = None
+
+def start_hot_reload(interval=1.0, use_inotify=True):
+    """Démarre la surveillance de DATA_FILE et USERS_FILE (rechargement différentiel en arrière-plan)."""
+    global _hot_reload_watcher
+    if _hot_reload_watcher is None:
+        if _record_hashes is None:
+            _snapshot_record_hashes()
+
+        def on_change(path):
+            if path == os.path.abspath(DATA_FILE):
+                reload_tasks()
+            else:
+                _reload_users()
+        _hot_reload_watcher = FileWatcher([DATA_FILE, USERS_FILE], on_change, interval, use_inotify).start()
+    return _hot_reload_watcher
+
+def stop_hot_reload():
+    global _hot_reload_watcher
+    if _hot_reload_watcher is not None:
+        _hot_reload_watcher.stop()
+        _hot_reload_watcher = None
+
+# US035 – Annuaire des utilisateurs : index trié (nom, id), index par email
+class _UserDirectory:
+    """
+    Utilisateurs chargés une fois puis maintenus par create_user :
+    - keys : liste triée de (nom en minuscules, id) -> pages et préfixes par bisect
+    - by_id, by_email : accès direct
+    - names : index de préfixes pour l'autocomplétion (construit à la demande)
+    """
+
+    def __init__(self, users, signature):
+        self.records = [*users]
+        self.by_id = {u["id"]: u for u in self.records}
+        self.by_email = {u["email"].lower(): u for u in self.records}
+        self.keys = sorted(self.key(u) for u in self.records)
+        self.max_id = max(self.by_id, default=0)
+        self.signature = signature
+        self._names = None
+
+    @staticmethod
+    def key(user):
+        return (user["name"].lower(), user["id"])
+
+    def add(self, user):
+        self.records.append(user)
+        self.by_id[user["id"]] = user
+        self.by_email[user["email"].lower()] = user
+        bisect.insort(self.keys, self.key(user))
+        self.max_id = max(self.max_id, user["id"])
+        if self._names is not None:
+            self._names.add(user["name"])
+
+    def prefix_range(self, prefix):
+        if not prefix:
+            return 0, len(self.keys)
+        folded = prefix.lower()
+        lo = bisect.bisect_left(self.keys, (folded,))
+        hi = bisect.bisect_left(self.keys, (folded + "\U0010ffff",))
+        return lo, hi
+
+    @property
+    def names(self):
+        if self._names is None:
+            self._names = _PrefixIndex()
+            for user in self.records:
+                self._names.add(user.get("name", ""))
+        return self._names
+
+
+_users_dir = None
+
+def _user_directory():
+    """Annuaire à jour : reconstruit seulement si USERS_FILE a changé depuis le dernier chargement."""
+    global _users_dir
+    signature = _users_signature()
+    if _users_dir is None or _users_dir.signature != signature:
+        _users_dir = _UserDirectory(_load_users(), signature)
+    else:
+        profiler.count("cache_hits")
+    return _users_dir
+
+def get_user(user_id):
+    """Retourne l'utilisateur d'id user_id."""
+    try:
+        uid = int(user_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid user ID format")
+    user = _user_directory().by_id.get(uid)
+    if user is None:
+        raise ValueError("User not found")
+    return user
+
+def get_user_by_email(email):
+    """Retourne l'utilisateur dont l'email correspond (insensible à la casse)."""
+    user = _user_directory().by_email.get(email.strip().lower())
+    if user is None:
+        raise ValueError("User not found")
+    return user
+
+# US036 – Planificateur d'échéances : tas (échéance, tâche) et rappels
+def _parse_due(task):
+    """Échéance d'une tâche ouverte en datetime naïf, ou None (pas d'échéance, format invalide, tâche close)."""
+    due_str = task.get("due_date")
+    if not due_str or task.get("status") not in ("TODO", "ONGOING"):
+        return None
+    try:
+        due = datetime.fromisoformat(due_str)
+    except (TypeError, ValueError):
+        return None
+    if due.tzinfo is not None:
+        due = due.astimezone().replace(tzinfo=None)
+    return due
+
+
+class _DeadlineScheduler:
+    """
+    Un tas min par seuil de rappel, d'entrées (instant de déclenchement, n°, id(tâche), échéance).
+    Les entrées devenues obsolètes (échéance modifiée, tâche close ou supprimée, ou simplement
+    remplacée par une entrée plus récente) ne sont pas retirées du tas : elles sont ignorées quand
+    elles arrivent au sommet (suppression paresseuse). Seule l'entrée de n° courant est valide.
+    Comme pour la file des prochaines tâches, un tas trop chargé en entrées obsolètes est reconstruit.
+    Le seuil 0 ("maintenant en retard") existe toujours et sert aussi aux requêtes "dû dans X".
+    """
+
+    def __init__(self):
+        self.thresholds = {timedelta(0)}
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.due = {}        # id(tâche) -> (échéance courante, n° de l'entrée valide)
+        self.tasks = {}      # id(tâche) -> tâche
+        self.heaps = {threshold: [] for threshold in self.thresholds}
+        self.fired = set()   # (id(tâche), seuil, échéance) déjà notifiés
+        self.counter = itertools.count()
+        for task in tasks:
+            self.insert(task)
+
+    def _push(self, oid, due, thresholds, n):
+        for threshold in thresholds:
+            heapq.heappush(self.heaps[threshold], (due - threshold, n, oid, due))
+
+    def add_threshold(self, threshold):
+        if threshold not in self.thresholds:
+            self.thresholds.add(threshold)
+            self.heaps[threshold] = []
+            for oid, (due, n) in self.due.items():
+                self._push(oid, due, [threshold], n)
+
+    def drop_threshold(self, threshold):
+        if threshold:
+            self.thresholds.discard(threshold)
+            self.heaps.pop(threshold, None)
+
+    def insert(self, task):
+        due = _parse_due(task)
+        if due is not None:
+            oid = id(task)
+            n = next(self.counter)
+            self.due[oid] = (due, n)
+            self.tasks[oid] = task
+            self._push(oid, due, self.thresholds, n)
+            if len(self.heaps[timedelta(0)]) > 2 * len(self.due) + 64:
+                self._compact()
+
+    def remove(self, task):
+        self.due.pop(id(task), None)
+        self.tasks.pop(id(task), None)
+
+    def _compact(self):
+        """Ne garde que les entrées valides de chaque tas et les rappels encore utiles."""
+        for threshold, heap in self.heaps.items():
+            heap = [entry for entry in heap if self._live(entry)]
+            heapq.heapify(heap)
+            self.heaps[threshold] = heap
+        self.fired = {key for key in self.fired if self.due.get(key[0], (None,))[0] == key[2]}
+
+    def update(self, task, before):
+        if (task.get("due_date"), task.get("status")) != (before.get("due_date"), before.get("status")):
+            if _parse_due(task) == self.due.get(id(task), (None,))[0]:
+                return  # ex. TODO -> ONGOING : même échéance, l'entrée en place reste valide
+            self.remove(task)
+            self.insert(task)
+
+    def _live(self, entry):
+        _, n, oid, due = entry
+        return self.due.get(oid) == (due, n)
+
+    def pop_due(self, now):
+        """Retourne [(seuil, tâche, échéance)] des rappels arrivés à échéance, sans doublon."""
+        fired = []
+        for threshold, heap in self.heaps.items():
+            while heap and (heap[0][0] <= now or not self._live(heap[0])):
+                entry = heapq.heappop(heap)
+                key = (entry[2], threshold, entry[3])
+                if self._live(entry) and key not in self.fired:
+                    self.fired.add(key)
+                    fired.append((threshold, self.tasks[entry[2]], entry[3]))
+        return fired
+
+    def next_fire_time(self):
+        times = []
+        for heap in self.heaps.values():
+            while heap and not self._live(heap[0]):
+                heapq.heappop(heap)
+            if heap:
+                times.append(heap[0][0])
+        return min(times, default=None)
+
+    def due_before(self, limit):
+        """Tâches ouvertes d'échéance <= limit : parcours du tas limité aux sous-arbres concernés."""
+        heap = self.heaps[timedelta(0)]
+        found, stack = [], [0] if heap else []
+        while stack:
+            i = stack.pop()
+            entry = heap[i]
+            if entry[0] > limit:
+                continue  # propriété du tas : tout le sous-arbre est plus tardif
+            if self._live(entry):
+                found.append(entry)
+            stack.extend(j for j in (2 * i + 1, 2 * i + 2) if j < len(heap))
+        found.sort()
+        return [(self.tasks[oid], due) for _, _, oid, due in found]
+
+
+_scheduler = None
+_reminder_callbacks = []
+_reminder_thread = None
+_reminder_stop = threading.Event()
+
+def _get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = _DeadlineScheduler()
+        _register_index(_scheduler)
+    _ensure_indexes()
+    return _scheduler
+
+def register_reminder(callback, before=timedelta(0)):
+    """
+    Enregistre callback(task, due, before) appelé quand une tâche ouverte arrive à `before`
+    de son échéance (timedelta(0) : la tâche devient en retard).
+    """
+    scheduler = _get_scheduler()
+    scheduler.add_threshold(before)
+    _reminder_callbacks.append((before, callback))
+
+def unregister_reminder(callback):
+    """Retire callback ; les seuils qui ne servent plus sont supprimés du planificateur."""
+    _reminder_callbacks[:] = [(b, cb) for b, cb in _reminder_callbacks if cb is not callback]
+    if _scheduler is not None:
+        used = {b for b, _ in _reminder_callbacks}
+        for threshold in [*_scheduler.thresholds]:
+            if threshold not in used:
+                _scheduler.drop_threshold(threshold)
+
+def poll_reminders(now=None):
+    """Déclenche les rappels arrivés à échéance ; coût O(log n) par rappel. Retourne le nombre de rappels."""
+    fired = _get_scheduler().pop_due(now or datetime.now())
+    for threshold, task, due in fired:
+        for before, callback in _reminder_callbacks:
+            if before == threshold:
+                callback(task, due, before)
+    return len(fired)
+
+def get_tasks_due_within(within, now=None, include_overdue=True):
+    """
+    Tâches ouvertes dont l'échéance tombe dans `within` (timedelta) à partir de maintenant,
+    triées par échéance, lues dans le tas sans parcourir task_list. Retourne [(tâche, échéance)].
+    """
+    now = now or datetime.now()
+    items = _get_scheduler().due_before(now + within)
+    if not include_overdue:
+        items = [(task, due) for task, due in items if due >= now]
+    return items
+
+def start_reminders(max_sleep=60.0):
+    """Thread d'arrière-plan qui dort jusqu'au prochain rappel (au plus max_sleep secondes) puis le déclenche."""
+    global _reminder_thread
+    if _reminder_thread is not None:
+        return
+
+    def run():
+        while not _reminder_stop.is_set():
+            poll_reminders()
+            next_time = _get_scheduler().next_fire_time()
+            delay = max_sleep if next_time is None else (next_time - datetime.now()).total_seconds()
+            _reminder_stop.wait(min(max(delay, 0.01), max_sleep))
+
+    _reminder_stop.clear()
+    _reminder_thread = threading.Thread(target=run, name="task-reminders", daemon=True)
+    _reminder_thread.start()
+
+def stop_reminders():
+    global _reminder_thread
+    _reminder_stop.set()
+    if _reminder_thread is not None:
+        _reminder_thread.join()
+        _reminder_thread = None
+
+def parse_duration(text):
+    """Convertit '90s', '30m', '24h', '2d' ou '1w' en timedelta."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", text or "")
+    if not match:
+        raise ValueError("Invalid duration format")
+    value, unit = float(match.group(1)), match.group(2)
+    return timedelta(**{{"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[unit]: value})
+
+# US037 – Suppressions par pierres tombales et compactage
+TOMBSTONE_RATIO = 0.25  # compactage dès que plus d'un quart de task_list est supprimé
+
+def _tombstone(task):
+    """Marque la tâche comme supprimée (O(1) côté liste) et la retire des index."""
+    if _txn is not None:
+        _txn.record_delete(task)
+    _tombstones[id(task)] = task
+    _on_remove(task)
+
+def _tombstone_many(tasks):
+    """Comme _tombstone pour chaque tâche, avec un seul passage par index (suppressions en masse)."""
+    if _txn is not None:
+        for task in tasks:
+            _txn.record_delete(task)
+    for task in tasks:
+        _tombstones[id(task)] = task
+    _on_remove_many(tasks)
+
+def _maybe_compact():
+    # Pendant une transaction, les lignes des tâches supprimées doivent rester réutilisables
+    if _txn is None and _tombstones and len(_tombstones) > TOMBSTONE_RATIO * len(task_list):
+        compact_tasks()
+
+def compact_tasks():
+    """
+    Retire de task_list les tâches supprimées, en un seul parcours.
+    L'ordre relatif des tâches restantes ne change pas : seul l'index primaire est renuméroté.
+    Retourne le nombre de tâches retirées.
+    """
+    global _indexes_version
+    if not _tombstones:
+        return 0
+    in_sync = _indexes_version == task_list.version
+    size = len(task_list)
+    with profiler.stage("compact"):
+        task_list._purge()
+    task_list._touch()
+    if in_sync:
+        _index.rebuild(task_list)  # numéros de ligne de nouveau denses pour les bitmaps
+        _created_index.rebuild(task_list)
+        _indexes_version = task_list.version
+    profiler.count("tasks_compacted", size - len(task_list))
+    return size - len(task_list)
+
+def delete_tasks(task_ids):
+    """
+    Supprime plusieurs tâches par id (ids inconnus ignorés) en temps linéaire :
+    pierres tombales puis au plus un compactage. Retourne le nombre de tâches supprimées.
+    """
+    try:
+        tids = [int(tid) for tid in task_ids]
+    except (TypeError, ValueError):
+        raise ValueError("Invalid ID format")
+    _ensure_indexes()
+    tasks = {}
+    for tid in tids:
+        task = _index.by_id.get(tid)
+        if task is not None:
+            tasks[id(task)] = task
+    _tombstone_many([*tasks.values()])
+    _maybe_compact()
+    return len(tasks)
+
+def delete_tasks_where(query: TaskQuery):
+    """
+    Supprime toutes les tâches correspondant aux critères de la requête (tri et pagination ignorés).
+    Une requête sans critère est refusée. Retourne le nombre de tâches supprimées.
+    """
+    q = _validate_query(replace(query, sort_by=None, page=1, page_size=None))
+    if not _predicates(q):
+        raise ValueError("At least one filter is required")
+    tasks = _run_query(q)
+    _tombstone_many(tasks)
+    _maybe_compact()
+    return len(tasks)
+
+# US038 – Comptage par bitmaps
+_UNINDEXED_CRITERIA = ("keyword", "due_from", "due_to", "created_from", "created_to", "overdue")
+
+def count_tasks(query: Optional[TaskQuery] = None) -> int:
+    """
+    Nombre de tâches correspondant à la requête (tri et pagination ignorés).
+    Si tous les critères sont indexés (statut, statuts exclus, priorité, assigné, tags), le résultat
+    est la cardinalité des bitmaps combinés, sans construire la liste des tâches.
+    """
+    q = _validate_query(replace(query or TaskQuery(), sort_by=None, page=1, page_size=None))
+    _ensure_indexes()
+    count = _count_matches(q, {"source": _combined_bitmap(_index_candidates(q))})
+    if _wants_archive(q):
+        count += sum(1 for _ in _filtered(q, _archive.iter_tasks()))
+    return count
+
+# US039 – Descriptions stockées hors mémoire, chargées à la demande
+DESCRIPTIONS_FILE = "descriptions.blob"
+
+
+class _DescriptionStore:
+    """
+    Fichier de descriptions en ajout seul : `locations` associe à chaque tâche déportée (par id)
+    un entier position << 32 | longueur, relu à la demande ; les lectures récentes restent dans un
+    cache LRU. Une description modifiée est réécrite en fin de fichier (l'ancienne devient inutilisée).
+    Le fichier est créé à part dans le répertoire de `path` : un fichier existant n'est jamais touché.
+    """
+
+    def __init__(self, path, cache_size):
+        directory, name = os.path.split(os.path.abspath(path))
+        fd, self.path = tempfile.mkstemp(prefix=name + ".", dir=directory)
+        self.file = os.fdopen(fd, "w+b")
+        self.lock = threading.Lock()
+        self.size = 0
+        self.locations = {}
+        self.read = functools.lru_cache(maxsize=cache_size)(self._read)
+
+    def _read(self, at):
+        with self.lock:
+            self.file.seek(at >> 32)
+            data = self.file.read(at & 0xFFFFFFFF)
+        profiler.count("descriptions_loaded")
+        return data.decode("utf-8")
+
+    def write(self, text):
+        data = text.encode("utf-8")
+        with self.lock:
+            self.file.seek(self.size)
+            self.file.write(data)
+            self.file.flush()
+            offset = self.size
+            self.size += len(data)
+        return offset << 32 | len(data)
+
+    def peek(self, at):
+        """Relit une description sans passer par le cache : un parcours n'en chasse pas les lectures utiles."""
+        data = os.pread(self.file.fileno(), at & 0xFFFFFFFF, at >> 32)
+        profiler.count("descriptions_scanned")
+        return data.decode("utf-8")
+
+    def spill(self, task):
+        """Déporte la description d'une _Task si elle est (de nouveau) présente en mémoire."""
+        if isinstance(task, _Task) and isinstance(dict.get(task, "description"), str):
+            self.locations[id(task)] = self.write(dict.pop(task, "description"))
+
+    def spill_all(self, tasks):
+        for task in tasks:
+            self.spill(task)
+
+    def restore(self, task):
+        at = self.locations.pop(id(task), None)
+        if at is not None and not dict.__contains__(task, "description"):
+            dict.__setitem__(task, "description", self.read(at))
+
+    def close(self):
+        self.read.cache_clear()
+        self.file.close()
+        os.remove(self.path)
+
+
+def enable_description_store(path=None, cache_size=1024):
+    """
+    Déporte les descriptions dans un fichier créé à côté de `path` (DESCRIPTIONS_FILE par défaut) :
+    elles ne sont relues qu'à l'affichage ou via get_task/task["description"], et les `cache_size`
+    dernières restent en mémoire. Retourne le nombre de descriptions déportées.
+    """
+    global _desc_store
+    if _desc_store is not None:
+        disable_description_store()
+    _get_text_index()  # construit tant que les descriptions sont en mémoire : la recherche par mot-clé s'y appuie
+    _desc_store = _DescriptionStore(path or DESCRIPTIONS_FILE, cache_size)
+    live = _live_tasks()
+    _desc_store.spill_all(live)
+    return len(_desc_store.locations)
+
+def disable_description_store():
+    """Recharge toutes les descriptions en mémoire et supprime le fichier créé par le stockage."""
+    global _desc_store
+    if _desc_store is None:
+        return
+    store, _desc_store = _desc_store, None
+    for task in task_list:
+        store.restore(task)
+    store.close()
+
+def description_store_stats():
+    """Taille du fichier et efficacité du cache LRU, ou None si le stockage sur disque est inactif."""
+    if _desc_store is None:
+        return None
+    info = _desc_store.read.cache_info()
+    return {"path": _desc_store.path, "file_bytes": _desc_store.size, "cache_hits": info.hits,
+            "cache_misses": info.misses, "cache_size": info.currsize, "cache_max": info.maxsize}
+
+
+# US042 – Cache de requêtes sur disque, partagé entre les invocations de la CLI
+# Une entrée est valable pour un fichier de données donné (chemin, inode, taille, mtime), un état
+# des tâches en mémoire (version de task_list, séquence du flux) et une requête normalisée.
+QUERY_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                               "task_manager")
+QUERY_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+_query_cache = None
+_process_token = os.urandom(8).hex()  # état modifié en mémoire : entrées propres à ce processus
+
+
+def _query_key(q):
+    """Requête normalisée, sérialisable de façon stable (l'absence de filtre d'assigné est explicite)."""
+    params = {name: getattr(q, name) for name in TaskQuery.__dataclass_fields__}
+    if params["assignee_id"] is _UNSET:
+        params["assignee_id"] = "*"
+    return params
+
+
+class _QueryCache:
+    """
+    Répertoire de fichiers JSON `<empreinte des données>-<empreinte de la requête>.json`.
+    Les entrées d'une autre version des données sont supprimées à la première écriture ;
+    au-delà de max_bytes, les entrées les moins récemment lues sont évincées.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def data_key():
+        """
+        Empreinte des données : fichier chargé, version de task_list et séquence du flux de modifications.
+        Tant que rien n'a changé depuis le chargement à l'import (état (0, 0)), elle est la même pour
+        tous les processus ; ensuite elle est propre à ce processus. None hors fichier stable ou en transaction.
+        """
+        if _loaded_identity is None or _txn is not None:
+            return None
+        state = (task_list.version, current_sequence())
+        owner = None if state == (0, 0) else _process_token
+        return hashlib.sha256(repr((_loaded_identity, state, owner)).encode("utf-8")).hexdigest()[:16]
+
+    def entry(self, kind, params):
+        data_key = self.data_key()
+        if data_key is None:
+            return None
+        raw = json.dumps([kind, params], sort_keys=True, ensure_ascii=False)
+        return os.path.join(self.path, f"{data_key}-{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def get(self, entry):
+        try:
+            with open(entry, 'rb') as f:
+                value = json_loads(f.read())
+            os.utime(entry)  # la date de modification sert d'ordre LRU pour l'éviction
+        except (OSError, ValueError):
+            self.misses += 1
+            profiler.count("query_cache_misses")
+            return None
+        self.hits += 1
+        profiler.count("query_cache_hits")
+        return value
+
+    def put(self, entry, value):
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=self.path)
+        except OSError:
+            return
+        try:
+            # Pas de fsync : une entrée perdue sera simplement recalculée
+            with os.fdopen(fd, 'wb') as f:
+                f.write(json_dumps(value))
+            os.replace(tmp_path, entry)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict(entry)
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for e in it:
+                    if e.name.endswith(".json") and not e.name.startswith(".tmp-"):
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        entries.append((st.st_mtime_ns, st.st_size, e.path, e.name))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self, kept):
+        """Supprime les entrées périmées puis les plus anciennes au-delà de max_bytes (sauf `kept`)."""
+        prefix = os.path.basename(kept).split("-", 1)[0] + "-"
+        fresh = []
+        for entry in sorted(self._entries()):
+            if entry[3].startswith(prefix):
+                fresh.append(entry)
+            else:
+                self._remove(entry[2])
+        total = sum(size for _, size, _, _ in fresh)
+        for _, size, path, _ in fresh:
+            if total <= self.max_bytes:
+                break
+            if path != kept:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        entries = self._entries()
+        for entry in entries:
+            self._remove(entry[2])
+        self._remove(os.path.join(self.path, SIMILARITY_CACHE_FILE))  # signatures de find_similar (US050)
+        return len(entries)
+
+    def stats(self):
+        entries = self._entries()
+        data_key = self.data_key()
+        current = [e for e in entries if data_key and e[3].startswith(data_key + "-")]
+        return {
+            "path": os.path.abspath(self.path),
+            "entries": len(entries),
+            "current_entries": len(current),
+            "stale_entries": len(entries) - len(current),
+            "bytes": sum(e[1] for e in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def enable_query_cache(path=None, max_bytes=QUERY_CACHE_MAX_BYTES):
+    """Active le cache disque des résultats de query_tasks (et dérivés) et de get_all_tags."""
+    global _query_cache
+    _query_cache = _QueryCache(path or QUERY_CACHE_DIR, max_bytes)
+    return _query_cache
+
+def disable_query_cache():
+    global _query_cache
+    _query_cache = None
+
+def clear_query_cache(path=None):
+    """Vide le répertoire de cache (celui du cache actif par défaut) ; retourne le nombre d'entrées supprimées."""
+    if path is None and _query_cache is not None:
+        return _query_cache.clear()
+    return _QueryCache(path or QUERY_CACHE_DIR, QUERY_CACHE_MAX_BYTES).clear()
+
+def query_cache_stats(path=None):
+    if path is None and _query_cache is not None:
+        return _query_cache.stats()
+    return _QueryCache(path or QUERY_CACHE_DIR, QUERY_CACHE_MAX_BYTES).stats()
+
+
+# US044 – Transactions : journal d'annulation avec copie à la première modification
+class _Transaction:
+    """
+    Les modifications sont appliquées directement (les requêtes faites dans la transaction les voient),
+    mais chaque tâche est copiée superficiellement à sa première modification et les insertions et
+    suppressions sont journalisées : l'annulation ne touche que les tâches concernées.
+    Les événements du flux de modifications sont retenus jusqu'à la validation.
+    """
+
+    def __init__(self):
+        self.journal = []     # ("insert", tâche) | ("update", tâche, avant, description) | ("delete", tâche, ligne)
+                              # | ("rehydrate", tâche, position dans l'archive)
+        self.events = []      # événements du flux en attente de validation
+        self.touched = [set()]  # tâches déjà copiées, par point de sauvegarde
+        self.undoing = False    # les opérations d'annulation ne sont pas journalisées
+
+    def record_insert(self, task):
+        if not self.undoing:
+            self.journal.append(("insert", task))
+
+    def record_update(self, task, before):
+        touched = self.touched[-1]
+        if not self.undoing and id(task) not in touched:
+            touched.add(id(task))
+            at = _desc_store.locations.get(id(task)) if _desc_store is not None else None
+            self.journal.append(("update", task, before, at))
+
+    def record_delete(self, task):
+        if not self.undoing:
+            self.journal.append(("delete", task, _index.rows.get(id(task))))
+
+    def savepoint(self):
+        self.touched.append(set())
+        return len(self.journal), len(self.events)
+
+    def release(self, mark):
+        self.touched.pop()
+
+    def rollback(self, mark=(0, 0)):
+        """Annule, dans l'ordre inverse, tout ce qui a été journalisé depuis `mark`."""
+        journal_mark, events_mark = mark
+        entries = self.journal[journal_mark:]
+        del self.journal[journal_mark:]
+        self.undoing = True
+        try:
+            for entry in reversed(entries):
+                kind, task = entry[0], entry[1]
+                if kind == "insert":
+                    _tombstone(task)
+                elif kind == "rehydrate":
+                    _archive.location[task.get("id")] = entry[2]  # de nouveau lue depuis l'archive
+                elif kind == "update":
+                    with _updating(task):
+                        dict.clear(task)
+                        dict.update(task, entry[2])
+                        if _desc_store is not None:
+                            _desc_store.locations.pop(id(task), None)
+                            if entry[3] is not None:
+                                _desc_store.locations[id(task)] = entry[3]
+                elif _tombstones.pop(id(task), None) is not None:
+                    _index.insert(task, entry[2])  # même ligne : l'ordre de task_list est conservé
+                    for index in _indexes:
+                        if index is not _index:
+                            index.insert(task)
+                else:
+                    # Compactée entre-temps : on la remet en fin de liste, comme une création
+                    task_list.append(task)
+                    _on_insert(task)
+        finally:
+            self.undoing = False
+        del self.events[events_mark:]  # y compris ceux émis par l'annulation elle-même
+        self.touched[-1].clear()
+
+    def commit(self):
+        for op, task_id, fields in self.events:
+            _change_feed._emit(op, task_id, fields)
+        self.events.clear()
+
+
+@contextmanager
+def transaction():
+    """
+    Regroupe plusieurs opérations : si le bloc lève une exception, toutes ses modifications de tâches
+    sont annulées (tâches, index, statistiques) et aucun événement n'est publié, puis l'exception est
+    propagée. Une transaction imbriquée est un point de sauvegarde de la transaction englobante.
+    Les utilisateurs (create_user) et les modifications faites directement sur task_list ne sont pas couverts.
+    """
+    global _txn
+    _ensure_indexes()  # les modifications de _Task ne sont suivies que si les index sont à jour
+    if _txn is not None:
+        tx = _txn
+        mark = tx.savepoint()
+        try:
+            yield tx
+        except BaseException:
+            tx.rollback(mark)
+            raise
+        finally:
+            tx.release(mark)
+        return
+    tx = _txn = _Transaction()
+    try:
+        yield tx
+    except BaseException:
+        tx.rollback()
+        _txn = None
+        raise
+    _txn = None
+    tx.commit()
+    _maybe_compact()
+
+
+# US048 – File de priorité "prochaine tâche" par assigné
+PRIORITY_RANK = {"CRITICAL": 0, "HIGH": 1, "NORMAL": 2, "LOW": 3}
+
+
+class _NextTaskQueue:
+    """
+    Un tas min par assigné (None : non assignées) des tâches TODO, ordonnées par
+    (rang de priorité, échéance la plus proche, sans échéance en dernier, date de création).
+    Comme pour le planificateur d'échéances, les entrées obsolètes restent dans le tas et sont
+    écartées en arrivant au sommet ; un tas trop chargé en entrées obsolètes est reconstruit.
+    Seule l'entrée de n° courant d'une tâche est valide (une tâche sortie puis revenue n'est jamais en double).
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.current = {}    # id(tâche) -> (assigné, clé, n°) de l'entrée valide
+        self.tasks = {}      # id(tâche) -> tâche
+        self.heaps = {}      # assigné -> [(clé, n°, id(tâche))]
+        self.live = Counter()  # assigné -> nombre d'entrées valides
+        self.counter = itertools.count()
+        for task in tasks:
+            self.insert(task)
+
+    @staticmethod
+    def _key(task):
+        due = _parse_due(task)
+        return (PRIORITY_RANK.get(task.get("priority", "NORMAL"), len(PRIORITY_RANK)),
+                due is None, due or datetime.min, task.get("created_at") or "")
+
+    def insert(self, task):
+        if task.get("status") != "TODO":
+            return
+        oid, assignee, key, n = id(task), task.get("assignee_id"), self._key(task), next(self.counter)
+        self.current[oid] = (assignee, key, n)
+        self.tasks[oid] = task
+        self.live[assignee] += 1
+        heap = self.heaps.setdefault(assignee, [])
+        heapq.heappush(heap, (key, n, oid))
+        if len(heap) > 2 * self.live[assignee] + 64:
+            self._compact(assignee)
+
+    def remove(self, task):
+        entry = self.current.pop(id(task), None)
+        if entry is not None:
+            self.tasks.pop(id(task))
+            self.live[entry[0]] -= 1
+
+    def update(self, task, before):
+        fields = ("status", "priority", "due_date", "assignee_id", "created_at")
+        if any(task.get(f) != before.get(f) for f in fields):
+            entry = self.current.get(id(task))
+            if entry is not None and task.get("status") == "TODO" and entry[:2] == (task.get("assignee_id"), self._key(task)):
+                return  # même place dans la même file : l'entrée en place reste valide
+            self.remove(task)
+            self.insert(task)
+
+    def _compact(self, assignee):
+        heap = [entry for entry in self.heaps[assignee] if self.current.get(entry[2]) == (assignee, entry[0], entry[1])]
+        heapq.heapify(heap)
+        self.heaps[assignee] = heap
+
+    def peek(self, assignee):
+        heap = self.heaps.get(assignee)
+        while heap:
+            key, n, oid = heap[0]
+            if self.current.get(oid) == (assignee, key, n):
+                return self.tasks[oid]
+            heapq.heappop(heap)
+        return None
+
+
+_next_queue = None
+
+def _get_next_queue():
+    global _next_queue
+    if _next_queue is None:
+        _next_queue = _NextTaskQueue()
+        _register_index(_next_queue)
+    _ensure_indexes()
+    return _next_queue
+
+def _queue_owner(user_id):
+    """Assigné de la file : id d'utilisateur existant, ou None pour les tâches non assignées."""
+    if user_id is None:
+        return None
+    try:
+        uid = int(user_id)
+    except (TypeError, ValueError):
+        raise ValueError("Invalid user ID format")
+    if uid not in _user_directory().by_id:
+        raise ValueError("User not found")
+    return uid
+
+def peek_next(user_id):
+    """
+    Prochaine tâche à traiter par l'utilisateur (None : tâches non assignées) parmi ses tâches TODO :
+    la plus prioritaire, puis l'échéance la plus proche, puis la plus ancienne. None si aucune.
+    """
+    return _get_next_queue().peek(_queue_owner(user_id))
+
+def pop_next(user_id):
+    """Prend la prochaine tâche de l'utilisateur : elle passe en ONGOING et sort de sa file. None si aucune."""
+    task = peek_next(user_id)
+    if task is not None:
+        with _updating(task):
+            task["status"] = "ONGOING"
+    return task
+
+
+# US049 – Archive froide des tâches terminées
+ARCHIVE_FILE = "tasks.archive"
+ARCHIVE_AFTER = timedelta(days=30)  # délai par défaut depuis completed_at avant archivage
+ARCHIVE_SEGMENT_SIZE = 1000         # tâches par segment : réintégrer une tâche ne décompresse qu'un segment
+_ARCHIVE_MAGIC = b"TMARCHIVE1 "     # en-tête d'une archive persistante, suivi d'une ligne JSON
+_ARCHIVE_FRAME = struct.Struct("<II")  # longueur des ids du segment, longueur du segment
+
+_archive = None
+
+
+class _ArchiveStore:
+    """
+    Fichier de segments en ajout seul : chaque segment est un tableau JSON d'enregistrements,
+    compressé par zlib si demandé. location garde, par id, (n° de segment, position) ; une tâche
+    réintégrée en est retirée, son segment n'est pas réécrit. Les derniers segments lus restent en mémoire.
+    Comme pour les descriptions (US039), une archive temporaire est créée à part dans le répertoire de `path`.
+    Une archive persistante utilise `path` lui-même et survit au processus : un en-tête la lie aux données
+    chargées, et chaque segment est précédé de la liste de ses ids, relue seule à l'ouverture.
+    """
+
+    def __init__(self, path, compress, cache_segments=4, persistent=False):
+        self.persistent = persistent
+        self.compress = compress
+        self.lock = threading.Lock()
+        self.size = 0
+        self.segments = []   # n° de segment -> (position, longueur)
+        self.location = {}   # id -> (n° de segment, position dans le segment)
+        self.max_id = 0      # plus grand id jamais archivé (jamais réattribué par create_task)
+        self.moving = False  # vrai pendant un archivage : le flux publie 'archive' au lieu de 'delete'
+        self.read_segment = functools.lru_cache(maxsize=cache_segments)(self._read_segment)
+        if persistent:
+            self.path = os.path.abspath(path)
+            self._open_persistent()
+        else:
+            directory, name = os.path.split(os.path.abspath(path))
+            fd, self.path = tempfile.mkstemp(prefix=name + ".", dir=directory)
+            self.file = os.fdopen(fd, "w+b")
+
+    @staticmethod
+    def _data_key():
+        """Empreinte du fichier de tâches chargé ; None si elle n'est pas fiable (archive alors repartie de zéro)."""
+        if _loaded_identity is None:
+            return None
+        return hashlib.sha256(repr(_loaded_identity).encode("utf-8")).hexdigest()[:16]
+
+    def _open_persistent(self):
+        """
+        Rouvre l'archive de `path` si elle vaut pour les données chargées, sinon la recommence ;
+        un fichier qui n'est pas une archive n'est jamais modifié.
+        """
+        data_key = self._data_key()
+        try:
+            self.file = open(self.path, "x+b")
+        except FileExistsError:
+            self.file = open(self.path, "r+b")
+            header = self.file.readline(4096)
+            if not header.startswith(_ARCHIVE_MAGIC):
+                self.file.close()
+                raise ValueError("Not an archive file")
+            try:
+                meta = json_loads(header[len(_ARCHIVE_MAGIC):])
+            except ValueError:
+                meta = {}
+            if data_key is not None and meta.get("data") == data_key:
+                self.compress = meta.get("compress", True)
+                self.size = self.file.tell()
+                self._read_frames()
+                return
+            self.file.seek(0)
+            self.file.truncate()
+        header = _ARCHIVE_MAGIC + json_dumps({"data": data_key, "compress": self.compress}) + b"\n"
+        self.file.write(header)
+        self.file.flush()
+        self.size = len(header)
+
+    def _read_frames(self):
+        """Reconstruit segments et location à partir des seuls ids de chaque segment."""
+        while True:
+            frame = self.file.read(_ARCHIVE_FRAME.size)
+            if len(frame) < _ARCHIVE_FRAME.size:
+                break
+            ids_length, length = _ARCHIVE_FRAME.unpack(frame)
+            ids = self.file.read(ids_length)
+            offset = self.size + _ARCHIVE_FRAME.size + ids_length
+            if len(ids) < ids_length or offset + length > os.fstat(self.file.fileno()).st_size:
+                break  # segment incomplet (processus interrompu) : ignoré, puis écrasé
+            self._index_segment(json_loads(ids), offset, length)
+            self.size = offset + length
+            self.file.seek(self.size)
+
+    def _index_segment(self, ids, offset, length):
+        number = len(self.segments)
+        self.segments.append((offset, length))
+        for position, tid in enumerate(ids):
+            self.location[tid] = (number, position)
+        self.max_id = max([self.max_id, *(tid for tid in ids if isinstance(tid, int))])
+
+    def _read_segment(self, number):
+        offset, length = self.segments[number]
+        with self.lock:
+            self.file.seek(offset)
+            data = self.file.read(length)
+        profiler.count("archive_segments_read")
+        return json_loads(zlib.decompress(data) if self.compress else data)
+
+    def append(self, tasks):
+        for start in range(0, len(tasks), ARCHIVE_SEGMENT_SIZE):
+            records = [_as_record(t) for t in tasks[start:start + ARCHIVE_SEGMENT_SIZE]]
+            ids = [r.get("id") for r in records]
+            data = json_dumps(records, default=str)
+            if self.compress:
+                data = zlib.compress(data)
+            frame = b""
+            if self.persistent:
+                ids_data = json_dumps(ids)
+                frame = _ARCHIVE_FRAME.pack(len(ids_data), len(data)) + ids_data
+            with self.lock:
+                self.file.seek(self.size)
+                self.file.write(frame + data)
+                self.file.flush()
+                offset = self.size + len(frame)
+                self.size = offset + len(data)
+            self._index_segment(ids, offset, len(data))
+
+    def get(self, tid):
+        """Copie de la tâche archivée d'id tid, ou None."""
+        where = self.location.get(tid)
+        if where is None:
+            return None
+        return _Task(_snapshot(self.read_segment(where[0])[where[1]]))
+
+    def rehydrate(self, tid):
+        """Remet la tâche archivée dans task_list (en fin de liste, comme une création) ; None si absente."""
+        task = self.get(tid)
+        if task is None:
+            return None
+        where = self.location.pop(tid)
+        task_list.append(task)
+        _on_insert(task)
+        if _txn is not None and not _txn.undoing:
+            _txn.journal.append(("rehydrate", task, where))
+        profiler.count("tasks_rehydrated")
+        return task
+
+    def iter_tasks(self):
+        """Copies des tâches archivées, segment par segment."""
+        for number in range(len(self.segments)):
+            for position, record in enumerate(self.read_segment(number)):
+                if self.location.get(record.get("id")) == (number, position):
+                    yield _Task(_snapshot(record))
+
+    def __len__(self):
+        return len(self.location)
+
+    def close(self):
+        """Ferme le fichier ; une archive temporaire est supprimée, une archive persistante reste sur disque."""
+        self.read_segment.cache_clear()
+        self.file.close()
+        if not self.persistent:
+            os.remove(self.path)
+
+
+def _completed_before(task, cutoff):
+    """Terminée avant cutoff ; sans completed_at (tâche chargée déjà DONE), created_at en tient lieu."""
+    value = task.get("completed_at") or task.get("created_at")
+    try:
+        return datetime.fromisoformat(value) <= cutoff
+    except (TypeError, ValueError):
+        return False
+
+def _wants_archive(q):
+    """L'archive ne contient que des tâches DONE : elle n'est lue que si la requête peut en retenir."""
+    if _archive is None or not _archive.location or not (q.include_archived or q.status == "DONE"):
+        return False
+    return q.status in (None, "DONE") and "DONE" not in (q.exclude_status or ())
+
+def _query_with_archive(q):
+    """Tâches actives et archivées retenues, triées ensemble puis paginées."""
+    tasks = _run_query(replace(q, sort_by=None))
+    with profiler.stage("archive"):
+        tasks += _filtered(q, _archive.iter_tasks())
+    if q.sort_by is not None:
+        with profiler.stage("sort"):
+            tasks = sort_tasks(tasks, sort_by=q.sort_by, order=q.order)
+    if q.after_id is None:
+        return _paginate(tasks, q.page, q.page_size, True)
+    anchor = _index.by_id.get(q.after_id) or _archive.get(q.after_id)
+    if anchor is None:
+        raise ValueError("Task not found")
+    return _paginate_after(q, tasks, anchor)
+
+def _move_to_archive(tasks):
+    """Retire de task_list des tâches présentes dans l'archive (le flux publie 'archive'), puis compacte."""
+    _archive.moving = True
+    try:
+        _tombstone_many(tasks)
+    finally:
+        _archive.moving = False
+    compact_tasks()  # le but est d'alléger task_list : pas d'attente du seuil de compactage
+
+def enable_archive(path=None, compress=True, cache_segments=4, persistent=False):
+    """
+    Ouvre une archive dans un fichier créé à côté de `path` (ARCHIVE_FILE par défaut), sans jamais
+    toucher un fichier existant ; les tâches y entrent par archive_done_tasks.
+    persistent=True : l'archive est `path` lui-même et reste sur disque d'une exécution à l'autre ;
+    si elle a été écrite pour le même fichier de tâches, ses tâches quittent aussitôt task_list
+    sans être réécrites (sinon elle repart de zéro). Un fichier qui n'est pas une archive lève ValueError.
+    Les `cache_segments` derniers segments lus restent décompressés en mémoire.
+    Retourne le nombre de tâches déjà archivées.
+    """
+    global _archive
+    if _archive is not None:
+        disable_archive()
+    _archive = _ArchiveStore(path or ARCHIVE_FILE, compress, cache_segments, persistent)
+    if _archive.location:
+        _ensure_indexes()
+        archived = [t for t in _live_tasks() if t.get("id") in _archive.location]
+        if archived:
+            _move_to_archive(archived)
+    return len(_archive)
+
+def disable_archive(rehydrate=True):
+    """
+    Réintègre toutes les tâches archivées dans task_list et supprime le fichier créé par l'archive.
+    rehydrate=False (archive persistante seulement) : ferme simplement le fichier, qui reste sur disque.
+    """
+    global _archive
+    if _archive is None:
+        return
+    if _txn is not None:
+        raise ValueError("Cannot close the archive inside a transaction")
+    if not rehydrate and not _archive.persistent:
+        raise ValueError("Only a persistent archive can be closed without rehydrating")
+    if rehydrate:
+        for tid in [*_archive.location]:
+            _archive.rehydrate(tid)
+    _archive.close()
+    _archive = None
+
+def archive_done_tasks(older_than=None, now=None):
+    """
+    Déplace dans l'archive les tâches DONE depuis plus de `older_than` (ARCHIVE_AFTER par défaut) :
+    elles quittent task_list, les index et les statistiques, et ne sont plus lues que par get_task
+    et les requêtes sur status="DONE" ou include_archived=True. Toute modification d'une tâche
+    archivée (changement de statut, tags, suppression...) la réintègre d'abord.
+    Retourne le nombre de tâches archivées.
+    """
+    if _archive is None:
+        raise ValueError("Archive is not enabled")
+    if _txn is not None:
+        raise ValueError("Cannot archive inside a transaction")
+    _ensure_indexes()
+    cutoff = (now or datetime.now()) - (ARCHIVE_AFTER if older_than is None else older_than)
+    done = _index.tasks_for_rows(_index.postings["status"].get("DONE", _Bitmap()))
+    tasks = [t for t in done if _completed_before(t, cutoff)]
+    if not tasks:
+        return 0
+    with profiler.stage("archive"):
+        _archive.append(tasks)
+        _move_to_archive(tasks)
+    profiler.count("tasks_archived", len(tasks))
+    return len(tasks)
+
+def archive_stats():
+    """Taille de l'archive, ou None si elle est inactive."""
+    if _archive is None:
+        return None
+    return {"path": _archive.path, "tasks": len(_archive), "segments": len(_archive.segments),
+            "file_bytes": _archive.size, "compressed": _archive.compress, "persistent": _archive.persistent}
+
+
+# US050 – Détection des quasi-doublons : MinHash et LSH sur les trigrammes de caractères
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16                  # 16 bandes de 4 valeurs : candidats dès ~50 % de similarité
+SIMILARITY_THRESHOLD = 0.5      # similarité de Jaccard estimée minimale retenue par find_similar
+DUPLICATE_THRESHOLD = 0.7       # seuil de l'avertissement de create_task
+SIMILAR_CANDIDATES = 4          # candidates comparées par résultat demandé, au plus
+SIMILARITY_CACHE_FILE = "minhash.bin"  # signatures gardées dans le répertoire du cache de requêtes (US042)
+_SIGNATURES_MAGIC = b"TMMINHASH1"
+_MINHASH_BITS = MINHASH_PERMUTATIONS.bit_length() - 1
+# Densification : une case vide reprend la valeur de la première case non vide, dans un ordre de
+# parcours propre à chaque case et identique pour toutes les signatures (donc comparables)
+_DENSIFY_ORDER = [random.Random(50 + i).sample(range(MINHASH_PERMUTATIONS), MINHASH_PERMUTATIONS)
+                  for i in range(MINHASH_PERMUTATIONS)]
+
+
+class DuplicateTaskWarning(UserWarning):
+    """Émis par create_task(..., warn_duplicates=True) ; similar : tâches proches, la plus proche d'abord."""
+
+    def __init__(self, message, similar):
+        super().__init__(message)
+        self.similar = similar
+
+
+def _shingle_hashes(text):
+    """
+    Hachages 32 bits des trigrammes du texte normalisé (minuscules, sans accents ni ponctuation).
+    crc32 plutôt que hash() : même signature d'un processus à l'autre ; la multiplication mélange les bits de poids fort.
+    """
+    data = " ".join(_tokenize(text)).encode("utf-8")
+    if len(data) <= 3:
+        return {zlib.crc32(data) * 0x9E3779B1 & 0xFFFFFFFF} if data else set()
+    crc32 = zlib.crc32
+    return {crc32(data[i:i + 3]) * 0x9E3779B1 & 0xFFFFFFFF for i in range(len(data) - 2)}
+
+def _similarity_text(task):
+    return f"{task.get('title', '')}\n{task.get('description', '')}"
+
+def _minhash(text):
+    """
+    Signature MinHash (array de MINHASH_PERMUTATIONS entiers), ou None pour un texte vide.
+    Variante à une seule permutation : chaque trigramme est haché une fois et réparti dans une case
+    selon les bits de poids fort, la case gardant le plus petit hachage ; les cases vides sont
+    densifiées. Coût proportionnel au nombre de trigrammes, et non à trigrammes × permutations.
+    """
+    hashes = sorted(_shingle_hashes(text), reverse=True)
+    if not hashes:
+        return None
+    shift = 32 - _MINHASH_BITS
+    low = (1 << shift) - 1
+    bins = {h >> shift: h & low for h in hashes}  # ordre décroissant : le minimum est écrit en dernier
+    if len(bins) == MINHASH_PERMUTATIONS:
+        return array("I", [bins[i] for i in range(MINHASH_PERMUTATIONS)])
+    return array("I", [bins[i] if i in bins else bins[next(filter(bins.__contains__, _DENSIFY_ORDER[i]))]
+                       for i in range(MINHASH_PERMUTATIONS)])
+
+
+def _text_digest(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+def _signatures_path():
+    """Fichier des signatures, dans le répertoire du cache de requêtes ; None si ce cache est inactif."""
+    return None if _query_cache is None else os.path.join(_query_cache.path, SIMILARITY_CACHE_FILE)
+
+def _load_signatures():
+    """
+    Signatures déjà calculées, par empreinte du texte signé : {empreinte: signature}.
+    {} sans cache de requêtes, ou si le fichier est absent, illisible ou d'un autre format.
+    """
+    path = _signatures_path()
+    if path is None:
+        return {}
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return {}
+    header = len(_SIGNATURES_MAGIC) + 8
+    if not data.startswith(_SIGNATURES_MAGIC) or len(data) < header:
+        return {}
+    count, permutations = struct.unpack_from("<II", data, len(_SIGNATURES_MAGIC))
+    if permutations != MINHASH_PERMUTATIONS or len(data) != header + count * (8 + 4 * permutations):
+        return {}
+    values = array("I")
+    values.frombytes(data[header + 8 * count:])
+    digests = [data[header + 8 * i:header + 8 * (i + 1)] for i in range(count)]
+    return {digest: values[i * permutations:(i + 1) * permutations] for i, digest in enumerate(digests)}
+
+def _save_signatures(docs):
+    """Réécrit le fichier des signatures (remplacement atomique) ; une erreur d'écriture est ignorée."""
+    path = _signatures_path()
+    if path is None:
+        return
+    digests, values = bytearray(), array("I")
+    for task, signature in docs.values():
+        digests += _text_digest(_similarity_text(task))
+        values.extend(signature)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".bin", dir=os.path.dirname(path))
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_SIGNATURES_MAGIC + struct.pack("<II", len(docs), MINHASH_PERMUTATIONS))
+            f.write(digests)
+            f.write(values.tobytes())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+class _SimilarityIndex:
+    """
+    Signature MinHash par tâche et, pour chaque bande de la signature, table de hachage
+    valeurs de la bande -> tâches : deux tâches sont candidates si une de leurs bandes coïncide.
+    Seules les candidates sont comparées (proportion de valeurs égales des signatures).
+    À la construction, les signatures d'un texte déjà signé sont relues sur disque (_load_signatures) :
+    seules les tâches nouvelles ou modifiées sont signées, et le fichier est alors réécrit.
+    """
+
+    def __init__(self):
+        self.rebuild([])
+
+    def rebuild(self, tasks):
+        self.docs = {}  # id(tâche) -> (tâche, signature)
+        self.buckets = [{} for _ in range(LSH_BANDS)]
+        known = _load_signatures() if tasks else {}
+        signed = 0
+        for task in tasks:
+            text = _similarity_text(task)
+            signature = known.get(_text_digest(text)) if known else None
+            if signature is None:
+                signature = _minhash(text)
+                if signature is None:
+                    continue
+                signed += 1
+            self.docs[id(task)] = (task, signature)
+        self._fill_buckets()
+        profiler.count("similarity_signed", signed)
+        if signed:
+            _save_signatures(self.docs)
+
+    def _fill_buckets(self):
+        """Tables LSH de toutes les signatures en une passe par bande (même contenu que des insert successifs)."""
+        oids = [*self.docs]
+        raws = [signature.tobytes() for _, signature in self.docs.values()]
+        size = MINHASH_PERMUTATIONS * 4 // LSH_BANDS
+        for b in range(LSH_BANDS):
+            start, end = b * size, (b + 1) * size
+            keys = [raw[start:end] for raw in raws]
+            table = self.buckets[b] = dict(zip(keys, oids))
+            if len(table) < len(keys):
+                shared = {key for key, count in Counter(keys).items() if count > 1}
+                for key in shared:
+                    table[key] = set()
+                for key, oid in itertools.compress(zip(keys, oids), map(shared.__contains__, keys)):
+                    table[key].add(oid)
+
+    @staticmethod
+    def _bands(signature):
+        raw = signature.tobytes()
+        size = len(raw) // LSH_BANDS
+        return [raw[b * size:(b + 1) * size] for b in range(LSH_BANDS)]
+
+    def insert(self, task, signature=None):
+        if signature is None:
+            signature = _minhash(_similarity_text(task))
+        if signature is None:
+            return
+        oid = id(task)
+        self.docs[oid] = (task, signature)
+        # Une case ne contenant qu'une tâche (cas courant) garde l'entier id(tâche), sans set
+        for buckets, key in zip(self.buckets, self._bands(signature)):
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = oid
+            elif type(bucket) is set:
+                bucket.add(oid)
+            else:
+                buckets[key] = {bucket, oid}
+
+    def remove(self, task):
+        oid = id(task)
+        doc = self.docs.pop(oid, None)
+        if doc is None:
+            return
+        for buckets, key in zip(self.buckets, self._bands(doc[1])):
+            bucket = buckets[key]
+            if type(bucket) is set and len(bucket) > 1:
+                bucket.discard(oid)
+            else:
+                del buckets[key]
+
+    def update(self, task, before):
+        # Comme l'index textuel : description lue dans le dictionnaire, sans relecture sur disque (US039)
+        if task.get("title") != before.get("title") or dict.get(task, "description") != before.get("description"):
+            self.remove(task)
+            self.insert(task)
+
+    def similar(self, signature, threshold, limit, exclude=None):
+        """
+        Les `limit` meilleures (similarité estimée, tâche) d'au moins `threshold`. Au-delà de
+        SIMILAR_CANDIDATES × limit candidates (nombreux doublons), seules celles partageant le plus
+        de bandes sont comparées : le coût reste borné quel que soit le nombre de doublons.
+        """
+        hits = Counter()
+        for buckets, key in zip(self.buckets, self._bands(signature)):
+            bucket = buckets.get(key)
+            if type(bucket) is set:
+                hits.update(bucket)
+            elif bucket is not None:
+                hits[bucket] += 1
+        hits.pop(exclude, None)
+        candidates = hits.keys()
+        if len(hits) > SIMILAR_CANDIDATES * limit:
+            candidates = [oid for oid, _ in hits.most_common(SIMILAR_CANDIDATES * limit)]
+        profiler.count("tasks_scanned", len(candidates))
+        scored = []
+        for oid in candidates:
+            task, other = self.docs[oid]
+            score = sum(map(operator.eq, signature, other)) / MINHASH_PERMUTATIONS
+            if score >= threshold:
+                scored.append((score, task))
+        return heapq.nlargest(limit, scored, key=lambda item: item[0])
+
+
+_similarity_index = None
+
+def _get_similarity_index():
+    """Construit l'index des quasi-doublons au premier usage, puis le maintient incrémentalement."""
+    global _similarity_index
+    if _similarity_index is None:
+        _similarity_index = _SimilarityIndex()
+        _register_index(_similarity_index)
+    _ensure_indexes()
+    return _similarity_index
+
+def find_similar(task_or_text, threshold=None, limit=10, with_scores=False):
+    """
+    Tâches dont le titre et la description sont proches de ceux d'une tâche (id entier) ou d'un texte,
+    la plus proche d'abord ; la tâche elle-même est exclue. La similarité de Jaccard des trigrammes
+    est estimée par MinHash (SIMILARITY_THRESHOLD par défaut) : seules les tâches partageant une
+    bande LSH sont comparées, quel que soit le nombre de tâches. L'index est construit au premier
+    appel (signatures relues sur disque si le cache de requêtes est actif), puis tenu à jour.
+    """
+    if limit <= 0:
+        raise ValueError("Invalid limit")
+    threshold = SIMILARITY_THRESHOLD if threshold is None else threshold
+    if not 0 < threshold <= 1:
+        raise ValueError("Invalid threshold")
+    exclude = None
+    if isinstance(task_or_text, int):
+        task = get_task(task_or_text)
+        exclude = id(task)
+        task_or_text = _similarity_text(task)
+    with profiler.stage("similar"):
+        signature = _minhash(task_or_text)
+        if signature is None:
+            results = []
+        else:
+            results = _get_similarity_index().similar(signature, threshold, limit, exclude)
+    if with_scores:
+        return results
+    return [task for _, task in results]
@@ -0,0 +1,121 @@
+import sys, os
+import http.client
+import json
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import task_list, create_task, add_tag, delete_task
+from api_server import make_server
+
+
+@pytest.fixture
+def api():
+    task_list.clear()
+    server = make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    yield conn
+    conn.close()
+    server.shutdown()
+    server.server_close()
+
+
+def request(conn, method, path, body=None, headers=None):
+    payload = json.dumps(body) if body is not None else None
+    conn.request(method, path, body=payload, headers=headers or {})
+    response = conn.getresponse()
+    raw = response.read()
+    return response, json.loads(raw) if raw else None
+
+
+def test_cursor_pagination_walks_all_tasks(api):
+    for i in range(5):
+        create_task(f"Tâche {i}")
+    response, page = request(api, "GET", "/tasks?sort_by=none&limit=2")
+    assert response.status == 200
+    titles = [t["title"] for t in page["items"]]
+    while page["next_cursor"]:
+        _, page = request(api, "GET", f"/tasks?sort_by=none&limit=2&cursor={page['next_cursor']}")
+        titles += [t["title"] for t in page["items"]]
+    assert titles == [f"Tâche {i}" for i in range(5)]
+    assert page["total"] == 5
+
+
+def test_etag_gives_not_modified_until_data_changes(api):
+    task = create_task("Rapport")
+    response, _ = request(api, "GET", "/tasks")
+    etag = response.getheader("ETag")
+    response, body = request(api, "GET", "/tasks", headers={"If-None-Match": etag})
+    assert response.status == 304 and body is None
+    add_tag(task["id"], "urgent")
+    response, body = request(api, "GET", "/tasks", headers={"If-None-Match": etag})
+    assert response.status == 200 and body["items"][0]["tags"] == ["urgent"]
+
+
+def test_write_routes_and_errors(api):
+    response, task = request(api, "POST", "/tasks", {"title": "API", "priority": "HIGH"})
+    assert response.status == 201
+    response, task = request(api, "PATCH", f"/tasks/{task['id']}", {"status": "ONGOING", "add_tags": ["api"]})
+    assert (task["status"], task["tags"]) == ("ONGOING", ["api"])
+    response, body = request(api, "PATCH", f"/tasks/{task['id']}", {"priority": "URGENT"})
+    assert response.status == 400 and "error" in body
+    response, _ = request(api, "DELETE", f"/tasks/{task['id']}")
+    assert response.status == 204
+    response, _ = request(api, "GET", f"/tasks/{task['id']}")
+    assert response.status == 404
+    response, _ = request(api, "GET", "/tasks?cursor=!!")
+    assert response.status == 400
+
+
+def test_cursor_seeks_and_survives_deleted_anchor(api, monkeypatch):
+    import task_manager
+    tasks = [create_task(f"Tâche {i}") for i in range(6)]
+    _, page = request(api, "GET", "/tasks?sort_by=none&limit=2")
+    # Les pages suivantes reprennent après la tâche du curseur, sans matérialiser tout le résultat
+    monkeypatch.setattr(task_manager, "_run_query", None)
+    _, page = request(api, "GET", f"/tasks?sort_by=none&limit=2&cursor={page['next_cursor']}")
+    assert [t["title"] for t in page["items"]] == ["Tâche 2", "Tâche 3"] and page["total"] == 6
+    monkeypatch.undo()
+    delete_task(tasks[3]["id"])
+    _, page = request(api, "GET", f"/tasks?sort_by=none&limit=2&cursor={page['next_cursor']}")
+    assert [t["title"] for t in page["items"]] == ["Tâche 5"] and page["next_cursor"] is None
+
+
+def test_etag_depends_on_url(api):
+    create_task("Rapport")
+    response, _ = request(api, "GET", "/tasks?limit=1")
+    etag = response.getheader("ETag")
+    response, _ = request(api, "GET", "/tasks?limit=2", headers={"If-None-Match": etag})
+    assert response.status == 200 and response.getheader("ETag") != etag
+    response, _ = request(api, "GET", "/stats", headers={"If-None-Match": etag})
+    assert response.status == 200
+
+
+def test_invalid_field_types_are_rejected(api):
+    for body in ({"title": 12}, {"title": "A", "description": ["x"]}, {"title": "A", "priority": 3}):
+        response, error = request(api, "POST", "/tasks", body)
+        assert response.status == 400 and error["error"].startswith("Invalid")
+    task = create_task("API")
+    for body in ({"assignee_id": "1"}, {"assignee_id": True}, {"add_tags": "api"}, {"remove_tags": [1]}):
+        response, _ = request(api, "PATCH", f"/tasks/{task['id']}", body)
+        assert response.status == 400
+    assert len(task_list) == 1
+
+
+def test_etag_changes_with_the_day(api, monkeypatch):
+    import datetime
+    import api_server
+    create_task("Rapport", due_date="2030-01-01")
+    response, _ = request(api, "GET", "/tasks?overdue=true")
+    etag = response.getheader("ETag")
+
+    class Tomorrow(datetime.date):
+        @classmethod
+        def today(cls):
+            return datetime.date.today() + datetime.timedelta(days=1)
+    monkeypatch.setattr(api_server, "date", Tomorrow)
+    response, _ = request(api, "GET", "/tasks?overdue=true", headers={"If-None-Match": etag})
+    assert response.status == 200
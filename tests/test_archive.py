@@ -0,0 +1,133 @@
+import sys, os
+from datetime import datetime, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, get_task, get_tasks, change_task_status, add_tag, count_tasks, query_tasks,
+    TaskQuery, enable_archive, disable_archive, archive_done_tasks, archive_stats, transaction,
+    get_changes, current_sequence
+)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    task_list.clear()
+    tasks = [create_task(f"Tâche {i}") for i in range(6)]
+    for task in tasks[:4]:
+        change_task_status(task["id"], "DONE")
+    path = tmp_path / "tasks.archive"
+    enable_archive(str(path))
+    yield tasks
+    disable_archive()
+
+
+def test_old_done_tasks_move_to_archive(archive, monkeypatch):
+    monkeypatch.setattr(task_manager, "ARCHIVE_SEGMENT_SIZE", 3)
+    start = current_sequence()
+    assert archive_done_tasks(now=datetime.now() + timedelta(days=31)) == 4
+    assert len(task_list) == 2
+    assert [e["op"] for e in get_changes(start)] == ["archive"] * 4
+    assert archive_stats()["tasks"] == 4 and archive_stats()["segments"] == 2
+    assert {t["id"] for t in get_tasks(page_size=100)} == {archive[4]["id"], archive[5]["id"]}
+    done = get_tasks(status="DONE", page_size=100, sort_by="title", order="asc")
+    assert [t["title"] for t in done] == [f"Tâche {i}" for i in range(4)]
+    assert count_tasks(TaskQuery(status="DONE")) == 4
+    assert len(query_tasks(TaskQuery(include_archived=True, page_size=None))) == 6
+    assert get_task(archive[0]["id"])["status"] == "DONE"
+
+
+def test_recent_done_tasks_stay_hot(archive):
+    assert archive_done_tasks() == 0
+    assert len(task_list) == 6
+
+
+def test_status_change_rehydrates(archive):
+    archive_done_tasks(older_than=timedelta(0))
+    task = change_task_status(archive[1]["id"], "TODO")
+    assert task in task_list and "completed_at" not in task
+    assert archive_stats()["tasks"] == 3
+    add_tag(archive[2]["id"], "relu")  # toute modification réintègre la tâche
+    assert get_task(archive[2]["id"])["tags"] == ["relu"] and len(task_list) == 4
+
+
+def test_rollback_puts_task_back_in_archive(archive):
+    archive_done_tasks(older_than=timedelta(0))
+    with pytest.raises(RuntimeError):
+        with transaction():
+            change_task_status(archive[0]["id"], "ONGOING")
+            raise RuntimeError("abandon")
+    assert count_tasks() == 2 and archive_stats()["tasks"] == 4
+    assert get_task(archive[0]["id"])["status"] == "DONE"
+
+
+def test_disable_rehydrates_everything(archive):
+    archive_done_tasks(older_than=timedelta(0))
+    path = archive_stats()["path"]
+    disable_archive()
+    assert len(task_list) == 6 and not os.path.exists(path)
+    assert archive_stats() is None
+    enable_archive(path)
+
+
+def test_existing_file_is_left_untouched(tmp_path):
+    existing = tmp_path / "tasks.archive"
+    existing.write_bytes(b"ancien contenu")
+    enable_archive(str(existing))
+    assert archive_stats()["path"] != str(existing)
+    disable_archive()
+    assert existing.read_bytes() == b"ancien contenu"
+
+
+def test_new_task_never_reuses_an_archived_id(archive):
+    change_task_status(archive[5]["id"], "DONE")
+    archive_done_tasks(older_than=timedelta(0))
+    task = create_task("Nouvelle")
+    assert task["id"] == archive[5]["id"] + 1
+    assert get_task(archive[5]["id"])["title"] == "Tâche 5"
+
+
+def test_persistent_archive_is_reused_between_runs(tmp_path, monkeypatch):
+    disable_archive()
+    monkeypatch.setattr(task_manager, "_loaded_identity", ("tasks.json", 1, 2, 3, 4))
+    task_list.clear()
+    for i in range(5):
+        task = create_task(f"Tâche {i}")
+        if i < 3:
+            change_task_status(task["id"], "DONE")
+    records = [dict(t) for t in task_list]  # contenu de tasks.json, jamais réécrit
+    path = str(tmp_path / "tasks.archive")
+
+    assert enable_archive(path, persistent=True) == 0
+    assert archive_done_tasks(older_than=timedelta(0)) == 3
+    size = os.path.getsize(path)
+    disable_archive(rehydrate=False)
+    assert os.path.getsize(path) == size
+
+    task_list[:] = [dict(r) for r in records]  # exécution suivante
+    assert enable_archive(path, persistent=True) == 3
+    assert len(task_list) == 2 and archive_stats()["persistent"]
+    assert archive_done_tasks(older_than=timedelta(0)) == 0
+    assert os.path.getsize(path) == size
+    assert get_task(records[1]["id"])["title"] == "Tâche 1"
+    assert create_task("Nouvelle")["id"] == records[-1]["id"] + 1
+    disable_archive(rehydrate=False)
+
+    monkeypatch.setattr(task_manager, "_loaded_identity", ("tasks.json", 1, 2, 3, 5))
+    task_list[:] = [dict(r) for r in records]  # tasks.json modifié : l'archive repart de zéro
+    assert enable_archive(path, persistent=True) == 0 and len(task_list) == 5
+    disable_archive()
+
+
+def test_persistent_archive_refuses_other_files(tmp_path):
+    disable_archive()
+    existing = tmp_path / "notes.txt"
+    existing.write_bytes(b"ancien contenu")
+    with pytest.raises(ValueError, match="Not an archive file"):
+        enable_archive(str(existing), persistent=True)
+    assert existing.read_bytes() == b"ancien contenu"
+    with pytest.raises(ValueError, match="persistent"):
+        enable_archive(str(tmp_path / "tmp.archive"))
+        disable_archive(rehydrate=False)
+    disable_archive()
@@ -0,0 +1,68 @@
+import pytest
+from src import task_manager
+from src.task_manager import task_list, create_task, add_tags, remove_tag, update_task, create_user, complete
+
+
+@pytest.fixture(autouse=True)
+def setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_manager, "USERS_FILE", str(tmp_path / "users.json"))
+    task_list.clear()
+
+
+def test_tags_by_frequency():
+    t1 = create_task("A")
+    t2 = create_task("B")
+    add_tags(t1["id"], ["backend", "bug"])
+    add_tags(t2["id"], ["bug", "budget"])
+    assert complete("tag", "b") == ["bug", "backend", "budget"]
+    assert complete("tag", "BU", limit=1) == ["bug"]
+    assert complete("tag", "bu", with_counts=True) == [("bug", 2), ("budget", 1)]
+
+
+def test_tags_follow_removal():
+    t1 = create_task("A")
+    add_tags(t1["id"], ["backend"])
+    assert complete("tag", "ba") == ["backend"]
+    remove_tag(t1["id"], "backend")
+    assert complete("tag", "ba") == []
+
+
+def test_titles_ignore_accents_and_follow_updates():
+    t1 = create_task("Réunion équipe")
+    create_task("Rapport mensuel")
+    assert complete("title", "re") == ["Réunion équipe"]
+    update_task(t1["id"], title="Revue de code")
+    assert complete("title", "r") == ["Rapport mensuel", "Revue de code"]
+
+
+def test_user_names():
+    create_user("Alice", "alice@example.com")
+    assert complete("user", "al") == ["Alice"]
+    create_user("Albert", "albert@example.com")
+    assert complete("user", "al") == ["Albert", "Alice"]
+
+
+def test_invalid_kind():
+    with pytest.raises(ValueError, match="Invalid completion kind"):
+        complete("project", "a")
+
+
+def test_short_prefixes_stay_exact_under_mutations(monkeypatch):
+    monkeypatch.setattr(task_manager._PrefixIndex, "TOP_DEPTH", 2)
+    index = task_manager._PrefixIndex()
+    counts = {}
+    rng = __import__("random").Random(7)
+    for _ in range(2000):
+        value = rng.choice(["ba", "bb", "bc", "bd", "be", "bf", "ca", "b", "Bé"])
+        if rng.random() < 0.6:
+            index.add(value)
+            counts[value] = counts.get(value, 0) + 1
+        elif value in counts:
+            index.discard(value)
+            counts[value] -= 1
+            if not counts[value]:
+                del counts[value]
+        for prefix in ("", "b", "be"):
+            expected = sorted((v for v in counts if task_manager._fold(v).startswith(prefix)),
+                              key=lambda v: (-counts[v], task_manager._fold(v), v))[:3]
+            assert [v for v, _ in index.complete(prefix, limit=3)] == expected
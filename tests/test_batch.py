@@ -0,0 +1,60 @@
+import sys, os
+import json
+
+import pytest
+from click.testing import CliRunner
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import task_list, get_task
+from main import cli
+
+
+@pytest.fixture
+def users_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    monkeypatch.setattr(task_manager, "USERS_FILE", str(path))
+    task_list.clear()
+    yield path
+    task_manager.flush_users()
+
+
+def run_batch(script, *options):
+    result = CliRunner().invoke(cli, ["--no-cache", "batch", *options, "-"], input=script)
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.output.splitlines()]
+
+
+def test_batch_runs_each_line_and_reports_ndjson(users_file):
+    results = run_batch('create "Préparer la démo" --priority HIGH\n'
+                        '# commentaire ignoré\n'
+                        'addtag 1 demo\n'
+                        'status 1 PLOUF\n'
+                        'assign 99 1\n')
+    assert [r["line"] for r in results] == [1, 3, 4, 5]
+    assert [r["ok"] for r in results] == [True, True, False, False]
+    assert "Tâche créée (ID 1)" in results[0]["output"]
+    assert "PLOUF" in results[2]["error"]
+    assert results[3]["error"].endswith("not found")
+    assert get_task(1)["tags"] == ["demo"]
+
+
+def test_users_are_written_every_n_operations(users_file, monkeypatch):
+    writes = []
+    real_write = task_manager._atomic_write_json
+
+    def counting_write(path, data):
+        writes.append(len(data))
+        real_write(path, data)
+    monkeypatch.setattr(task_manager, "_atomic_write_json", counting_write)
+
+    script = "".join(f"new-user User{i} user{i}@example.com\n" for i in range(5))
+    results = run_batch(script, "--flush-every", "2")
+    assert all(r["ok"] for r in results)
+    assert writes == [2, 4, 5]
+    assert len(json.loads(users_file.read_text(encoding="utf-8"))) == 5
+
+
+def test_stop_on_error(users_file):
+    results = run_batch("delete 42\ncreate Suite\n", "--stop-on-error")
+    assert len(results) == 1 and not results[0]["ok"]
@@ -0,0 +1,90 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, add_tags, assign_task, change_task_status, delete_tasks,
+    TaskQuery, count_tasks, query_tasks, get_tasks_by_tags, _save_users, _Bitmap
+)
+
+
+def test_bitmap_operations_across_chunks():
+    a, b = _Bitmap(), _Bitmap()
+    for row in (1, 5, 65535, 65536, 300000):
+        a.add(row)
+    for row in (5, 65536, 7):
+        b.add(row)
+    assert [*(a & b)] == [5, 65536]
+    assert [*(a | b)] == [1, 5, 7, 65535, 65536, 300000]
+    assert [*(a - b)] == [1, 65535, 300000]
+    assert len(a) == 5 and 65535 in a and 65534 not in a
+    a.discard(300000)
+    assert len(a.chunks) == 2  # bloc vide libéré
+
+
+def test_dense_chunks_switch_representation():
+    dense, odd = _Bitmap(), _Bitmap()
+    for row in range(10000):
+        dense.add(row)
+        if row % 2:
+            odd.add(row)
+    assert isinstance(dense.chunks[0], int) and isinstance(odd.chunks[0], int)
+    assert len(dense & odd) == 5000
+    assert [*(dense - odd)][:3] == [0, 2, 4]
+    for row in range(9000):
+        dense.discard(row)
+    assert isinstance(dense.chunks[0], set) and len(dense) == 1000
+
+
+def test_discard_many_and_tracked_cardinality():
+    bitmap = _Bitmap.from_rows(range(10000))
+    assert isinstance(bitmap.chunks[0], int)
+    bitmap.discard(3)
+    bitmap.discard(3)
+    bitmap.add(3)
+    assert len(bitmap) == 10000 and bitmap.counts[0] == 10000
+    bitmap.discard_many(range(0, 9000))
+    assert isinstance(bitmap.chunks[0], set) and len(bitmap) == 1000
+    bitmap.discard_many(range(9000, 10000))
+    assert not bitmap
+
+
+class TestBitmapIndex:
+    def setup_method(self):
+        _save_users([{"id": 7, "name": "Alice", "email": "alice@example.com", "created_at": "2025-07-01T12:00:00"}])
+        task_list.clear()
+        self.tasks = [create_task(f"Tâche {i}", priority="HIGH" if i % 2 else "LOW") for i in range(12)]
+        for t in self.tasks[:6]:
+            add_tags(t["id"], ["backend"])
+            assign_task(t["id"], 7)
+        change_task_status(self.tasks[1]["id"], "DONE")
+
+    def test_count_matches_query(self):
+        q = TaskQuery(priority="HIGH", tags=["backend"], assignee_id=7, exclude_status=["DONE"])
+        assert count_tasks(q) == 2
+        assert len(query_tasks(q)) == 2
+        assert count_tasks() == 12
+        assert count_tasks(TaskQuery(keyword="Tâche 1")) == 3  # critère non indexé : requête complète
+
+    def test_exclude_status_validation(self):
+        with pytest.raises(ValueError, match="Invalid filter status"):
+            count_tasks(TaskQuery(exclude_status=["NOPE"]))
+
+    def test_tags_any_is_union_in_list_order(self):
+        add_tags(self.tasks[10]["id"], ["frontend"])
+        result = get_tasks_by_tags(["frontend", "backend"])
+        assert [t["id"] for t in result] == [t["id"] for t in self.tasks[:6]] + [self.tasks[10]["id"]]
+
+    def test_rows_are_renumbered_densely_after_compaction(self):
+        delete_tasks([t["id"] for t in self.tasks[:8]])
+        assert len(task_list) == 4
+        assert sorted(task_manager._index.rows.values()) == [0, 1, 2, 3]
+        assert count_tasks(TaskQuery(priority="HIGH")) == 2
+
+    def test_bulk_delete_keeps_indexes_consistent(self):
+        assert delete_tasks([t["id"] for t in self.tasks[:3]] + [self.tasks[0]["id"], 999]) == 3
+        assert count_tasks(TaskQuery(tags=["backend"])) == 3
+        assert count_tasks(TaskQuery(priority="HIGH")) == 5
+        assert [t["id"] for t in query_tasks(TaskQuery(sort_by="created_at", order="asc", page_size=None))] \
+            == [t["id"] for t in self.tasks[3:]]
@@ -0,0 +1,44 @@
+import sys, os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import task_list, create_task, add_tag, change_task_status, TaskQuery
+from browser import parse_filter, PageFetcher
+
+
+def test_parse_filter_maps_criteria_to_indexed_fields():
+    q = parse_filter("status:todo prio:high tag:backend user:7 not:DONE rapport mensuel")
+    assert (q.status, q.priority, q.tags, q.assignee_id) == ("TODO", "HIGH", ["backend"], 7)
+    assert q.exclude_status == ["DONE"]
+    assert q.keyword == "rapport mensuel"
+    assert parse_filter("user:none").assignee_id is None
+    assert parse_filter("").keyword is None
+
+
+class TestPageFetcher:
+    def setup_method(self):
+        task_list.clear()
+        for i in range(7):
+            create_task(f"Tâche {i}")
+
+    def test_pages_are_cached_until_data_changes(self):
+        fetcher = PageFetcher(TaskQuery(sort_by=None), page_size=3)
+        first = fetcher.page(1)
+        assert [t["title"] for t in first] == ["Tâche 0", "Tâche 1", "Tâche 2"]
+        assert fetcher.total_items() == 7 and fetcher.total_pages() == 3
+        assert fetcher.page(1) is first
+        add_tag(first[0]["id"], "backend")
+        assert fetcher.page(1) is not first
+
+    def test_prefetch_loads_next_page_in_background(self):
+        fetcher = PageFetcher(TaskQuery(sort_by=None), page_size=3)
+        fetcher.page(1)
+        fetcher.prefetch(2)
+        fetcher.prefetching.join()
+        assert [t["title"] for t in fetcher.pages[2]] == ["Tâche 3", "Tâche 4", "Tâche 5"]
+        fetcher.prefetch(4)  # au-delà de la dernière page : rien à faire
+        assert 4 not in fetcher.pages
+
+    def test_live_filter_counts_through_indexes(self):
+        change_task_status(task_list[0]["id"], "DONE")
+        fetcher = PageFetcher(parse_filter("not:DONE"), page_size=10)
+        assert fetcher.total_items() == 6
@@ -0,0 +1,56 @@
+import sys, os
+import threading
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, change_task_status, add_tag, delete_task,
+    get_changes, current_sequence, wait_for_changes, ChangeFeedTruncated
+)
+
+
+class TestChangeFeed:
+    def setup_method(self):
+        task_list.clear()
+        get_changes(current_sequence())  # absorbe l'événement 'reset' dû au clear
+        self.start = current_sequence()
+
+    def test_mutations_emit_events_in_order(self):
+        t = create_task("A")
+        change_task_status(t["id"], "DONE")
+        add_tag(t["id"], "urgent")
+        delete_task(t["id"])
+        events = get_changes(self.start)
+        assert [e["op"] for e in events] == ["insert", "update", "update", "delete"]
+        assert [e["seq"] for e in events] == list(range(self.start + 1, self.start + 5))
+        assert events[1]["fields"] == ["completed_at", "status"]  # US049 : date de fin posée avec le statut DONE
+        assert events[2]["fields"] == ["tags"]
+        assert all(e["task_id"] == t["id"] for e in events)
+
+    def test_read_from_checkpoint(self):
+        create_task("A")
+        checkpoint = current_sequence()
+        t = create_task("B")
+        assert [e["task_id"] for e in get_changes(checkpoint)] == [t["id"]]
+        assert get_changes(current_sequence()) == []
+
+    def test_direct_list_change_emits_reset(self):
+        task_list.append({"id": 50, "title": "X", "description": "", "status": "TODO", "created_at": "2024-01-01T00:00:00"})
+        assert [e["op"] for e in get_changes(self.start)] == ["reset"]
+
+    def test_truncated_feed(self, monkeypatch):
+        feed = task_manager._ChangeFeed(size=2)
+        monkeypatch.setattr(task_manager, "_change_feed", feed)
+        for i in range(3):
+            feed._emit("insert", i)
+        assert [e["task_id"] for e in feed.read(1)] == [1, 2]
+        with pytest.raises(ChangeFeedTruncated):
+            feed.read(0)
+
+    def test_wait_for_changes(self):
+        timer = threading.Timer(0.05, lambda: create_task("Plus tard"))
+        timer.start()
+        events = wait_for_changes(self.start, timeout=5)
+        timer.join()
+        assert events[0]["op"] == "insert"
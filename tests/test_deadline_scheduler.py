@@ -0,0 +1,93 @@
+import sys, os
+from datetime import datetime, timedelta
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, change_task_status, delete_task, set_due_date,
+    register_reminder, unregister_reminder, poll_reminders, get_tasks_due_within, parse_duration
+)
+
+NOW = datetime(2030, 1, 1, 12, 0)
+
+
+class TestDeadlineScheduler:
+    def setup_method(self):
+        task_list.clear()
+
+    def teardown_method(self):
+        for _, callback in [*task_manager._reminder_callbacks]:
+            unregister_reminder(callback)
+
+    def test_due_within_reads_open_tasks_in_due_order(self):
+        late = create_task("Plus tard", due_date="2030-01-02T10:00:00")
+        soon = create_task("Bientôt", due_date="2030-01-01T15:00:00")
+        create_task("Lointaine", due_date="2030-02-01T00:00:00")
+        create_task("Sans échéance")
+        done = create_task("Finie", due_date="2030-01-01T13:00:00")
+        change_task_status(done["id"], "DONE")
+
+        items = get_tasks_due_within(timedelta(hours=24), now=NOW)
+        assert [t["id"] for t, _ in items] == [soon["id"], late["id"]]
+
+    def test_overdue_tasks_can_be_excluded(self):
+        past = create_task("Passée", due_date="2029-12-31T00:00:00")
+        assert [t["id"] for t, _ in get_tasks_due_within(timedelta(hours=1), now=NOW)] == [past["id"]]
+        assert get_tasks_due_within(timedelta(hours=1), now=NOW, include_overdue=False) == []
+
+    def test_reminders_fire_once_per_threshold(self):
+        fired = []
+        def on_reminder(t, due, before):
+            fired.append((t["id"], before))
+        register_reminder(on_reminder, before=timedelta(hours=2))
+        register_reminder(on_reminder)
+        t = create_task("A", due_date="2030-01-01T13:00:00")
+
+        assert poll_reminders(NOW) == 1
+        assert fired == [(t["id"], timedelta(hours=2))]
+        assert poll_reminders(NOW) == 0
+        assert poll_reminders(NOW + timedelta(hours=2)) == 1
+        assert fired[-1] == (t["id"], timedelta(0))
+
+    def test_hooks_track_due_date_status_and_deletion(self):
+        fired = []
+        register_reminder(lambda t, due, before: fired.append(t["id"]))
+        moved = create_task("Déplacée", due_date="2030-01-01T10:00:00")
+        closed = create_task("Close", due_date="2030-01-01T10:00:00")
+        deleted = create_task("Supprimée", due_date="2030-01-01T10:00:00")
+        set_due_date(moved["id"], "2030-01-05T10:00:00")
+        change_task_status(closed["id"], "DONE")
+        delete_task(deleted["id"])
+
+        assert poll_reminders(NOW) == 0
+        assert poll_reminders(datetime(2030, 1, 6)) == 1
+        assert fired == [moved["id"]]
+
+    def test_stale_entries_are_compacted(self):
+        register_reminder(lambda t, due, before: None, before=timedelta(hours=1))
+        t = create_task("Souvent déplacée", due_date="2030-01-01T10:00:00")
+        for day in range(1, 500):
+            set_due_date(t["id"], (datetime(2030, 1, 1, 10) + timedelta(days=day)).isoformat())
+        scheduler = task_manager._get_scheduler()
+        assert all(len(heap) <= 2 * len(scheduler.due) + 65 for heap in scheduler.heaps.values())
+        assert [x["id"] for x, _ in get_tasks_due_within(timedelta(days=600), now=NOW)] == [t["id"]]
+
+    def test_status_toggles_do_not_duplicate_entries(self):
+        register_reminder(lambda t, due, before: None, before=timedelta(hours=1))
+        t = create_task("Reprise", due_date="2030-01-01T10:00:00")
+        for i in range(1000):
+            change_task_status(t["id"], "ONGOING" if i % 2 == 0 else "TODO")
+        scheduler = task_manager._get_scheduler()
+        assert all(len(heap) <= 2 * len(scheduler.due) + 65 for heap in scheduler.heaps.values())
+        assert [x["id"] for x, _ in get_tasks_due_within(timedelta(days=1), now=NOW)] == [t["id"]]
+        change_task_status(t["id"], "DONE")
+        change_task_status(t["id"], "TODO")
+        assert poll_reminders(datetime(2030, 1, 2)) == 2  # un rappel par seuil, une seule fois
+
+    def test_parse_duration(self):
+        assert parse_duration("24h") == timedelta(hours=24)
+        assert parse_duration("30m") == timedelta(minutes=30)
+        assert parse_duration("2d") == timedelta(days=2)
+        with pytest.raises(ValueError, match="Invalid duration format"):
+            parse_duration("demain")
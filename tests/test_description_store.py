@@ -0,0 +1,66 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, update_task, get_task, search_tasks, get_changes, current_sequence,
+    enable_description_store, disable_description_store, description_store_stats, metrics_snapshot, enable_profiling
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    task_list.clear()
+    create_task("Rapport", "Synthèse mensuelle des ventes")
+    create_task("Réunion", "Préparer l'ordre du jour")
+    assert enable_description_store(str(tmp_path / "descriptions.blob"), cache_size=2) == 2
+    yield description_store_stats()["path"]
+    disable_description_store()
+
+
+def test_descriptions_leave_memory_and_load_on_demand(store):
+    task = task_list[0]
+    assert "description" not in dict(task)
+    assert os.path.getsize(store) > 0
+    assert get_task(task["id"])["description"] == "Synthèse mensuelle des ventes"
+    assert task.get("description") == "Synthèse mensuelle des ventes"
+    stats = description_store_stats()
+    assert stats["cache_misses"] == 1 and stats["cache_hits"] == 1
+
+
+def test_new_and_updated_descriptions_are_spilled(store):
+    t = create_task("Nouvelle", "Texte initial")
+    assert "description" not in dict(t) and t["description"] == "Texte initial"
+    start = current_sequence()
+    update_task(t["id"], description="Texte modifié")
+    assert "description" not in dict(t) and t["description"] == "Texte modifié"
+    assert get_changes(start)[0]["fields"] == ["description"]
+
+
+def test_keyword_search_reads_only_indexed_candidates(store):
+    create_task("Ventes", "Bilan annuel")
+    enable_profiling()
+    assert [t["title"] for t in search_tasks("mensuelle")] == ["Rapport"]
+    assert [t["title"] for t in search_tasks("ensuelle des vent")] == ["Rapport"]
+    assert search_tasks("introuvable") == []
+    assert [t["title"] for t in search_tasks("vent")] == ["Rapport", "Ventes"]
+    counters = metrics_snapshot()["counters"]
+    assert counters["descriptions_scanned"] == 3 and "descriptions_loaded" not in counters
+
+
+def test_existing_file_is_left_untouched(tmp_path):
+    disable_description_store()
+    existing = tmp_path / "notes.txt"
+    existing.write_text("à garder")
+    enable_description_store(str(existing))
+    assert description_store_stats()["path"] != str(existing)
+    disable_description_store()
+    assert existing.read_text() == "à garder"
+
+
+def test_disable_restores_descriptions(store):
+    disable_description_store()
+    assert dict(task_list[1])["description"] == "Préparer l'ordre du jour"
+    assert not os.path.exists(store)
+    assert description_store_stats() is None
@@ -34,6 +34,12 @@ class TestFilterTasksByStatus:
         results = filter_tasks_by_status("TODO")
         assert results == []
 
+    def test_direct_edit_moves_task_to_new_status(self):
+        filter_tasks_by_status("TODO")  # index construit avant la modification
+        task_list[0]["status"] = "DONE"
+        assert filter_tasks_by_status("TODO") == []
+        assert {t["id"] for t in filter_tasks_by_status("DONE")} == {1, 3}
+
     def test_filter_invalid_status(self):
         with pytest.raises(ValueError) as exc:
             filter_tasks_by_status("INVALID")
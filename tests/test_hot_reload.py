@@ -0,0 +1,76 @@
+import json
+import time
+import pytest
+from src import task_manager
+from src.task_manager import task_list, get_task, get_tasks, get_changes, current_sequence, reload_tasks, FileWatcher
+
+RECORDS = [
+    {"id": 1, "title": "Un", "description": "", "status": "TODO", "created_at": "2024-07-01T10:00:00"},
+    {"id": 2, "title": "Deux", "description": "", "status": "TODO", "created_at": "2024-07-02T10:00:00"},
+    {"id": 3, "title": "Trois", "description": "", "status": "DONE", "created_at": "2024-07-03T10:00:00"},
+]
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    path = tmp_path / "tasks.json"
+    path.write_text(json.dumps(RECORDS), encoding="utf-8")
+    monkeypatch.setattr(task_manager, "DATA_FILE", str(path))
+    monkeypatch.setattr(task_manager, "_record_hashes", None)
+    task_list[:] = [task_manager._Task(r) for r in RECORDS]
+    yield path
+    task_manager.stop_hot_reload()
+
+
+def _rewrite(path, records):
+    path.write_text(json.dumps(records), encoding="utf-8")
+
+
+def test_reload_applies_only_the_diff(data_file):
+    task_manager._snapshot_record_hashes()
+    unchanged = get_task(1)
+    start = current_sequence()
+    records = [dict(r) for r in RECORDS if r["id"] != 3]
+    records[1]["status"] = "ONGOING"
+    records.append({"id": 4, "title": "Quatre", "description": "", "status": "TODO", "created_at": "2024-07-04T10:00:00"})
+    _rewrite(data_file, records)
+
+    assert reload_tasks() == {"inserted": 1, "updated": 1, "deleted": 1}
+    assert get_task(1) is unchanged
+    assert get_task(2)["status"] == "ONGOING"
+    assert [t["id"] for t in get_tasks(status="TODO")] == [4, 1]
+    with pytest.raises(ValueError):
+        get_task(3)
+    assert sorted(e["op"] for e in get_changes(start)) == ["delete", "insert", "update"]
+
+
+def test_reload_ignores_corrupt_file(data_file):
+    data_file.write_text("{pas du json", encoding="utf-8")
+    assert reload_tasks() is None
+    assert len(task_list) == 3
+
+
+def test_file_watcher_polling_detects_changes(tmp_path):
+    path = tmp_path / "f.json"
+    path.write_text("[]")
+    seen = []
+    watcher = FileWatcher([str(path)], seen.append, use_inotify=False)
+    assert watcher.check() == []
+    path.write_text("[1, 2]")
+    assert watcher.check() == [str(path)]
+    assert seen == [str(path)]
+
+
+def test_hot_reload_in_background(data_file):
+    watcher = task_manager.start_hot_reload(interval=0.05)
+    _rewrite(data_file, RECORDS + [{"id": 9, "title": "Neuf", "description": "", "status": "TODO",
+                                    "created_at": "2024-07-09T10:00:00"}])
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            assert get_task(9)["title"] == "Neuf"
+            break
+        except ValueError:
+            time.sleep(0.02)
+    else:
+        pytest.fail(f"Rechargement non détecté ({watcher.mode})")
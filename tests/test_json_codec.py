@@ -0,0 +1,43 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import json_dumps, json_loads, set_json_codec, json_codec
+
+DATA = {"tâches": [{"id": 1, "titre": "Réunion", "tags": ["a/b"], "due_date": None}], "stats": {7: 2}}
+
+
+@pytest.fixture(params=["json", "ujson", "orjson"])
+def codec(request):
+    previous = json_codec()
+    try:
+        set_json_codec(request.param)
+    except ValueError:
+        pytest.skip(f"{request.param} non installé")
+    yield request.param
+    set_json_codec(previous)
+
+
+def test_round_trip_compact_and_pretty(codec):
+    compact = json_dumps(DATA)
+    assert b"\n" not in compact and "Réunion".encode("utf-8") in compact
+    assert json_loads(compact) == {**DATA, "stats": {"7": 2}}
+    pretty = json_dumps(DATA, pretty=True)
+    assert b'\n  "' in pretty and json_loads(pretty) == json_loads(compact)
+    with pytest.raises(ValueError):
+        json_loads(b"{pas du json")
+
+
+def test_unknown_codec_is_rejected():
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        set_json_codec("yaml")
+
+
+def test_files_are_compact_unless_pretty(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    task_manager._atomic_write_json(str(path), [{"id": 1}])
+    assert path.read_bytes() == b'[{"id":1}]'
+    monkeypatch.setattr(task_manager, "JSON_PRETTY", True)
+    task_manager._atomic_write_json(str(path), [{"id": 1}])
+    assert json_loads(path.read_bytes()) == [{"id": 1}] and b"\n" in path.read_bytes()
@@ -0,0 +1,71 @@
+import sys, os
+import random
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, add_tag, change_task_status, delete_tasks, compact_tasks, sort_tasks,
+    TaskQuery, query_tasks, enable_profiling, metrics_snapshot,
+)
+
+
+def setup_function():
+    task_list.clear()
+    rng = random.Random(7)
+    for i in range(200):
+        task = create_task(f"Tâche {i}", priority=rng.choice(["LOW", "NORMAL", "HIGH"]))
+        task["created_at"] = f"2025-01-{rng.randint(1, 9):02d}T00:00:00"  # beaucoup d'égalités
+        if i % 3 == 0:
+            add_tag(task["id"], "backend")
+
+
+def expected(order, **criteria):
+    matches = query_tasks(TaskQuery(sort_by=None, page_size=None, **criteria))
+    return [t["id"] for t in sort_tasks(matches, "created_at", order)]
+
+
+def test_index_order_matches_stable_sort():
+    delete_tasks(range(1, 40, 2))
+    compact_tasks()
+    change_task_status(50, "DONE")
+    for order in ("asc", "desc"):
+        for criteria in ({}, {"priority": "HIGH"}, {"tags": ["backend"], "keyword": "1"}):
+            ids = expected(order, **criteria)
+            for page in (1, 2, 5):
+                items, pag = query_tasks(TaskQuery(order=order, page=page, page_size=15, **criteria),
+                                         return_pagination=True)
+                assert [t["id"] for t in items] == ids[(page - 1) * 15:page * 15]
+                assert pag["total_items"] == len(ids)
+                assert pag["has_next"] == (page * 15 < len(ids))
+
+
+def test_first_page_without_total_stops_early():
+    enable_profiling()
+    items, pag = query_tasks(TaskQuery(page_size=10), return_pagination=True, with_total=False)
+    snap = metrics_snapshot()
+    enable_profiling(False)
+    assert [t["id"] for t in items] == expected("desc")[:10]
+    assert pag["total_items"] is None and pag["has_next"]
+    assert snap["counters"]["tasks_scanned"] == 11
+    assert "sort" not in snap["timings"]
+
+
+def test_after_id_resumes_after_the_cursor_task():
+    delete_tasks(range(1, 40, 2))
+    for sort_by, order in ((None, "asc"), ("created_at", "asc"), ("created_at", "desc"), ("title", "asc")):
+        for criteria in ({}, {"priority": "HIGH"}):
+            ids = [t["id"] for t in query_tasks(TaskQuery(sort_by=sort_by, order=order, page_size=None, **criteria))]
+            seen, after = [], None
+            while True:
+                items, pag = query_tasks(TaskQuery(sort_by=sort_by, order=order, page_size=15, after_id=after,
+                                                   **criteria), return_pagination=True)
+                seen += [t["id"] for t in items]
+                assert pag["total_items"] == len(ids)
+                if not pag["has_next"]:
+                    break
+                after = items[-1]["id"]
+            assert seen == ids
+    # Curseur sur une tâche exclue par les filtres : on reprend à sa place dans l'ordre
+    low = query_tasks(TaskQuery(priority="LOW", page_size=1))[0]
+    items = query_tasks(TaskQuery(priority="HIGH", page_size=None))
+    resumed = query_tasks(TaskQuery(priority="HIGH", page_size=100, after_id=low["id"]))
+    assert resumed == [t for t in items if (t["created_at"], -t["id"]) < (low["created_at"], -low["id"])]
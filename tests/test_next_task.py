@@ -0,0 +1,60 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, create_user, assign_task, set_task_priority, set_due_date,
+    change_task_status, delete_task, peek_next, pop_next,
+)
+
+
+@pytest.fixture
+def user(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_manager, "USERS_FILE", str(tmp_path / "users.json"))
+    task_list.clear()
+    yield create_user("Alice", "alice@example.com")["id"]
+    task_manager.flush_users()
+
+
+def test_queue_orders_by_priority_then_deadline(user):
+    ids = {}
+    for title, prio, due in [("normale", "NORMAL", None), ("haute tard", "HIGH", "2030-06-01"),
+                             ("haute sans date", "HIGH", None), ("haute tôt", "HIGH", "2030-01-01")]:
+        ids[title] = create_task(title, priority=prio, due_date=due)["id"]
+        assign_task(ids[title], user)
+    create_task("non assignée", priority="CRITICAL")
+    assert peek_next(user)["title"] == "haute tôt"
+    assert peek_next(None)["title"] == "non assignée"
+
+    set_due_date(ids["haute tard"], "2029-12-31")
+    assert peek_next(user)["title"] == "haute tard"
+    set_task_priority(ids["normale"], "CRITICAL")
+    assert peek_next(user)["title"] == "normale"
+    change_task_status(ids["normale"], "DONE")
+    delete_task(ids["haute tard"])
+    assign_task(ids["haute tôt"], None)
+    assert peek_next(user)["title"] == "haute sans date"
+
+
+def test_pop_next_takes_tasks_in_order(user):
+    for prio in ("LOW", "CRITICAL", "NORMAL"):
+        assign_task(create_task(prio, priority=prio)["id"], user)
+    taken = [pop_next(user)["title"] for _ in range(3)]
+    assert taken == ["CRITICAL", "NORMAL", "LOW"]
+    assert all(t["status"] == "ONGOING" for t in task_list)
+    assert pop_next(user) is None
+    with pytest.raises(ValueError, match="User not found"):
+        peek_next(999)
+
+
+def test_status_toggles_leave_one_live_entry(user):
+    toggled = create_task("Reprise", priority="HIGH")
+    other = create_task("Suivante")
+    for i in range(1000):
+        change_task_status(toggled["id"], "ONGOING" if i % 2 == 0 else "TODO")
+    queue = task_manager._get_next_queue()
+    assert len(queue.heaps[None]) <= 2 * queue.live[None] + 64
+    assert pop_next(None) is toggled
+    assert pop_next(None) is other
+    assert pop_next(None) is None
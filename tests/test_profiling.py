@@ -0,0 +1,39 @@
+import json
+from src.task_manager import task_list, create_task, get_tasks, enable_profiling, metrics_snapshot, format_metrics
+
+
+def setup_function(function):
+    task_list.clear()
+    for i in range(5):
+        create_task(f"Tâche {i}", priority="HIGH" if i % 2 else "LOW")
+
+
+def teardown_function(function):
+    enable_profiling(False)
+
+
+def test_profiling_disabled_records_nothing():
+    enable_profiling(False)
+    get_tasks(priority="HIGH")
+    assert metrics_snapshot() == {"timings": {}, "counters": {}}
+
+
+def test_profiling_records_stages_and_counters():
+    enable_profiling()
+    get_tasks(priority="HIGH")
+    snap = metrics_snapshot()
+    assert snap["timings"]["filter"]["calls"] == 1
+    assert snap["timings"]["sort"]["calls"] == 1
+    # Seules les tâches HIGH sont parcourues grâce à l'index de priorité
+    assert snap["counters"]["index_scans"] == 1
+    assert snap["counters"]["tasks_scanned"] == 2
+    assert snap["counters"]["tasks_matched"] == 2
+
+
+def test_format_metrics_json_and_prometheus():
+    enable_profiling()
+    get_tasks()
+    assert json.loads(format_metrics("json"))["counters"]["tasks_scanned"] == 5
+    text = format_metrics("prometheus")
+    assert 'task_manager_events_total{counter="tasks_scanned"} 5' in text
+    assert 'task_manager_stage_calls_total{stage="filter"} 1' in text
@@ -0,0 +1,76 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import task_list, create_task, add_tag, TaskQuery, query_tasks, get_all_tags
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    task_list.clear()
+    for i in range(3):
+        add_tag(create_task(f"Tâche {i}")["id"], "backend")
+    # Simule un processus qui a chargé tasks.json
+    monkeypatch.setattr(task_manager, "_loaded_identity", ("tasks.json", 1, 2, 3, 4))
+    cache = task_manager.enable_query_cache(str(tmp_path / "cache"))
+    yield cache
+    task_manager.disable_query_cache()
+
+
+def test_results_are_served_from_disk(cache, monkeypatch):
+    first = query_tasks(TaskQuery(sort_by=None), return_pagination=True)
+    assert get_all_tags() == {"backend": 3}
+    assert cache.stats()["entries"] == 2
+
+    def no_query(q):
+        raise AssertionError("query recomputed")
+    monkeypatch.setattr(task_manager, "_run_query", no_query)
+    items, pagination = query_tasks(TaskQuery(sort_by=None), return_pagination=True)
+    assert items == first[0] and all(a is b for a, b in zip(items, first[0]))  # tâches vivantes
+    assert pagination == first[1]
+    assert get_all_tags() == {"backend": 3}
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_changes_bypass_and_invalidate_entries(cache, monkeypatch):
+    query_tasks(TaskQuery())
+    create_task("Nouvelle")
+    assert len(query_tasks(TaskQuery())) == 4  # données modifiées en mémoire : nouvelle clé
+    add_tag(task_list[0]["id"], "urgent")
+    assert query_tasks(TaskQuery(tags=["urgent"])) == [task_list[0]]
+    assert cache.stats()["current_entries"] == 1 and cache.misses == 3
+
+    monkeypatch.setattr(task_manager, "_loaded_identity", ("tasks.json", 1, 2, 3, 5))
+    query_tasks(TaskQuery(status="TODO"))
+    st = cache.stats()
+    assert (st["entries"], st["stale_entries"]) == (1, 0)  # l'entrée de l'ancien fichier est supprimée
+
+
+def test_size_bound_evicts_least_recently_used(cache):
+    cache.max_bytes = 1
+    query_tasks(TaskQuery(priority="HIGH"))
+    query_tasks(TaskQuery(priority="LOW"))
+    assert cache.stats()["entries"] == 1
+    assert task_manager.clear_query_cache() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_state_as_loaded_is_shared_between_processes(cache, monkeypatch):
+    key = cache.data_key()
+    monkeypatch.setattr(task_manager, "_process_token", "autre processus")
+    assert cache.data_key() != key  # état modifié depuis l'import : propre au processus
+    monkeypatch.setattr(task_list, "version", 0)
+    monkeypatch.setattr(task_manager._change_feed, "seq", 0)
+    shared = cache.data_key()
+    monkeypatch.setattr(task_manager, "_process_token", "encore un autre")
+    assert cache.data_key() == shared
+
+
+def test_default_directory_follows_xdg(tmp_path):
+    import subprocess
+    src = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+    env = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "xdg"), "PYTHONPATH": src}
+    out = subprocess.run([sys.executable, "-c", "import task_manager; print(task_manager.QUERY_CACHE_DIR)"],
+                         cwd=tmp_path, env=env, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == str(tmp_path / "xdg" / "task_manager")
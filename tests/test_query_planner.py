@@ -0,0 +1,63 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, add_tags, assign_task, change_task_status, set_due_date,
+    TaskQuery, query_tasks, explain_query, _save_users
+)
+
+
+class TestQueryPlanner:
+    def setup_method(self):
+        _save_users([{"id": 7, "name": "Alice", "email": "alice@example.com", "created_at": "2025-07-01T12:00:00"}])
+        task_list.clear()
+        for i in range(20):
+            create_task(f"Tâche {i}", "rapport mensuel" if i % 4 == 0 else "autre", priority="HIGH" if i % 2 else "NORMAL")
+        self.target = create_task("Rapport ventes", "rapport", priority="HIGH")
+        add_tags(self.target["id"], ["backend", "urgent"])
+        assign_task(self.target["id"], 7)
+        set_due_date(self.target["id"], "2020-01-01")
+
+    def test_combined_predicates(self):
+        q = TaskQuery(status="TODO", priority="high", assignee_id=7, tags=["backend"],
+                      keyword="RAPPORT", overdue=True, due_to="2020-06-01")
+        assert query_tasks(q) == [self.target]
+
+    def test_tags_all_mode(self):
+        assert query_tasks(TaskQuery(tags=["backend", "absent"], tags_mode="all")) == []
+        assert query_tasks(TaskQuery(tags=["backend", "absent"])) == [self.target]
+
+    def test_unassigned_filter(self):
+        tasks = query_tasks(TaskQuery(assignee_id=None, page_size=None))
+        assert len(tasks) == 20 and self.target not in tasks
+
+    def test_explain_intersects_indexes_most_selective_first(self):
+        plan = explain_query(TaskQuery(status="TODO", priority="HIGH", assignee_id=7))
+        assert plan["access"] == "index"
+        assert plan["index"] == "assignee_id=7 & priority=HIGH & status=TODO"
+        assert plan["estimated_rows"] == 1
+        assert plan["total_rows"] == 21
+
+    def test_explain_full_scan_without_indexable_predicate(self):
+        plan = explain_query(TaskQuery(keyword="rapport"))
+        assert plan["access"] == "scan"
+        assert plan["filters"] == ["keyword~'rapport'"]
+
+    def test_index_follows_direct_edits(self):
+        self.target["status"] = "DONE"
+        assert query_tasks(TaskQuery(status="DONE")) == [self.target]
+        change_task_status(self.target["id"], "ONGOING")
+        assert query_tasks(TaskQuery(status="ONGOING")) == [self.target]
+        assert query_tasks(TaskQuery(status="DONE")) == []
+
+    def test_created_range_and_pagination(self):
+        tasks, pag = query_tasks(TaskQuery(created_from="2000-01-01", page_size=5, page=2), return_pagination=True)
+        assert len(tasks) == 5
+        assert pag["total_items"] == 21
+
+    def test_invalid_values(self):
+        with pytest.raises(ValueError, match="Invalid filter status"):
+            query_tasks(TaskQuery(status="NOPE"))
+        with pytest.raises(ValueError, match="Invalid date format"):
+            query_tasks(TaskQuery(due_from="demain"))
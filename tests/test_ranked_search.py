@@ -0,0 +1,57 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, update_task, delete_task, search_ranked, search_tasks, enable_profiling, metrics_snapshot
+)
+
+
+class TestRankedSearch:
+    def setup_method(self):
+        task_list.clear()
+        self.desc_only = create_task("Réunion équipe", "préparer le rapport pour lundi")
+        self.title = create_task("Rapport mensuel", "chiffres de ventes")
+        self.other = create_task("Courses", "lait et pain")
+
+    def test_title_match_ranks_first(self):
+        assert search_ranked("rapport") == [self.title, self.desc_only]
+
+    def test_scores_are_returned_in_decreasing_order(self):
+        results = search_ranked("rapport ventes", with_scores=True)
+        scores = [score for score, _ in results]
+        assert scores == sorted(scores, reverse=True)
+        assert results[0][1] is self.title
+
+    def test_typo_tolerance(self):
+        assert search_ranked("raport")[0] is self.title
+        assert search_ranked("reunoin") == [self.desc_only]
+        assert search_ranked("raport", fuzzy=False) == []
+
+    def test_accents_are_ignored(self):
+        assert search_ranked("reunion") == [self.desc_only]
+
+    def test_index_follows_updates_and_deletes(self):
+        search_ranked("rapport")
+        update_task(self.other["id"], title="Rapport annuel")
+        delete_task(self.title["id"])
+        assert self.other in search_ranked("rapport")
+        assert self.title not in search_ranked("rapport")
+
+    def test_limit_and_pagination(self):
+        assert len(search_ranked("rapport", limit=1)) == 1
+        assert search_tasks("rapport", page=2, page_size=1, ranked=True) == [self.desc_only]
+        with pytest.raises(ValueError):
+            search_ranked("rapport", limit=0)
+
+    def test_common_term_is_pruned_once_top_k_is_full(self):
+        for i in range(200):
+            create_task(f"Rapport {i}", "compte rendu")
+        audit = create_task("Audit sécurité", "rapport d'audit")
+        enable_profiling()
+        try:
+            assert search_ranked("audit rapport", limit=1) == [audit]
+            # La liste de "rapport" (204 tâches) n'est pas parcourue : son majorant ne peut battre l'audit
+            assert metrics_snapshot()["counters"]["tasks_scanned"] < 10
+        finally:
+            enable_profiling(False)
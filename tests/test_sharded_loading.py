@@ -0,0 +1,55 @@
+import sys, os
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+
+SHARDS = {
+    "tasks-0001.json": [{"id": 1, "title": "Un", "status": "TODO"}, {"id": 2, "title": "Deux", "status": "DONE"}],
+    "tasks-0002.json": [{"id": 3, "title": "Trois", "status": "TODO", "tags": ["api"]}, {"id": 4, "title": "Quatre"}],
+    "tasks-0003.json": [],
+}
+
+
+@pytest.fixture(autouse=True)
+def keep_loaded_identity(monkeypatch):
+    monkeypatch.setattr(task_manager, "_loaded_identity", task_manager._loaded_identity)
+
+
+def write_shards(directory):
+    directory.mkdir()
+    for name, records in SHARDS.items():
+        (directory / name).write_text(json.dumps(records), encoding="utf-8")
+    return [record for name in sorted(SHARDS) for record in SHARDS[name]]
+
+
+def test_directory_and_glob_load_shards_in_order(tmp_path):
+    expected = write_shards(tmp_path / "shards")
+    (tmp_path / "shards" / "notes.txt").write_text("ignoré", encoding="utf-8")
+    for spec in (str(tmp_path / "shards"), str(tmp_path / "shards" / "tasks-*.json")):
+        tasks = task_manager._load_tasks(spec, workers=1)
+        assert tasks == expected
+        assert all(isinstance(t, task_manager._Task) for t in tasks)
+
+
+def test_process_pool_returns_same_tasks_and_skips_bad_shards(tmp_path):
+    expected = write_shards(tmp_path / "shards")
+    (tmp_path / "shards" / "tasks-0004.json").write_text("{corrompu", encoding="utf-8")
+    tasks = task_manager._load_tasks(str(tmp_path / "shards"), workers=2)
+    assert tasks == expected  # champs absents conservés absents (pas de "tags": None)
+    assert "tags" not in tasks[3]
+    assert task_manager._loaded_identity[0] == "shards"
+
+
+def _child_task_count():
+    return len(task_manager.task_list)
+
+
+def test_spawned_worker_does_not_load_tasks_at_import(tmp_path, monkeypatch):
+    write_shards(tmp_path / "shards")
+    monkeypatch.setenv("TASK_MANAGER_DATA", str(tmp_path / "shards"))
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        assert pool.submit(_child_task_count).result() == 0
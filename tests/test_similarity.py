@@ -0,0 +1,78 @@
+import sys, os
+import warnings
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, update_task, delete_task, find_similar, DuplicateTaskWarning
+)
+
+
+@pytest.fixture
+def tasks():
+    task_list.clear()
+    return [
+        create_task("Rapport mensuel des ventes"),
+        create_task("Réunion d'équipe", "Préparer l'ordre du jour"),
+        create_task("Corriger le bug de connexion"),
+    ]
+
+
+def test_find_similar_by_text_and_id(tasks):
+    assert find_similar("Rapport mensuel ventes") == [tasks[0]]
+    assert find_similar("RAPPORT mensuel des ventes !", with_scores=True)[0][0] == 1.0
+    assert find_similar("Migration de la base") == []
+    twin = create_task("Corriger bug connexion")
+    assert find_similar(tasks[2]["id"]) == [twin]  # la tâche elle-même est exclue
+    with pytest.raises(ValueError, match="Task not found"):
+        find_similar(999)
+    with pytest.raises(ValueError, match="Invalid threshold"):
+        find_similar("Rapport", threshold=0)
+
+
+def test_index_follows_updates_and_deletions(tasks):
+    find_similar("Rapport mensuel des ventes")
+    update_task(tasks[0]["id"], title="Inventaire annuel")
+    assert find_similar("Rapport mensuel des ventes") == []
+    assert find_similar("Inventaire annuel") == [tasks[0]]
+    delete_task(tasks[0]["id"])
+    assert find_similar("Inventaire annuel") == []
+
+
+def test_create_task_warns_on_duplicates(tasks):
+    with pytest.warns(DuplicateTaskWarning) as record:
+        task = create_task("Rapport mensuel ventes", warn_duplicates=True)
+    assert record[0].message.similar == [tasks[0]]
+    assert task in task_list
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        create_task("Rapport mensuel")  # pas de vérification par défaut
+        create_task("Planifier les congés", warn_duplicates=True)
+
+
+def test_first_and_later_calls_agree(tasks, monkeypatch):
+    import task_manager
+    monkeypatch.setattr(task_manager, "_similarity_index", None)
+    twin = create_task("Corriger bug connexion")
+    first = find_similar("Corriger le bug de connexion", with_scores=True)
+    assert first == find_similar("Corriger le bug de connexion", with_scores=True)
+    assert [t for _, t in first] == [tasks[2], twin]
+
+
+def test_signatures_are_reused_from_disk(tasks, tmp_path, monkeypatch):
+    import task_manager
+    monkeypatch.setattr(task_manager, "_similarity_index", None)
+    task_manager.enable_query_cache(str(tmp_path / "cache"))
+    try:
+        expected = find_similar("Rapport mensuel ventes", with_scores=True)
+        assert os.path.exists(tmp_path / "cache" / task_manager.SIMILARITY_CACHE_FILE)
+        # Processus suivant : seul le texte cherché et la tâche nouvelle sont signés
+        monkeypatch.setattr(task_manager, "_similarity_index", None)
+        create_task("Planifier les congés")
+        signed = []
+        minhash = task_manager._minhash
+        monkeypatch.setattr(task_manager, "_minhash", lambda text: signed.append(text) or minhash(text))
+        results = find_similar("Rapport mensuel ventes", with_scores=True)
+        assert results == expected and len(signed) == 2
+    finally:
+        task_manager.disable_query_cache()
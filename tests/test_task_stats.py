@@ -0,0 +1,60 @@
+import sys, os
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, change_task_status, set_task_priority, set_due_date,
+    delete_task, add_tag, remove_tag, assign_task, get_task_stats, rebuild_indexes, _save_users
+)
+
+
+class TestTaskStats:
+    def setup_method(self):
+        _save_users([{"id": 1, "name": "Alice", "email": "alice@example.com", "created_at": "2025-07-01T12:00:00"}])
+        task_list.clear()
+        self.t1 = create_task("A", priority="HIGH")
+        self.t2 = create_task("B")
+        self.t3 = create_task("C", priority="LOW")
+
+    def test_initial_counts(self):
+        st = get_task_stats()
+        assert st["total"] == 3
+        assert st["by_status"] == {"TODO": 3}
+        assert st["by_priority"] == {"HIGH": 1, "NORMAL": 1, "LOW": 1}
+        assert st["by_assignee"] == {None: 3}
+        assert st["overdue"] == 0
+
+    def test_counts_follow_mutations(self):
+        change_task_status(self.t1["id"], "DONE")
+        set_task_priority(self.t2["id"], "CRITICAL")
+        add_tag(self.t2["id"], "urgent")
+        add_tag(self.t3["id"], "urgent")
+        remove_tag(self.t3["id"], "urgent")
+        assign_task(self.t3["id"], 1)
+        delete_task(self.t1["id"])
+        st = get_task_stats(by_user=True)
+        assert st["total"] == 2
+        assert st["by_status"] == {"TODO": 2}
+        assert st["by_priority"] == {"CRITICAL": 1, "LOW": 1}
+        assert st["by_tag"] == {"urgent": 1}
+        assert st["by_user"] == {None: {"TODO": 1}, 1: {"TODO": 1}}
+
+    def test_overdue_count(self):
+        past = (datetime.now() - timedelta(days=2)).isoformat(timespec="seconds")
+        future = (datetime.now() + timedelta(days=2)).isoformat(timespec="seconds")
+        set_due_date(self.t1["id"], past)
+        set_due_date(self.t2["id"], future)
+        set_due_date(self.t3["id"], past)
+        assert get_task_stats()["overdue"] == 2
+        change_task_status(self.t3["id"], "DONE")
+        assert get_task_stats()["overdue"] == 1
+
+    def test_direct_list_changes_are_detected(self):
+        task_list.append({"id": 99, "title": "Z", "description": "", "status": "ONGOING",
+                          "created_at": "2024-07-01T10:00:00"})
+        assert get_task_stats()["by_status"] == {"TODO": 3, "ONGOING": 1}
+
+    def test_rebuild_after_in_place_edit(self):
+        self.t1["status"] = "DONE"
+        rebuild_indexes()
+        assert get_task_stats()["by_status"] == {"TODO": 2, "DONE": 1}
@@ -0,0 +1,74 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import task_manager
+from task_manager import (
+    task_list, create_task, delete_task, delete_tasks, delete_tasks_where, compact_tasks,
+    get_task, get_tasks, get_tasks_by_tag, add_tag, TaskQuery
+)
+
+
+class TestTombstones:
+    def setup_method(self):
+        task_list.clear()
+        self.tasks = [create_task(f"Tâche {i}") for i in range(10)]
+
+    def test_deleted_task_is_hidden_before_compaction(self, monkeypatch):
+        monkeypatch.setattr(task_manager, "TOMBSTONE_RATIO", 1.0)
+        delete_task(self.tasks[3]["id"])
+        assert len(task_list) == 10  # toujours présente physiquement
+        assert self.tasks[3]["id"] not in [t["id"] for t in get_tasks(page_size=100)]
+        with pytest.raises(ValueError, match="Task not found"):
+            get_task(self.tasks[3]["id"])
+        assert compact_tasks() == 1
+        assert len(task_list) == 9
+        assert [t["id"] for t in get_tasks(page_size=100, sort_by=None)] == [t["id"] for t in self.tasks if t is not self.tasks[3]]
+
+    def test_rebuild_does_not_resurrect_pending_deletions(self, monkeypatch):
+        monkeypatch.setattr(task_manager, "TOMBSTONE_RATIO", 1.0)
+        delete_task(self.tasks[3]["id"])
+        task_manager.rebuild_indexes()
+        with pytest.raises(ValueError, match="Task not found"):
+            get_task(self.tasks[3]["id"])
+        assert len(get_tasks(page_size=100)) == 9
+        task_list.append({"id": 99, "title": "Ajout direct", "status": "TODO"})  # reconstruction implicite
+        assert self.tasks[3]["id"] not in [t["id"] for t in get_tasks(page_size=100)]
+
+    def test_compaction_triggers_past_ratio(self):
+        delete_task(self.tasks[0]["id"])
+        delete_task(self.tasks[1]["id"])
+        assert len(task_list) == 10
+        delete_task(self.tasks[2]["id"])  # 3 > 0.25 * 10
+        assert len(task_list) == 7
+        assert task_manager._tombstones == {}
+
+    def test_delete_tasks_bulk_ignores_unknown_ids(self):
+        assert delete_tasks([t["id"] for t in self.tasks[:5]] + [999]) == 5
+        assert len(task_list) == 5
+        with pytest.raises(ValueError, match="Invalid ID format"):
+            delete_tasks(["abc"])
+
+    def test_delete_tasks_where(self):
+        add_tag(self.tasks[2]["id"], "obsolète")
+        add_tag(self.tasks[7]["id"], "obsolète")
+        assert delete_tasks_where(TaskQuery(tags=["obsolète"])) == 2
+        assert get_tasks_by_tag("obsolète") == []
+        assert len(get_tasks(page_size=100)) == 8
+        with pytest.raises(ValueError, match="At least one filter is required"):
+            delete_tasks_where(TaskQuery())
+
+    def test_direct_append_keeps_deleted_task_hidden(self, monkeypatch):
+        monkeypatch.setattr(task_manager, "TOMBSTONE_RATIO", 1.0)
+        delete_task(self.tasks[0]["id"])
+        task_list.append(task_manager._Task(dict(self.tasks[0], id=100)))
+        ids = [t["id"] for t in get_tasks(page_size=100, sort_by=None)]
+        assert self.tasks[0]["id"] not in ids and 100 in ids
+
+    def test_reassigning_deleted_tasks_restores_them(self, monkeypatch):
+        monkeypatch.setattr(task_manager, "TOMBSTONE_RATIO", 1.0)
+        saved = [*task_list]
+        delete_task(self.tasks[0]["id"])
+        task_list[:] = saved
+        assert len(get_tasks(page_size=100)) == 10
+        assert get_task(self.tasks[0]["id"]) is self.tasks[0]
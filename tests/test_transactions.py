@@ -0,0 +1,64 @@
+import sys, os
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from task_manager import (
+    task_list, create_task, get_task, add_tag, change_task_status, delete_task, set_due_date,
+    get_all_tags, get_task_stats, get_changes, current_sequence, TaskQuery, query_tasks, transaction,
+)
+
+
+def setup_function():
+    task_list.clear()
+    for i in range(3):
+        create_task(f"Tâche {i}")
+    add_tag(1, "backend")
+
+
+def titles(**criteria):
+    return [t["title"] for t in query_tasks(TaskQuery(sort_by=None, page_size=None, **criteria))]
+
+
+def test_failed_transaction_restores_tasks_and_indexes():
+    seq = current_sequence()
+    with pytest.raises(ValueError):
+        with transaction():
+            new = create_task("Temporaire")
+            add_tag(new["id"], "demo")
+            change_task_status(1, "DONE")
+            add_tag(2, "backend")
+            delete_task(3)
+            set_due_date(2, "pas une date")
+    assert titles() == ["Tâche 0", "Tâche 1", "Tâche 2"]
+    assert titles(status="TODO") == ["Tâche 0", "Tâche 1", "Tâche 2"]
+    assert titles(tags=["backend"]) == ["Tâche 0"]
+    assert get_all_tags() == {"backend": 1}
+    assert get_task_stats()["by_status"].get("DONE", 0) == 0
+    assert get_task(3)["title"] == "Tâche 2"
+    assert current_sequence() == seq  # aucun événement publié
+    assert create_task("Suivante")["id"] == 4
+
+
+def test_commit_publishes_events_at_the_end():
+    seq = current_sequence()
+    with transaction():
+        change_task_status(2, "ONGOING")
+        add_tag(2, "api")
+        assert titles(status="ONGOING") == ["Tâche 1"]  # visible dans la transaction
+        assert current_sequence() == seq
+    events = get_changes(seq)
+    assert [e["op"] for e in events] == ["update", "update"]
+    assert get_task(2)["tags"] == ["api"]
+
+
+def test_nested_transaction_rolls_back_to_savepoint():
+    with transaction():
+        change_task_status(1, "DONE")
+        with pytest.raises(ValueError):
+            with transaction():
+                change_task_status(1, "ONGOING")
+                add_tag(1, "urgent")
+                raise ValueError("boom")
+        assert get_task(1)["status"] == "DONE"
+        assert get_task(1)["tags"] == ["backend"]
+    assert titles(status="DONE") == ["Tâche 0"]
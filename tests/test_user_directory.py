@@ -0,0 +1,48 @@
+import json
+import pytest
+from src import task_manager
+from src.task_manager import create_user, get_users, get_user, get_user_by_email
+
+
+@pytest.fixture(autouse=True)
+def users_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    monkeypatch.setattr(task_manager, "USERS_FILE", str(path))
+    for name in ["Charlie", "alice", "Bob", "Albert", "Béa"]:
+        create_user(name, f"{name.lower()}@example.com")
+    return path
+
+
+def test_sorted_pages():
+    assert [u["name"] for u in get_users(page=1, page_size=3)] == ["Albert", "alice", "Bob"]
+    assert [u["name"] for u in get_users(page=2, page_size=3)] == ["Béa", "Charlie"]
+
+
+def test_name_prefix_filter():
+    users, pag = get_users(name_prefix="AL", return_pagination=True)
+    assert [u["name"] for u in users] == ["Albert", "alice"]
+    assert pag["total_items"] == 2
+
+
+def test_keyset_pagination():
+    page1, pag = get_users(page_size=2, return_pagination=True)
+    page2, pag2 = get_users(page_size=2, after_id=pag["next_cursor"], return_pagination=True)
+    page3, pag3 = get_users(page_size=2, after_id=pag2["next_cursor"], return_pagination=True)
+    assert [u["name"] for u in page1 + page2 + page3] == ["Albert", "alice", "Bob", "Béa", "Charlie"]
+    assert pag3["next_cursor"] is None
+
+
+def test_lookup_by_email_and_id():
+    bob = get_user_by_email("  BOB@example.com ")
+    assert bob["name"] == "Bob"
+    assert get_user(bob["id"]) is bob
+    with pytest.raises(ValueError, match="User not found"):
+        get_user_by_email("nobody@example.com")
+
+
+def test_external_file_change_is_picked_up(users_file):
+    users = json.loads(users_file.read_text(encoding="utf-8"))
+    users.append({"id": 42, "name": "Aaron", "email": "aaron@example.com", "created_at": "2025-01-01T00:00:00"})
+    users_file.write_text(json.dumps(users), encoding="utf-8")
+    assert get_users(page_size=1)[0]["name"] == "Aaron"
+    assert create_user("Zoé", "zoe@example.com")["id"] == 43
@@ -0,0 +1,74 @@
+import json
+import os
+import pytest
+from src import task_manager
+
+
+@pytest.fixture
+def users_file(tmp_path, monkeypatch):
+    path = tmp_path / "users.json"
+    monkeypatch.setattr(task_manager, "USERS_FILE", str(path))
+    yield path
+    task_manager.flush_users()
+
+
+def test_save_users_is_atomic_and_leaves_no_temp_file(users_file):
+    task_manager.create_user("Alice", "alice@example.com")
+    assert json.loads(users_file.read_text(encoding="utf-8"))[0]["name"] == "Alice"
+    assert os.listdir(users_file.parent) == ["users.json"]
+
+
+def test_failed_write_keeps_previous_file(users_file, monkeypatch):
+    task_manager.create_user("Alice", "alice@example.com")
+
+    def broken_dumps(*args, **kwargs):
+        raise IOError("disk full")
+    with monkeypatch.context() as m:
+        m.setattr(task_manager, "json_dumps", broken_dumps)
+        with pytest.raises(IOError):
+            task_manager.create_user("Bob", "bob@example.com")
+
+    users = json.loads(users_file.read_text(encoding="utf-8"))
+    assert [u["name"] for u in users] == ["Alice"]
+    assert os.listdir(users_file.parent) == ["users.json"]
+
+
+def test_failed_flush_keeps_pending_users_for_retry(users_file, monkeypatch):
+    monkeypatch.setattr(task_manager, "USERS_COMMIT_WINDOW", 60)
+    task_manager.create_user("Alice", "alice@example.com")
+    task_manager.create_user("Bob", "bob@example.com")
+
+    def broken_write(path, data):
+        raise IOError("disk full")
+    with monkeypatch.context() as m:
+        m.setattr(task_manager, "_atomic_write_json", broken_write)
+        with pytest.raises(IOError):
+            task_manager.flush_users()
+    assert not users_file.exists()
+    assert [u["name"] for u in task_manager.get_users()] == ["Alice", "Bob"]  # toujours en attente
+
+    task_manager.flush_users()
+    users = json.loads(users_file.read_text(encoding="utf-8"))
+    assert [u["name"] for u in users] == ["Alice", "Bob"]
+
+
+def test_group_commit_coalesces_writes(users_file, monkeypatch):
+    writes = []
+    real_write = task_manager._atomic_write_json
+
+    def counting_write(path, data):
+        writes.append(len(data))
+        real_write(path, data)
+    monkeypatch.setattr(task_manager, "_atomic_write_json", counting_write)
+    monkeypatch.setattr(task_manager, "USERS_COMMIT_WINDOW", 60)
+
+    for i in range(5):
+        task_manager.create_user(f"User{i}", f"user{i}@example.com")
+    # Les lectures voient les écritures en attente
+    assert len(task_manager.get_users()) == 5
+    assert writes == []
+    assert not users_file.exists()
+
+    task_manager.flush_users()
+    assert writes == [5]
+    assert len(json.loads(users_file.read_text(encoding="utf-8"))) == 5